@@ -0,0 +1,115 @@
+"""
+Micro-benchmark do renderizador da área de saída (src/console.py).
+
+Mede quantas linhas por segundo chegam à tela em dois cenários:
+  - ingenuo:  um insert + see("end") por linha (o write_to_console antigo)
+  - quadros:  ConsoleRenderer, com os flushes disparados a cada N linhas
+
+Com display disponível usa um tk.Text de verdade (janela escondida). Sem
+display (CI, SSH) cai num widget em memória que imita a API usada do
+tk.Text, o que mede só o custo do próprio pipeline de coalescência.
+
+Uso:
+    python benchmarks/bench_console.py [--lines 200000] [--scrollback 10000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from console import ConsoleRenderer  # noqa: E402
+
+
+class MemoryText:
+    """Imitação mínima de tk.Text: guarda as linhas numa lista."""
+
+    def __init__(self):
+        self.lines = [""]
+
+    def after(self, ms, func):
+        pass  # os quadros são disparados manualmente pelo benchmark
+
+    def configure(self, **kwargs):
+        pass
+
+    def see(self, index):
+        pass
+
+    def yview(self):
+        return (0.0, 1.0)
+
+    def insert(self, index, *args):
+        text = "".join(args[0::2])
+        parts = text.split("\n")
+        self.lines[-1] += parts[0]
+        self.lines.extend(parts[1:])
+
+    def index(self, index):
+        return f"{len(self.lines)}.0"
+
+    def delete(self, start, end):
+        if end == "end":
+            self.lines = [""]
+        else:
+            del self.lines[:int(end.split(".")[0]) - 1]
+
+
+def make_widget():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return tk.Text(root), "tk.Text"
+    except Exception:
+        return MemoryText(), "memória (sem display)"
+
+
+def bench_naive(widget, lines):
+    start = time.perf_counter()
+    for line in lines:
+        widget.configure(state="normal")
+        widget.insert("end", line, "")
+        widget.see("end")
+        widget.configure(state="disabled")
+    return time.perf_counter() - start
+
+
+def bench_renderer(widget, lines, scrollback, lines_per_frame):
+    renderer = ConsoleRenderer(widget, max_lines=scrollback)
+    start = time.perf_counter()
+    for i, line in enumerate(lines, 1):
+        renderer.write(line, "error" if i % 10 == 0 else None)
+        if i % lines_per_frame == 0:
+            renderer.flush()
+    renderer.flush()
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--lines", type=int, default=200000)
+    ap.add_argument("--scrollback", type=int, default=10000)
+    ap.add_argument("--lines-per-frame", type=int, default=2000,
+                    help="linhas que chegam entre dois quadros (default: 2000)")
+    ap.add_argument("--skip-naive", action="store_true",
+                    help="não roda o cenário ingênuo (lento com tk.Text)")
+    args = ap.parse_args()
+
+    lines = [f"{i:08d} drwxr-xr-x  build/obj/module_{i % 97}.o\n" for i in range(args.lines)]
+
+    widget, kind = make_widget()
+    print(f"widget: {kind}")
+
+    if not args.skip_naive:
+        naive_widget, _ = make_widget()
+        elapsed = bench_naive(naive_widget, lines)
+        print(f"ingenuo: {args.lines / elapsed:12,.0f} linhas/s ({elapsed:.3f}s)")
+
+    elapsed = bench_renderer(widget, lines, args.scrollback, args.lines_per_frame)
+    print(f"quadros: {args.lines / elapsed:12,.0f} linhas/s ({elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
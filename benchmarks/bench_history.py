@@ -0,0 +1,88 @@
+"""
+Micro-benchmark do histórico persistente (src/history.py).
+
+Gera um arquivo de histórico sintético, mede a carga, a montagem do índice
+de trigramas e o tempo de cada busca (Ctrl-R e 'history <padrão>').
+
+Uso:
+    python benchmarks/bench_history.py [--entries 300000]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from history import History  # noqa: E402
+
+PROGRAMS = ["git", "ls", "show", "cd", "make", "python", "grep", "docker", "ssh", "cp"]
+WORDS = ["src", "build", "main.py", "README.md", "origin", "feature", "release",
+         "-la", "--force", "test", "deploy", "logs", "config.yaml", "server", "tmp"]
+
+
+def synthetic_commands(n, seed=42):
+    rng = random.Random(seed)
+    for i in range(n):
+        words = rng.sample(WORDS, rng.randint(1, 4))
+        yield f"{rng.choice(PROGRAMS)} {' '.join(words)} {i}"
+
+
+def timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=300000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(cmd + "\n" for cmd in synthetic_commands(args.entries))
+
+        history = History(path, max_entries=args.entries)
+        elapsed, _ = timed(lambda: len(history))
+        print(f"carga ({args.entries} comandos):    {elapsed * 1000:8.1f} ms")
+        # Na GUI a montagem roda numa thread (preload); aqui medimos direto
+        elapsed, _ = timed(history.build_index)
+        print(f"montagem do índice:            {elapsed * 1000:8.1f} ms")
+
+        # Enquanto o índice não fica pronto a busca percorre o anel
+        cold = History(path, max_entries=args.entries)
+        len(cold)
+        elapsed, _ = timed(lambda: cold.search("xyz-nada"))
+        print(f"busca sem índice (pior caso):  {elapsed * 1000:8.1f} ms")
+
+        for pattern in ["deploy", "main.py 12", "origin --force", "docker logs", "xyz-nada"]:
+            elapsed, found = timed(lambda: history.search(pattern), repeat=200)
+            print(f"Ctrl-R {pattern!r:18} {elapsed * 1e6:8.1f} µs  -> {found[1] if found else None}")
+
+        # Ctrl-R apertado várias vezes seguidas: anda para trás a partir do último resultado
+        def ctrl_r_chain(pattern="release", presses=50):
+            found = history.search(pattern)
+            for _ in range(presses - 1):
+                if found is None:
+                    break
+                found = history.search(pattern, before=found[0])
+            return found
+        elapsed, _ = timed(ctrl_r_chain, repeat=20)
+        print(f"50x Ctrl-R seguidos:           {elapsed * 1000:8.2f} ms")
+
+        elapsed, found = timed(lambda: history.find("config.yaml 99"), repeat=20)
+        print(f"history 'config.yaml 99':      {elapsed * 1000:8.2f} ms  ({len(found)} resultados)")
+
+        counter = itertools.count()
+        elapsed, _ = timed(lambda: history.add(f"git push origin main {next(counter)}"), repeat=1000)
+        print(f"add (memória + arquivo):       {elapsed * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
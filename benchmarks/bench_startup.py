@@ -0,0 +1,68 @@
+"""
+Benchmark de partida a frio do TermIA (tempo até o primeiro prompt).
+
+Cada rodada é um interpretador novo:
+  - com display: roda 'src/main.py --startup-profile --exit-after-startup'
+    e lê a linha "primeiro prompt" do relatório;
+  - sem display: mede só o núcleo (lexer + parser + executor), que é o
+    que não depende do Tk.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+CORE_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "import lexer, grammar, executor; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def time_to_first_prompt():
+    """Milissegundos até o primeiro prompt, ou None se não houver display."""
+    proc = subprocess.run(
+        [sys.executable, os.path.join(SRC, "main.py"), "--startup-profile", "--exit-after-startup"],
+        capture_output=True, text=True, cwd=SRC,
+    )
+    for line in proc.stderr.splitlines():
+        if line.startswith("primeiro prompt"):
+            return float(line.split()[-2])
+    return None
+
+
+def core_import_time():
+    proc = subprocess.run([sys.executable, "-c", CORE_SNIPPET],
+                          capture_output=True, text=True, cwd=SRC, check=True)
+    return float(proc.stdout.split()[-1])
+
+
+def summarize(label, samples):
+    print(f"{label}: mediana {statistics.median(samples):.1f} ms, "
+          f"mínimo {min(samples):.1f} ms ({len(samples)} rodadas)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=15)
+    args = ap.parse_args()
+
+    core = [core_import_time() for _ in range(args.runs)]
+    summarize("núcleo (lexer+parser+executor)", core)
+
+    first = time_to_first_prompt()
+    if first is None:
+        print("primeiro prompt: sem display disponível, medição da janela ignorada")
+        return
+    samples = [first] + [time_to_first_prompt() for _ in range(args.runs - 1)]
+    summarize("primeiro prompt", samples)
+
+
+if __name__ == "__main__":
+    main()
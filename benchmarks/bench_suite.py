@@ -0,0 +1,606 @@
+"""
+Suíte de benchmarks dos caminhos quentes do TermIA.
+
+Mede, em uma única execução:
+  lexer     tokens/s em linhas de comando realistas e custo por tecla do
+            destaque de sintaxe (lexer incremental) numa linha longa
+  parser    latência do parser.parse por regra da gramática (e do ParseCache)
+  executor  custo do despacho do Executor.execute (getattr, execução de um
+            builtin, fila de saída da GUI) e vazão da fila com transbordo
+            para o disco
+  ls        exec_ls numa pasta sintética com muitos arquivos
+  show      exec_show num arquivo grande (inteiro, --head, --tail, --lines)
+  glob      expansão de curingas (*, **) numa árvore, sem e com o índice de pastas
+  du        exec_du numa árvore: a primeira vez e de novo, com o cache de tamanhos
+  console   vazão do write_to_console (ConsoleRenderer + tk.Text; só com display)
+  ia        latência do cliente do Gemini contra o servidor falso local e
+            tamanho do pedido numa sessão longa do ia_mode (memória da conversa)
+            e fila de perguntas concorrentes com 429 injetados pelo servidor
+
+O resultado sai em JSON (--output) e pode ser comparado com uma linha de
+base salva antes (--baseline): cada métrica que piorou mais que
+--threshold aparece como regressão.
+
+Uso:
+    python benchmarks/bench_suite.py --quick
+    python benchmarks/bench_suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --fail-on-regression
+    python benchmarks/bench_suite.py --only lexer,parser
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, HERE)
+
+from lexer import lexer  # noqa: E402
+from grammar import parser  # noqa: E402
+from parse_cache import ParseCache  # noqa: E402
+from executor import Executor  # noqa: E402
+from globbing import Glob, GlobExpander  # noqa: E402
+from highlight import IncrementalLexer  # noqa: E402
+from output import QueueSink  # noqa: E402
+from disk_usage import SizeCache  # noqa: E402
+
+# Eventos retirados da fila de saída por leitura (o mesmo valor da GUI)
+OUTPUT_MAX_EVENTS = 500
+
+# Linhas usadas pelo lexer e pelo parser: uma (ou mais) por regra da gramática
+COMMAND_LINES = {
+    "help": "help",
+    "pwd": "pwd",
+    "history": "history git push",
+    "ls": "ls -la -S -n 20 src build",
+    "show": "show --tail 50 logs/app.log",
+    "cd": "cd ../projeto/src",
+    "mkdir": "mkdir build",
+    "echo": 'echo "compilação concluída" em 42 segundos',
+    "ia_cache": "ia_cache stats",
+    "generic": 'git commit -m "corrige o parser" --amend --no-edit',
+    "pipeline": "show build.log | grep -i error | sort | uniq -c",
+    "redirect": "sort -r < nomes.txt > ordenados.txt",
+    "background": "make -j8 all &",
+    "jobs": "kill -9 %2",
+}
+
+
+class NullWriter(io.TextIOBase):
+    """stdout que descarta tudo (mede o comando, não o terminal)."""
+
+    def write(self, text):
+        return len(text)
+
+
+def metric(value, unit, better):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def per_op(func, min_time=0.2, repeat=5):
+    """Segundos por chamada (mediana de 'repeat' rodadas de pelo menos min_time)."""
+    # Descobre quantas chamadas cabem em min_time
+    n = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(n):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        n *= 4
+    loops = max(1, int(n * (min_time / 10) / max(elapsed, 1e-9) * 2))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return statistics.median(samples)
+
+
+def once(func, repeat=3):
+    """Segundos da melhor de 'repeat' execuções (para operações longas)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def drain(executor, line):
+    """Roda uma linha pelo executor com a saída descartada."""
+    node = parser.parse(line + "\n", lexer=lexer)
+    with contextlib.redirect_stdout(NullWriter()), contextlib.redirect_stderr(NullWriter()):
+        executor.execute(node)
+
+
+# ----------------------------------------------------------------------
+# Grupos
+# ----------------------------------------------------------------------
+def bench_lexer(args):
+    lines = list(COMMAND_LINES.values())
+    tokens = 0
+    for line in lines:
+        lexer.input(line)
+        tokens += sum(1 for _ in iter(lexer.token, None))
+
+    def run():
+        for line in lines:
+            lexer.input(line)
+            for _ in iter(lexer.token, None):
+                pass
+
+    seconds = per_op(run, args.min_time)
+    results = {"lexer.tokens_per_s": metric(tokens / seconds, "tokens/s", "higher")}
+
+    # Destaque de sintaxe numa linha longa (~4 KB): uma tecla no meio dela,
+    # com o lexer incremental e relexando a linha inteira
+    long_line = " | ".join(COMMAND_LINES["pipeline"] + f' "{i}" src/*.py' for i in range(60))
+    mid = len(long_line) // 2
+    edited = long_line[:mid] + "x" + long_line[mid:]
+    incremental = IncrementalLexer(lexer)
+    incremental.update(long_line)
+    flip = [edited, long_line]
+
+    def keystroke():
+        flip.reverse()
+        incremental.update(flip[0])
+
+    def full():
+        IncrementalLexer(lexer).update(edited)
+
+    results["lexer.highlight_keystroke_us"] = metric(per_op(keystroke, args.min_time) * 1e6, "µs", "lower")
+    results["lexer.highlight_full_line_us"] = metric(per_op(full, args.min_time) * 1e6, "µs", "lower")
+    return results
+
+
+def bench_parser(args):
+    results = {}
+    for rule, line in COMMAND_LINES.items():
+        text = line + "\n"
+
+        def run(text=text):
+            lexer.lineno = 1
+            parser.parse(text, lexer=lexer)
+
+        results[f"parser.{rule}_us"] = metric(per_op(run, args.min_time) * 1e6, "µs", "lower")
+
+    cache = ParseCache(parser, lexer)
+    line = COMMAND_LINES["pipeline"]
+    cache.parse(line)
+    results["parser.cache_hit_us"] = metric(per_op(lambda: cache.parse(line), args.min_time) * 1e6,
+                                            "µs", "lower")
+    return results
+
+
+def bench_executor(args):
+    executor = Executor()
+    node = parser.parse("pwd\n", lexer=lexer)
+    generic = parser.parse("naoexiste\n", lexer=lexer)
+    results = {}
+
+    results["executor.getattr_lookup_ns"] = metric(
+        per_op(lambda: getattr(executor, "exec_pwd", executor.exec_generic), args.min_time) * 1e9,
+        "ns", "lower")
+
+    null = NullWriter()
+
+    def execute():
+        old = sys.stdout
+        sys.stdout = null
+        try:
+            executor.execute(node)
+        finally:
+            sys.stdout = old
+
+    results["executor.execute_pwd_us"] = metric(per_op(execute, args.min_time) * 1e6, "µs", "lower")
+
+    # O caminho da GUI: a saída vai para a fila de eventos e é retirada dela
+    queued = Executor()
+    queued.output = QueueSink()
+
+    def execute_queued():
+        queued.execute(node)
+        queued.output.drain(OUTPUT_MAX_EVENTS)
+
+    results["executor.execute_pwd_queued_us"] = metric(
+        per_op(execute_queued, args.min_time) * 1e6, "µs", "lower")
+
+    # Saída enorme com a fila limitada a 1 MB: o resto passa pelo disco
+    sink = QueueSink(memory_limit=1024 * 1024)
+    chunk = "x" * 4095 + "\n"
+    total = 64 * 1024 * 1024
+
+    def spill():
+        for _ in range(total // len(chunk)):
+            sink.write(chunk)
+        while sink.drain(OUTPUT_MAX_EVENTS):
+            pass
+
+    results["executor.output_spill_mb_per_s"] = metric(
+        total / 1024 / 1024 / once(spill), "MB/s", "higher")
+
+    def not_found():
+        with contextlib.redirect_stdout(null), contextlib.redirect_stderr(null):
+            executor.execute(generic)
+
+    results["executor.command_not_found_us"] = metric(
+        per_op(not_found, args.min_time) * 1e6, "µs", "lower")
+    return results
+
+
+def bench_ls(args, workdir):
+    directory = os.path.join(workdir, "muitos")
+    os.makedirs(directory)
+    for i in range(args.files):
+        # Arquivos vazios bastam: o custo é listar e fazer stat
+        open(os.path.join(directory, f"arquivo_{i:06d}.txt"), "w").close()
+    for i in range(args.files // 1000):
+        os.makedirs(os.path.join(directory, f"pasta_{i:03d}", "sub"))
+
+    executor = Executor()
+    results = {"ls.files": metric(args.files, "arquivos", "info")}
+    for name, line in [("plain", f"ls {directory}"),
+                       ("long", f"ls -l {directory}"),
+                       ("top10_by_size", f"ls -S -n 10 {directory}"),
+                       ("recursive", f"ls -R {directory}")]:
+        results[f"ls.{name}_ms"] = metric(once(lambda line=line: drain(executor, line)) * 1000,
+                                          "ms", "lower")
+    return results
+
+
+def bench_show(args, workdir):
+    path = os.path.join(workdir, "grande.log")
+    line = "2025-01-01 12:00:00 INFO  request served in 12 ms path=/api/v1/items?id=42\n"
+    block = line * (1024 * 1024 // len(line))
+    with open(path, "w") as f:
+        for _ in range(args.file_mb):
+            f.write(block)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+
+    executor = Executor()
+    results = {"show.file_mb": metric(round(size_mb), "MB", "info")}
+    full = once(lambda: drain(executor, f"show {path}"), repeat=1)
+    results["show.full_mb_per_s"] = metric(size_mb / full, "MB/s", "higher")
+    for name, opt in [("head", "--head 100"), ("tail", "--tail 100"),
+                      ("lines_middle", f"--lines {args.file_mb * 6000}:{args.file_mb * 6000 + 100}")]:
+        results[f"show.{name}_ms"] = metric(once(lambda opt=opt: drain(executor, f"show {opt} {path}")) * 1000,
+                                            "ms", "lower")
+    return results
+
+
+def bench_glob(args, workdir):
+    root = os.path.join(workdir, "arvore")
+    per_dir = 100
+    dirs = max(1, args.files // per_dir)
+    for i in range(dirs):
+        directory = os.path.join(root, f"m{i % 10}", f"p{i:04d}")
+        os.makedirs(directory, exist_ok=True)
+        for j in range(per_dir):
+            ext = "py" if j % 10 == 0 else "txt"
+            open(os.path.join(directory, f"f{j:03d}.{ext}"), "w").close()
+    # Pastas alteradas há menos de 2 s não entram no índice (mtime "recente
+    # demais"); a árvore acabou de ser criada, então envelhecemos as pastas.
+    old = time.time() - 60
+    for path, _, _ in os.walk(root):
+        os.utime(path, (old, old))
+
+    results = {"glob.files": metric(dirs * per_dir, "arquivos", "info")}
+    for name, pattern in [("star", f"{root}/m0/*/*.py"),
+                          ("recursive", f"{root}/**/*.py")]:
+        pattern = Glob(pattern)
+        cold = once(lambda pattern=pattern: GlobExpander().glob(pattern))
+        warm_expander = GlobExpander()
+        warm_expander.glob(pattern)
+        warm = once(lambda pattern=pattern: warm_expander.glob(pattern))
+        results[f"glob.{name}_cold_ms"] = metric(cold * 1000, "ms", "lower")
+        results[f"glob.{name}_cached_ms"] = metric(warm * 1000, "ms", "lower")
+    return results
+
+
+def bench_du(args, workdir):
+    root = os.path.join(workdir, "uso")
+    per_dir = 100
+    dirs = max(1, args.files // per_dir)
+    for i in range(dirs):
+        directory = os.path.join(root, f"m{i % 10}", f"p{i:04d}")
+        os.makedirs(directory, exist_ok=True)
+        for j in range(per_dir):
+            with open(os.path.join(directory, f"f{j:03d}"), "w") as f:
+                f.write("x" * j)
+    # Como no glob: pastas recém-alteradas não entram no cache
+    old = time.time() - 60
+    for path, _, _ in os.walk(root):
+        os.utime(path, (old, old))
+
+    executor = Executor()
+    executor.du_cache = SizeCache(os.path.join(workdir, "du_cache.pickle"))
+    line = f"du --top 10 {root}"
+    results = {"du.files": metric(dirs * per_dir, "arquivos", "info")}
+    results["du.cold_ms"] = metric(once(lambda: drain(executor, f"du --no-cache --top 10 {root}")) * 1000,
+                                   "ms", "lower")
+    # Uma pasta muda entre as execuções: só ela é lida de novo
+    changed = os.path.join(root, "m0", "p0000")
+
+    def warm():
+        open(os.path.join(changed, "novo"), "w").close()
+        os.utime(changed, (old, old + 1))
+        drain(executor, line)
+        os.unlink(os.path.join(changed, "novo"))
+        os.utime(changed, (old, old))
+
+    drain(executor, line)
+    executor.du_cache = SizeCache(executor.du_cache.path) # lido do disco, como numa sessão nova
+    results["du.cached_ms"] = metric(once(warm) * 1000, "ms", "lower")
+    return results
+
+
+def bench_console(args):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        return {"console.skipped": metric(f"sem display: {e}", "", "info")}
+
+    from console import ConsoleRenderer
+    widget = tk.Text(root)
+    renderer = ConsoleRenderer(widget, max_lines=10000)
+    lines = [f"{i:08d} drwxr-xr-x  build/obj/module_{i % 97}.o\n" for i in range(args.console_lines)]
+
+    def run():
+        for i, text in enumerate(lines, 1):
+            renderer.write(text)
+            if i % 2000 == 0:
+                renderer.flush()
+        renderer.flush()
+        root.update_idletasks()
+
+    seconds = once(run)
+    root.destroy()
+    return {"console.lines_per_s": metric(len(lines) / seconds, "linhas/s", "higher")}
+
+
+def bench_ia(args):
+    try:
+        from ia_client import GeminiClient
+        from mock_gemini import start_server
+    except ImportError as e:
+        return {"ia.skipped": metric(f"dependência ausente: {e}", "", "info")}
+
+    from conversation import Conversation
+
+    server, base_url = start_server(delay=0.0, answer="resposta curta do servidor falso " * 4)
+    client = GeminiClient(api_key="bench", base_url=base_url)
+    first_chunk, total = [], []
+    # Sessão longa do ia_mode: o pedido deve parar de crescer depois que a
+    # memória enche (orçamento de tokens + resumo).
+    conversation = Conversation()
+    session_bytes, session_ms = [], []
+    session_turns = args.ia_requests * 10
+    try:
+        for _ in range(args.ia_requests):
+            start = time.perf_counter()
+            stream = client.stream("como desfazer o último commit?")
+            next(stream)
+            first_chunk.append(time.perf_counter() - start)
+            for _ in stream:
+                pass
+            total.append(time.perf_counter() - start)
+
+        for i in range(session_turns):
+            prompt = f"pergunta {i}: como resolver o conflito no arquivo modulo_{i % 7}.py?"
+            start = time.perf_counter()
+            context = conversation.pack(prompt)
+            payload = client._payload(prompt, context.contents, context.system)
+            answer = client.generate(prompt, context.contents, context.system)
+            session_ms.append(time.perf_counter() - start)
+            session_bytes.append(len(json.dumps(payload)))
+            conversation.add(prompt, answer * 8)
+    finally:
+        client.close()
+        server.shutdown()
+    tail = max(1, session_turns // 10)
+    results = {
+        "ia.first_chunk_ms": metric(statistics.median(first_chunk) * 1000, "ms", "lower"),
+        "ia.total_ms": metric(statistics.median(total) * 1000, "ms", "lower"),
+        "ia.connections": metric(server.connections, "conexões", "info"),
+        "ia.session_turns": metric(session_turns, "perguntas", "info"),
+        "ia.session_max_request_bytes": metric(max(session_bytes), "bytes", "lower"),
+        "ia.session_last_request_bytes": metric(session_bytes[-1], "bytes", "lower"),
+        "ia.session_last_ms": metric(statistics.median(session_ms[-tail:]) * 1000, "ms", "lower"),
+    }
+    results.update(bench_ia_queue(args))
+    return results
+
+
+def bench_ia_queue(args, concurrency=4, rate=40.0, burst=5, error_rate=0.3):
+    """
+    Fila do ia_mode contra o servidor falso respondendo 429 em 30% dos
+    pedidos: todas as perguntas precisam ser respondidas, com no máximo
+    'concurrency' em voo e sem passar de 'rate' pedidos/s (mais o burst).
+    """
+    from ia_client import GeminiClient
+    from ia_queue import IAScheduler, TokenBucket, with_retry
+    from mock_gemini import start_server
+
+    prompts = args.ia_requests * 2
+    server, base_url = start_server(delay=0.002, answer="resposta da fila " * 8,
+                                    error_rate=error_rate, seed=1)
+    client = GeminiClient(api_key="bench", base_url=base_url, pool_size=concurrency)
+    bucket = TokenBucket(rate, burst)
+    finished = threading.Event()
+    answers, failures, retries = [], [], []
+
+    def fetch(request):
+        on_retry = lambda error, attempt, delay: retries.append(delay)
+        return with_retry(lambda: client.stream(request.prompt), bucket, request.cancel,
+                          retries=10, on_retry=on_retry, base=0.02)
+
+    def on_done(request, text, error):
+        (failures if error is not None or text is None else answers).append(request.id)
+        if len(answers) + len(failures) == prompts:
+            finished.set()
+
+    scheduler = IAScheduler(fetch, on_done, concurrency=concurrency)
+    start = time.perf_counter()
+    try:
+        for i in range(prompts):
+            scheduler.submit(f"pergunta {i} da fila")
+        finished.wait(120)
+        elapsed = time.perf_counter() - start
+    finally:
+        scheduler.shutdown()
+        client.close()
+        server.shutdown()
+
+    # Maior número de pedidos dentro de qualquer janela de 1 s
+    times = server.request_times
+    peak = max((sum(1 for t in times[i:] if t - t0 < 1.0) for i, t0 in enumerate(times)), default=0)
+    return {
+        "ia.queue_prompts": metric(prompts, "perguntas", "info"),
+        "ia.queue_total_ms": metric(elapsed * 1000, "ms", "lower"),
+        "ia.queue_failed": metric(prompts - len(answers), "perguntas", "lower"),
+        "ia.queue_injected_errors": metric(server.errors, "erros", "info"),
+        "ia.queue_retries": metric(len(retries), "repetições", "info"),
+        "ia.queue_max_inflight": metric(server.max_inflight, "pedidos", "info"),
+        "ia.queue_peak_per_s": metric(peak, "pedidos/s", "info"),
+    }
+
+
+GROUPS = ["lexer", "parser", "executor", "ls", "show", "glob", "du", "console", "ia"]
+
+
+def run_groups(args):
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="termia-bench-")
+    try:
+        for group in args.only:
+            print(f"[{group}] ...", file=sys.stderr, flush=True)
+            if group == "lexer":
+                results.update(bench_lexer(args))
+            elif group == "parser":
+                results.update(bench_parser(args))
+            elif group == "executor":
+                results.update(bench_executor(args))
+            elif group == "ls":
+                results.update(bench_ls(args, workdir))
+            elif group == "show":
+                results.update(bench_show(args, workdir))
+            elif group == "glob":
+                results.update(bench_glob(args, workdir))
+            elif group == "du":
+                results.update(bench_du(args, workdir))
+            elif group == "console":
+                results.update(bench_console(args))
+            elif group == "ia":
+                results.update(bench_ia(args))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# ----------------------------------------------------------------------
+# Comparação com a linha de base
+# ----------------------------------------------------------------------
+def compare(results, baseline, threshold):
+    """Lista de (nome, antes, agora, variação, regressão?) das métricas comparáveis."""
+    rows = []
+    for name, current in results.items():
+        old = baseline.get(name)
+        if old is None or current["better"] not in ("higher", "lower"):
+            continue
+        before, now = old["value"], current["value"]
+        if not before:
+            continue
+        change = (now - before) / before
+        worse = -change if current["better"] == "higher" else change
+        rows.append((name, before, now, change, worse > threshold))
+    return rows
+
+
+def print_results(results, rows):
+    by_name = {row[0]: row for row in rows}
+    for name, m in results.items():
+        value = m["value"]
+        text = f"{value:,.2f}" if isinstance(value, float) else str(value)
+        line = f"{name:<38} {text:>16} {m['unit']}"
+        if name in by_name:
+            _, _, _, change, regression = by_name[name]
+            line += f"   {change:+.1%}" + ("  <-- REGRESSÃO" if regression else "")
+        print(line)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--quick", action="store_true",
+                    help="tamanhos menores (10k arquivos, 64 MB) para rodar em segundos")
+    ap.add_argument("--only", default=",".join(GROUPS),
+                    help=f"grupos separados por vírgula (padrão: todos: {','.join(GROUPS)})")
+    ap.add_argument("--files", type=int, help="arquivos na pasta do ls (padrão: 100000)")
+    ap.add_argument("--file-mb", type=int, help="tamanho do arquivo do show em MB (padrão: 1024)")
+    ap.add_argument("--console-lines", type=int, default=100000)
+    ap.add_argument("--ia-requests", type=int, default=30)
+    ap.add_argument("--min-time", type=float, default=0.2,
+                    help="segundos mínimos de medição por micro-benchmark")
+    ap.add_argument("--output", help="grava o resultado em JSON neste arquivo")
+    ap.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    ap.add_argument("--save-baseline", metavar="ARQUIVO", help="grava o resultado como nova linha de base")
+    ap.add_argument("--threshold", type=float, default=0.10,
+                    help="piora relativa que conta como regressão (padrão: 0.10 = 10%%)")
+    ap.add_argument("--fail-on-regression", action="store_true",
+                    help="sai com código 1 se houver regressão")
+    args = ap.parse_args()
+
+    args.only = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(args.only) - set(GROUPS)
+    if unknown:
+        ap.error(f"grupos desconhecidos: {', '.join(sorted(unknown))}")
+    if args.files is None:
+        args.files = 10000 if args.quick else 100000
+    if args.file_mb is None:
+        args.file_mb = 64 if args.quick else 1024
+
+    results = run_groups(args)
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+
+    rows = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            rows = compare(results, json.load(f)["results"], args.threshold)
+    print_results(results, rows)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"resultado gravado em {path}", file=sys.stderr)
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Servidor HTTP local que imita a API do Gemini, para testar e medir o
+cliente do ia_mode (src/ia_client.py) sem rede e sem gastar cota.
+
+Atende:
+  POST /v1beta/models/<modelo>:streamGenerateContent?alt=sse
+       -> resposta SSE em Transfer-Encoding chunked, um evento por palavra
+  POST /v1beta/models/<modelo>:generateContent
+       -> resposta JSON completa
+
+A resposta é o próprio prompt ecoado (ou --answer), com --delay segundos
+entre os eventos. Conta as conexões TCP aceitas, o que permite conferir
+se o cliente reaproveita a conexão (keep-alive).
+
+Para testar a fila do ia_mode (src/ia_queue.py), o servidor pode falhar de
+propósito: --error-rate 0.3 responde 30% dos pedidos com --error-status
+(429 por padrão, com Retry-After se --retry-after for dado). Ele também
+guarda o maior número de pedidos atendidos ao mesmo tempo (max_inflight)
+e o horário de cada pedido (request_times), para conferir a concorrência
+e o limite de taxa do cliente. Com --fail-first N, os N primeiros pedidos
+falham sempre (para testes que precisam de um resultado certo).
+
+--fail-after N corta o stream no meio: depois de N pedaços, vem um evento
+de erro no lugar do resto da resposta (como a API faz quando falha já
+respondendo).
+
+Uso como script:
+    python benchmarks/mock_gemini.py --port 8765 --delay 0.02
+    GEMINI_API_BASE=http://127.0.0.1:8765/v1beta GEMINI_API_KEY=x python src/main.py
+
+Uso programático:
+    server, base_url = start_server(delay=0.01)
+    ...
+    server.shutdown()
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # necessário para keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass  # silencioso
+
+    def _read_prompt(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.requests += 1
+        try:
+            return body["contents"][-1]["parts"][0]["text"]
+        except (KeyError, IndexError):
+            return ""
+
+    def _answer_words(self, prompt):
+        text = self.server.answer if self.server.answer is not None else prompt
+        words = text.split(" ")
+        return [w if i == len(words) - 1 else w + " " for i, w in enumerate(words)]
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _inject_error(self):
+        """Responde com erro (--fail-first, ou sorteado por --error-rate). Retorna True se respondeu."""
+        server = self.server
+        with server.lock:
+            fail = (server.requests <= server.fail_first
+                    or server.error_rate and server.random.random() < server.error_rate)
+            if fail:
+                server.errors += 1
+        if not fail:
+            return False
+        body = json.dumps({"error": {"code": server.error_status,
+                                     "message": "erro injetado pelo servidor falso"}}).encode("utf-8")
+        self.send_response(server.error_status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if server.retry_after is not None:
+            self.send_header("Retry-After", str(server.retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+
+    def do_POST(self):
+        prompt = self._read_prompt()
+        if not self.headers.get("x-goog-api-key"):
+            self._send_json(403, {"error": {"code": 403, "message": "API key ausente"}})
+            return
+
+        server = self.server
+        with server.lock:
+            server.request_times.append(time.monotonic())
+            server.inflight += 1
+            server.max_inflight = max(server.max_inflight, server.inflight)
+        try:
+            if not self._inject_error():
+                self._answer(prompt)
+        finally:
+            with server.lock:
+                server.inflight -= 1
+
+    def _answer(self, prompt):
+        if ":streamGenerateContent" in self.path:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, word in enumerate(self._answer_words(prompt)):
+                if i == self.server.fail_after:
+                    error = {"error": {"code": 500, "message": "erro no meio do stream"}}
+                    self._write_chunk(b"data: " + json.dumps(error).encode("utf-8") + b"\r\n\r\n")
+                    break
+                time.sleep(self.server.delay)
+                event = {"candidates": [{"content": {"role": "model", "parts": [{"text": word}]}}]}
+                self._write_chunk(b"data: " + json.dumps(event).encode("utf-8") + b"\r\n\r\n")
+            self._write_chunk(b"")
+        elif ":generateContent" in self.path:
+            time.sleep(self.server.delay * len(self._answer_words(prompt)))
+            text = "".join(self._answer_words(prompt))
+            self._send_json(200, {"candidates": [{"content": {"parts": [{"text": text}]}}]})
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+
+def start_server(host="127.0.0.1", port=0, delay=0.0, answer=None,
+                 error_rate=0.0, error_status=429, retry_after=None, seed=None, fail_after=None,
+                 fail_first=0):
+    """Sobe o servidor em uma thread. Retorna (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), MockGeminiHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    server.delay = delay
+    server.answer = answer
+    server.error_rate = error_rate
+    server.error_status = error_status
+    server.retry_after = retry_after
+    server.fail_after = fail_after
+    server.fail_first = fail_first
+    server.random = random.Random(seed)
+    server.errors = 0
+    server.inflight = 0
+    server.max_inflight = 0
+    server.request_times = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}/v1beta"
+    return server, base_url
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--delay", type=float, default=0.02, help="segundos entre eventos do stream")
+    ap.add_argument("--answer", default=None, help="resposta fixa (padrão: ecoa o prompt)")
+    ap.add_argument("--error-rate", type=float, default=0.0,
+                    help="fração dos pedidos respondida com erro (0 a 1)")
+    ap.add_argument("--error-status", type=int, default=429, help="código HTTP dos erros injetados")
+    ap.add_argument("--fail-first", type=int, default=0,
+                    help="responde com erro aos N primeiros pedidos")
+    ap.add_argument("--retry-after", type=float, default=None,
+                    help="valor do cabeçalho Retry-After nos erros, em segundos")
+    ap.add_argument("--fail-after", type=int, default=None,
+                    help="manda um evento de erro depois de N pedaços do stream")
+    args = ap.parse_args()
+
+    server, base_url = start_server(args.host, args.port, args.delay, args.answer,
+                                    args.error_rate, args.error_status, args.retry_after,
+                                    fail_after=args.fail_after, fail_first=args.fail_first)
+    print(f"Mock do Gemini em {base_url} (Ctrl-C para sair)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Completação com Tab.
+
+As fontes de candidatos ficam pré-processadas em árvores de prefixos (trie),
+para o Tab responder em poucos milissegundos:
+  - palavras reservadas do lexer (montada uma vez);
+  - executáveis do PATH: remontada só quando o PATH muda ou quando o mtime
+    de alguma pasta dele muda (instalou/removeu um programa). Só as pastas
+    que mudaram são relidas;
+  - arquivos de uma pasta (a atual ou a do caminho sendo digitado):
+    guardados por pasta e relidos quando o mtime dela muda.
+"""
+import os
+
+from lexer import reserved
+
+# Palavras depois das quais começa um comando novo
+COMMAND_SEPARATORS = {'|', '&', ';', '&&', '||'}
+
+# Pastas de arquivos guardadas (as mais recentes)
+MAX_CACHED_DIRS = 64
+
+
+class Trie:
+    """Árvore de prefixos: cada nó é um dict letra -> nó; '' marca fim de palavra."""
+
+    def __init__(self, words=()):
+        self.root = {}
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        if '' not in node:
+            node[''] = True
+            self.size += 1
+
+    def with_prefix(self, prefix):
+        """Todas as palavras que começam com 'prefix'."""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        found = []
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            for char, child in node.items():
+                if char == '':
+                    found.append(word)
+                else:
+                    stack.append((child, word + char))
+        return found
+
+
+def _is_executable(entry):
+    if os.name == 'nt':
+        ext = os.path.splitext(entry.name)[1].upper()
+        return ext in os.environ.get('PATHEXT', '.EXE;.BAT;.CMD').upper().split(';')
+    try:
+        return entry.is_file() and entry.stat().st_mode & 0o111
+    except OSError:
+        return False
+
+
+def _executables(directory):
+    names = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if _is_executable(entry):
+                    names.append(os.path.splitext(entry.name)[0] if os.name == 'nt' else entry.name)
+    except OSError:
+        pass
+    return names
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class Completer:
+    def __init__(self):
+        self.reserved = Trie(reserved)
+        self._path_dirs = {}    # pasta do PATH -> (mtime, [executáveis])
+        self._path_stamp = None
+        self._path_trie = Trie()
+        self._dirs = {}         # pasta -> (mtime, Trie de entradas)
+
+    # ------------------------------------------------------------------
+    # Fontes
+    # ------------------------------------------------------------------
+    def executables(self):
+        """Trie dos executáveis do PATH, remontada só se algo mudou."""
+        dirs = [d for d in os.environ.get('PATH', '').split(os.pathsep) if d]
+        # Um stat por pasta do PATH: barato comparado a listar todas elas
+        stamp = tuple((d, _mtime(d)) for d in dirs)
+        if stamp != self._path_stamp:
+            cache = {}
+            for directory, mtime in stamp:
+                old = self._path_dirs.get(directory)
+                if old is not None and old[0] == mtime:
+                    cache[directory] = old
+                else:
+                    cache[directory] = (mtime, _executables(directory) if mtime is not None else [])
+            self._path_dirs = cache
+            self._path_trie = Trie(name for _, names in cache.values() for name in names)
+            self._path_stamp = stamp
+        return self._path_trie
+
+    def entries(self, directory):
+        """Trie dos nomes de uma pasta (pastas terminam com '/')."""
+        key = os.path.abspath(directory)
+        mtime = _mtime(key)
+        cached = self._dirs.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        names = []
+        try:
+            with os.scandir(key) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    names.append(entry.name + '/' if is_dir else entry.name)
+        except OSError:
+            pass
+        trie = Trie(names)
+
+        self._dirs.pop(key, None)
+        self._dirs[key] = (mtime, trie)
+        while len(self._dirs) > MAX_CACHED_DIRS:
+            del self._dirs[next(iter(self._dirs))]
+        return trie
+
+    def paths(self, word):
+        """Caminhos que completam 'word' (relativo à pasta atual ou absoluto)."""
+        head, tail = os.path.split(word)
+        directory = os.path.expanduser(head) if head else '.'
+        found = self.entries(directory).with_prefix(tail)
+        if not tail.startswith('.'):
+            found = [name for name in found if not name.startswith('.')]
+        return [os.path.join(head, name) if head else name for name in found]
+
+    # ------------------------------------------------------------------
+    # Completação de uma linha
+    # ------------------------------------------------------------------
+    def complete(self, line, cursor=None):
+        """
+        Candidatos para a palavra sob o cursor.
+        Retorna (início da palavra, candidatos em ordem alfabética).
+        """
+        if cursor is None:
+            cursor = len(line)
+        before = line[:cursor]
+        start = max(before.rfind(' '), before.rfind('\t')) + 1
+        word = before[start:]
+
+        previous = before[:start].split()
+        if not previous or previous[-1] in COMMAND_SEPARATORS:
+            if '/' in word:
+                candidates = self.paths(word) # ./script.sh, /usr/bin/...
+            else:
+                candidates = (self.reserved.with_prefix(word)
+                              + self.executables().with_prefix(word))
+        else:
+            candidates = self.paths(word)
+        return start, sorted(set(candidates))
+
+
+def common_prefix(words):
+    return os.path.commonprefix(words) if words else ""
@@ -0,0 +1,176 @@
+"""
+Motor de renderização da área de saída (tk.Text) do TermIA.
+
+Em vez de destravar o widget, inserir e rolar a cada print, as escritas
+ficam acumuladas e são aplicadas em "quadros" com taxa fixa (ex: 60 Hz):
+um único insert por quadro, com os trechos de mesma tag já concatenados.
+O scrollback tem um limite de linhas; o excesso é cortado em bloco.
+
+O 'watch' usa uma região no fim da tela que é redesenhada no lugar: cada
+quadro novo é comparado linha a linha com o anterior e só as linhas que
+mudaram são trocadas no widget (ver update_region).
+"""
+import os
+
+# Limite padrão de linhas mantidas na tela (pode ser trocado pela
+# variável de ambiente TERMIA_SCROLLBACK).
+DEFAULT_SCROLLBACK_LINES = 10000
+
+# Quadros por segundo do redesenho
+DEFAULT_FPS = 60
+
+
+def scrollback_from_env():
+    """Lê TERMIA_SCROLLBACK, caindo no padrão se estiver vazio ou inválido."""
+    try:
+        return max(1, int(os.getenv("TERMIA_SCROLLBACK", DEFAULT_SCROLLBACK_LINES)))
+    except ValueError:
+        return DEFAULT_SCROLLBACK_LINES
+
+
+class ConsoleRenderer:
+    def __init__(self, widget, max_lines=DEFAULT_SCROLLBACK_LINES, fps=DEFAULT_FPS):
+        self.widget = widget
+        self.max_lines = max_lines
+        # Só cortamos quando passar do limite com uma folga de 10%, para que
+        # o delete (caro) aconteça em blocos grandes e raramente.
+        self.trim_slack = max(1, max_lines // 10)
+        self.frame_ms = max(1, int(1000 / fps))
+
+        self._pending = []        # [[tag, [trechos]]] na ordem de chegada
+        self._pending_lines = 0   # quantas quebras de linha estão pendentes
+        self._scheduled = False
+        self._force_follow = False
+        self._region = None       # linhas mostradas na região do 'watch'
+
+    def write(self, text, tag=None):
+        """Agenda texto para o próximo quadro (não toca no widget)."""
+        if not text:
+            return
+        if self._pending and self._pending[-1][0] == tag:
+            self._pending[-1][1].append(text)
+        else:
+            self._pending.append([tag, [text]])
+        self._pending_lines += text.count("\n")
+
+        if not self._scheduled:
+            self._scheduled = True
+            self.widget.after(self.frame_ms, self.flush)
+
+    def follow(self):
+        """Faz o próximo quadro rolar para o final, mesmo se o usuário tiver subido."""
+        self._force_follow = True
+
+    def flush(self):
+        """Aplica tudo o que está pendente em um único insert."""
+        self._scheduled = False
+        if not self._pending:
+            return
+
+        pending = self._pending
+        if self._pending_lines > self.max_lines:
+            pending = self._drop_hidden(pending)
+        self._pending = []
+        self._pending_lines = 0
+
+        # Se o usuário rolou para cima para ler algo, não puxamos a tela.
+        follow = self._force_follow or self._at_bottom()
+        self._force_follow = False
+
+        args = []
+        for tag, parts in pending:
+            args.append("".join(parts))
+            args.append(tag or "")
+
+        w = self.widget
+        w.configure(state="normal")
+        w.insert("end", *args)
+        self._trim()
+        w.configure(state="disabled")
+        if follow:
+            w.see("end")
+
+    def update_region(self, lines):
+        """
+        Mostra 'lines' na região do 'watch' (criada no primeiro quadro, logo
+        abaixo do que já estava na tela), trocando só as linhas diferentes
+        das do quadro anterior.
+        """
+        w = self.widget
+        self.flush() # o que veio antes fica acima da região
+        follow = self._at_bottom()
+        w.configure(state="normal")
+        if self._region is None:
+            if w.get("end-2c") not in ("\n", ""):
+                w.insert("end", "\n")
+            w.mark_set("region", "end-1c")
+            w.mark_gravity("region", "left")
+            self._region = []
+
+        old = self._region
+        first = int(w.index("region").split(".")[0])
+        for i, line in enumerate(lines[:len(old)]):
+            if line != old[i]:
+                row = first + i
+                w.delete(f"{row}.0", f"{row}.end")
+                w.insert(f"{row}.0", line, "prompt" if i == 0 else "")
+        if len(lines) > len(old):
+            extra = "".join(line + "\n" for line in lines[len(old):])
+            w.insert(f"{first + len(old)}.0", extra)
+            if not old:
+                w.tag_add("prompt", f"{first}.0", f"{first}.end") # cabeçalho
+        elif len(lines) < len(old):
+            w.delete(f"{first + len(lines)}.0", f"{first + len(old)}.0")
+        self._region = list(lines)
+        w.configure(state="disabled")
+        if follow:
+            w.see("end")
+
+    def close_region(self):
+        """Fim do 'watch': o último quadro fica na tela como texto comum."""
+        if self._region is not None:
+            self.widget.mark_unset("region")
+            self._region = None
+
+    def clear(self):
+        """Apaga a tela e descarta o que ainda não foi desenhado."""
+        self._pending = []
+        self._pending_lines = 0
+        self.close_region()
+        self.widget.configure(state="normal")
+        self.widget.delete("1.0", "end")
+        self.widget.configure(state="disabled")
+
+    def _at_bottom(self):
+        return self.widget.yview()[1] >= 0.999
+
+    def _trim(self):
+        """Remove as linhas mais antigas, em bloco, quando passar do limite."""
+        lines = int(self.widget.index("end-1c").split(".")[0])
+        if lines > self.max_lines + self.trim_slack:
+            excess = lines - self.max_lines
+            self.widget.delete("1.0", f"{excess + 1}.0")
+
+    def _drop_hidden(self, pending):
+        """
+        Um único quadro trouxe mais linhas do que cabem no scrollback:
+        descartamos antes do insert o começo, que seria cortado logo depois.
+        """
+        kept = []
+        budget = self.max_lines
+        for tag, parts in reversed(pending):
+            text = "".join(parts)
+            count = text.count("\n")
+            if count >= budget:
+                # Mantém apenas as últimas 'budget' linhas deste trecho
+                cut = len(text)
+                for _ in range(budget + 1):
+                    cut = text.rfind("\n", 0, cut)
+                    if cut < 0:
+                        break
+                kept.append([tag, [text[cut + 1:]]])
+                break
+            kept.append([tag, [text]])
+            budget -= count
+        kept.reverse()
+        return kept
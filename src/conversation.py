@@ -0,0 +1,266 @@
+"""
+Memória de conversa do ia_mode.
+
+Sem memória, cada pergunta vai sozinha para a API e o modelo não sabe do que
+se estava falando. Reenviar a conversa inteira a cada pergunta resolve isso,
+mas o pedido (e a latência) cresce sem limite. Aqui a conversa fica em
+memória e, a cada pergunta, só uma parte dela vai junto, dentro de um
+orçamento de tokens:
+
+1. as trocas (pergunta + resposta) mais recentes entram primeiro;
+2. sobrando espaço, entram as mais antigas que têm palavras em comum com a
+   pergunta nova;
+3. quando a memória passa do limite, as trocas mais antigas são compactadas
+   num resumo curto (a pergunta e o começo da resposta), que vai como
+   instrução de sistema e também tem um teto.
+
+Os tokens são estimados pelo tamanho do texto (~4 caracteres por token, a
+média do Gemini para português e inglês). Não é exato, mas basta para manter
+o tamanho do pedido estável numa sessão longa.
+
+As sessões podem ser salvas e carregadas em JSON, em ~/.termia/ia_sessoes.
+
+A mesma conversa é usada por várias threads ao mesmo tempo (a resposta em
+streaming, as da fila do IAScheduler e os comandos /memory na thread da
+GUI), então todo acesso passa por um lock.
+"""
+import json
+import os
+import re
+import threading
+
+from paths import data_file
+
+# Orçamento padrão de tokens por pergunta (histórico + resumo + pergunta).
+# A variável TERMIA_IA_CONTEXT troca o valor.
+DEFAULT_BUDGET = 3000
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD = 4  # papel e separadores de cada mensagem
+
+# Trocas recentes que sempre tentam entrar, antes de olhar a relevância
+RECENT_EXCHANGES = 2
+
+# A memória guarda até MEMORY_FACTOR orçamentos de trocas; o que passar
+# disso vira resumo. O resumo fica abaixo de 1/SUMMARY_SHARE do orçamento.
+MEMORY_FACTOR = 3
+SUMMARY_SHARE = 4
+SUMMARY_ANSWER_CHARS = 160
+
+SESSION_VERSION = 1
+
+_WORD = re.compile(r"\w{4,}")
+_SESSION_NAME = re.compile(r"[\w-][\w.-]*")
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD
+
+
+def keywords(text):
+    """Palavras de 4+ letras, sem caixa: o suficiente para medir se dois textos falam da mesma coisa."""
+    return set(_WORD.findall(text.casefold()))
+
+
+class Exchange:
+    """Uma pergunta e a resposta que ela recebeu."""
+    __slots__ = ('question', 'answer', 'tokens', 'words')
+
+    def __init__(self, question, answer):
+        self.question = question
+        self.answer = answer
+        self.tokens = estimate_tokens(question) + estimate_tokens(answer)
+        self.words = keywords(question + " " + answer)
+
+    def summary_line(self):
+        answer = " ".join(self.answer.split())
+        if len(answer) > SUMMARY_ANSWER_CHARS:
+            answer = answer[:SUMMARY_ANSWER_CHARS].rstrip() + "..."
+        question = " ".join(self.question.split())
+        return f"- Pergunta: {question} | Resposta: {answer}"
+
+
+class Context:
+    """O que vai junto de uma pergunta: trocas escolhidas e o resumo."""
+
+    def __init__(self, contents, system, tokens, exchanges):
+        self.contents = contents    # mensagens no formato da API do Gemini
+        self.system = system        # resumo (instrução de sistema) ou None
+        self.tokens = tokens        # estimativa do pedido inteiro
+        self.exchanges = exchanges  # quantas trocas foram incluídas
+
+    def key(self):
+        """Texto que identifica o contexto (entra na chave do cache de respostas)."""
+        if not self.contents and not self.system:
+            return ""
+        return json.dumps([self.system, self.contents], ensure_ascii=False)
+
+
+class Conversation:
+    def __init__(self, budget=None):
+        if budget is None:
+            try:
+                budget = int(os.getenv("TERMIA_IA_CONTEXT") or DEFAULT_BUDGET)
+            except ValueError:
+                budget = DEFAULT_BUDGET
+        self.budget = max(budget, 256)
+        self.exchanges = []
+        self.summary = []    # uma linha por troca compactada
+        self.dropped = 0     # trocas que saíram até do resumo
+        self.last_tokens = 0 # estimativa do último pedido
+        # Os métodos públicos pegam o lock; os que começam com '_' contam
+        # com ele já pego
+        self._lock = threading.Lock()
+
+    # ---------- Memória ----------
+    def add(self, question, answer):
+        """Guarda uma troca completa e compacta as mais antigas, se preciso."""
+        exchange = Exchange(question, answer)
+        with self._lock:
+            self.exchanges.append(exchange)
+            self._compact()
+
+    def memory_tokens(self):
+        with self._lock:
+            return self._memory_tokens()
+
+    def _memory_tokens(self):
+        return sum(e.tokens for e in self.exchanges)
+
+    def summary_text(self):
+        with self._lock:
+            return self._summary_text()
+
+    def _summary_text(self):
+        if not self.summary:
+            return None
+        head = "Resumo do começo desta conversa com o usuário"
+        if self.dropped:
+            head += f" ({self.dropped} trocas mais antigas omitidas)"
+        return head + ":\n" + "\n".join(self.summary)
+
+    def _compact(self):
+        limit = self.budget * MEMORY_FACTOR
+        total = self._memory_tokens()
+        while total > limit and len(self.exchanges) > RECENT_EXCHANGES:
+            oldest = self.exchanges.pop(0)
+            total -= oldest.tokens
+            self.summary.append(oldest.summary_line())
+
+        summary_limit = self.budget // SUMMARY_SHARE
+        while self.summary and estimate_tokens(self._summary_text()) > summary_limit:
+            self.summary.pop(0)
+            self.dropped += 1
+
+    def reset(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self.exchanges.clear()
+        self.summary.clear()
+        self.dropped = 0
+        self.last_tokens = 0
+
+    # ---------- Montagem do pedido ----------
+    def pack(self, prompt):
+        """Escolhe o que vai junto de 'prompt' sem passar do orçamento."""
+        with self._lock:
+            return self._pack(prompt)
+
+    def _pack(self, prompt):
+        system = self._summary_text()
+        available = self.budget - estimate_tokens(prompt)
+        if system:
+            available -= estimate_tokens(system)
+
+        chosen = set()
+        # 1. As mais recentes, enquanto couberem
+        for i in range(len(self.exchanges) - 1, len(self.exchanges) - 1 - RECENT_EXCHANGES, -1):
+            if i < 0 or self.exchanges[i].tokens > available:
+                break
+            chosen.add(i)
+            available -= self.exchanges[i].tokens
+
+        # 2. As mais parecidas com a pergunta (empate: a mais recente)
+        words = keywords(prompt)
+        ranked = sorted(
+            ((len(words & e.words), i) for i, e in enumerate(self.exchanges) if i not in chosen),
+            reverse=True,
+        )
+        for score, i in ranked:
+            if score == 0:
+                break
+            if self.exchanges[i].tokens <= available:
+                chosen.add(i)
+                available -= self.exchanges[i].tokens
+
+        contents = []
+        for i in sorted(chosen):
+            e = self.exchanges[i]
+            contents.append({"role": "user", "parts": [{"text": e.question}]})
+            contents.append({"role": "model", "parts": [{"text": e.answer}]})
+
+        self.last_tokens = self.budget - available
+        return Context(contents, system, self.last_tokens, len(chosen))
+
+    # ---------- Sessões em disco ----------
+    def to_dict(self):
+        with self._lock:
+            return self._to_dict()
+
+    def _to_dict(self):
+        return {
+            "version": SESSION_VERSION,
+            "summary": self.summary,
+            "dropped": self.dropped,
+            "exchanges": [{"question": e.question, "answer": e.answer} for e in self.exchanges],
+        }
+
+    def load_dict(self, data):
+        if data.get("version") != SESSION_VERSION:
+            raise ValueError(f"versão de sessão desconhecida: {data.get('version')}")
+        summary = list(data.get("summary", []))
+        dropped = int(data.get("dropped", 0))
+        exchanges = [Exchange(e["question"], e["answer"]) for e in data.get("exchanges", [])]
+        with self._lock:
+            self._reset()
+            self.summary, self.dropped, self.exchanges = summary, dropped, exchanges
+            self._compact() # o orçamento pode ser menor que o de quem salvou
+
+    def save(self, name):
+        """Grava a sessão (troca o arquivo de uma vez, para nunca ficar pela metade)."""
+        path = session_path(name)
+        tmp = path + ".tmp"
+        data = self.to_dict() # uma cópia: o arquivo é escrito fora do lock
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+        return path
+
+    def load(self, name):
+        with open(session_path(name), encoding="utf-8") as f:
+            self.load_dict(json.load(f))
+
+
+def sessions_dir():
+    path = data_file("ia_sessoes")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def session_path(name):
+    if not _SESSION_NAME.fullmatch(name):
+        raise ValueError(f"nome de sessão inválido: {name!r} (use letras, números, '-', '_' e '.')")
+    return os.path.join(sessions_dir(), name + ".json")
+
+
+def list_sessions():
+    """(nome, bytes, mtime) das sessões salvas, das mais recentes para as mais antigas."""
+    sessions = []
+    with os.scandir(sessions_dir()) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                st = entry.stat()
+                sessions.append((entry.name[:-5], st.st_size, st.st_mtime))
+    return sorted(sessions, key=lambda s: s[2], reverse=True)
@@ -0,0 +1,267 @@
+"""
+Espaço ocupado por uma árvore de pastas, para o builtin 'du'.
+
+As pastas são lidas com os.scandir por um pool de threads: cada pasta lida
+manda as subpastas para o pool, sem esperar o resto do nível. Somar o
+tamanho de cada arquivo exige um lstat por arquivo, e é isso que custa numa
+árvore com milhões deles.
+
+Por isso o resultado de cada pasta fica num cache persistente (em
+~/.termia), com a chave (dispositivo, inode) e validado pelo mtime da
+pasta: criar, apagar ou renomear uma entrada muda o mtime da pasta onde ela
+está. Numa segunda execução, uma pasta que não mudou custa um stat (o dela)
+em vez de um scandir e um lstat por arquivo; só as pastas alteradas são
+lidas de novo. As subpastas continuam sendo visitadas (o mtime de uma
+pasta não muda quando algo muda lá embaixo).
+
+O limite é o mesmo de qualquer cache assim: um arquivo que cresce no lugar
+(um log, por exemplo) não muda o mtime da pasta, e o tamanho antigo dele
+continua valendo até a pasta mudar. 'du --no-cache' lê tudo de novo.
+
+Como no du, o tamanho é o espaço em disco (blocos), não o tamanho aparente,
+e links simbólicos não são seguidos. Links físicos contam em cada pasta
+onde aparecem.
+"""
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from listing import WORKERS
+
+# Formato do arquivo de cache (outro número = o arquivo é ignorado)
+CACHE_VERSION = 1
+
+# Mesma regra do DirIndex (globbing.py): uma pasta alterada há menos que
+# isto pode mudar de novo sem que o mtime mude, então não entra no cache.
+RACY_NS = 2 * 10**9
+
+# Intervalo entre os '' do gerador (a chance de quem consome cancelar)
+TICK = 0.1
+
+
+def disk_bytes(st):
+    """Espaço em disco de um stat (blocos de 512 bytes; sem st_blocks, o tamanho)."""
+    blocks = getattr(st, 'st_blocks', None)
+    return st.st_size if blocks is None else blocks * 512
+
+
+class SizeCache:
+    """
+    Resultado de cada pasta já lida. Chave: (dispositivo, inode) da pasta.
+    Valor: (mtime_ns, bytes da pasta e dos seus arquivos, subpastas como
+    tuplas (nome, inode)). Vale entre sessões: fica num arquivo pickle.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = None   # carregado no primeiro uso
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                version, entries = pickle.load(f)
+            if version != CACHE_VERSION:
+                entries = {}
+        except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+            entries = {} # sem cache (ou cache corrompido): tudo é lido de novo
+        self._entries = entries
+
+    def get(self, key, mtime):
+        """(bytes, subpastas) se a pasta não mudou desde que foi guardada."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1], entry[2]
+        return None
+
+    def put(self, key, mtime, own, subdirs):
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                # Subpastas que sumiram: as entradas delas (e de tudo
+                # abaixo) não seriam mais usadas
+                gone = set(old[2]).difference(subdirs)
+                self._forget([(key[0], ino) for _, ino in gone])
+            if time.time_ns() - mtime > RACY_NS:
+                self._entries[key] = (mtime, own, subdirs)
+            else:
+                self._entries.pop(key, None)
+            self._dirty = True
+
+    def _forget(self, keys):
+        """Remove as entradas de 'keys' e das subpastas delas."""
+        while keys:
+            dev, ino = keys.pop()
+            entry = self._entries.pop((dev, ino), None)
+            if entry is not None:
+                keys.extend((dev, child) for _, child in entry[2])
+
+    def __len__(self):
+        return len(self._entries or ())
+
+    def save(self):
+        """Grava o cache, se mudou (num arquivo novo, trocado de uma vez)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            folder = os.path.dirname(self.path)
+            fd, tmp = tempfile.mkstemp(prefix=".du_cache-", dir=folder)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((CACHE_VERSION, self._entries), f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+
+
+class Dir:
+    """Uma pasta da árvore medida."""
+    __slots__ = ('path', 'depth', 'own', 'total', 'children')
+
+    def __init__(self, path, depth):
+        self.path = path
+        self.depth = depth
+        self.own = 0          # a própria pasta e os arquivos dela
+        self.total = 0        # com as subpastas (preenchido no fim)
+        self.children = ()
+
+
+class DiskUsage:
+    """
+    Uma medição ('du' de uma pasta). run() é um gerador: produz '' de
+    tempos em tempos enquanto o pool trabalha e devolve a Dir da raiz, com
+    os totais prontos (ou None, se foi cancelada).
+    """
+
+    def __init__(self, cache, fresh=False):
+        self.cache = cache
+        self.fresh = fresh        # --no-cache: lê tudo, mas atualiza o cache
+        self.errors = []          # (caminho, OSError)
+        self.scanned = 0          # pastas lidas com scandir
+        self.reused = 0           # pastas que vieram do cache
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._finished = threading.Event()
+        self._cancelled = threading.Event()
+        self._pool = None
+
+    def run(self, top):
+        self.cache.load()
+        root = Dir(top, 0)
+        self._pool = ThreadPoolExecutor(max_workers=WORKERS)
+        try:
+            self._submit(root)
+            while not self._finished.wait(TICK):
+                yield ''
+        finally:
+            if not self._finished.is_set():
+                self._cancelled.set() # o consumidor desistiu (Ctrl-C)
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._cancelled.is_set():
+            return None
+        self._sum(root)
+        return root
+
+    def _submit(self, directory):
+        with self._lock:
+            self._outstanding += 1
+        try:
+            self._pool.submit(self._visit, directory)
+        except RuntimeError:
+            self._done_one() # o pool já foi encerrado (cancelamento)
+
+    def _visit(self, directory):
+        try:
+            if not self._cancelled.is_set():
+                try:
+                    own, subdirs = self._read(directory.path)
+                except OSError as e:
+                    with self._lock:
+                        self.errors.append((directory.path, e))
+                else:
+                    directory.own = own
+                    directory.children = [Dir(os.path.join(directory.path, name), directory.depth + 1)
+                                          for name, _ in subdirs]
+                    for child in directory.children:
+                        if self._cancelled.is_set():
+                            break
+                        self._submit(child)
+        finally:
+            self._done_one()
+
+    def _done_one(self):
+        with self._lock:
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._finished.set()
+
+    def _read(self, path):
+        """(bytes da pasta e dos arquivos dela, subpastas), do cache ou do disco."""
+        st = os.lstat(path)
+        key = (st.st_dev, st.st_ino)
+        if not self.fresh:
+            cached = self.cache.get(key, st.st_mtime_ns)
+            if cached is not None:
+                with self._lock:
+                    self.reused += 1
+                return cached
+
+        own, subdirs = disk_bytes(st), []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.name, entry.inode()))
+                        continue
+                    own += disk_bytes(entry.stat(follow_symlinks=False))
+                except OSError:
+                    pass # apagado entre o scandir e o stat
+        subdirs = tuple(sorted(subdirs))
+        self.cache.put(key, st.st_mtime_ns, own, subdirs)
+        with self._lock:
+            self.scanned += 1
+        return own, subdirs
+
+    @staticmethod
+    def _sum(root):
+        """Totais de baixo para cima (sem recursão: a árvore pode ser funda)."""
+        order, stack = [], [root]
+        while stack:
+            directory = stack.pop()
+            order.append(directory)
+            stack.extend(directory.children)
+        for directory in reversed(order):
+            directory.total = directory.own + sum(c.total for c in directory.children)
+
+
+def rows(root, max_depth=None):
+    """
+    (total, caminho) de cada pasta até max_depth, na ordem do du: as
+    subpastas (em ordem alfabética) antes da pasta que as contém.
+    """
+    out, stack = [], [(root, False)]
+    while stack:
+        directory, expanded = stack.pop()
+        if expanded:
+            out.append((directory.total, directory.path))
+            continue
+        if max_depth is not None and directory.depth > max_depth:
+            continue
+        stack.append((directory, True))
+        stack.extend((c, False) for c in reversed(directory.children))
+    return out
@@ -1,8 +1,53 @@
-import subprocess
 import os
+import re
+import signal
 import sys
-import requests
 import datetime
+import heapq
+import inspect
+import threading
+import time
+from history import History
+from jobs import JobTable, JobWaiter
+from metrics import Metrics, format_seconds
+from paths import data_file
+from fileops import BulkOperation, copy_path, human_size, move_path, remove_path
+from listing import file_entry, scan_dir, sort_entries, walk_parallel
+from disk_usage import DiskUsage, SizeCache, disk_bytes, rows
+from textfile import LineIndex, is_binary, iter_text
+from pipeline import Pipeline
+from search import Grep, compile_pattern, find
+from globbing import GlobError, GlobExpander
+from process_runner import ExternalProcess
+from output import TerminalSink
+from watching import DEFAULT_INTERVAL, MIN_INTERVAL, Watch
+
+# Linhas por bloco de saída do ls (uma escrita por bloco, não por arquivo)
+LS_CHUNK_LINES = 512
+
+# Builtins demorados (apagam/copiam/varrem árvores inteiras). Na GUI eles rodam
+# numa thread, como um pipeline de um estágio, para a janela não travar e
+# o progresso aparecer enquanto acontece; o Ctrl-C os interrompe.
+THREADED_BUILTINS = {'rm', 'cp', 'mv', 'grep', 'find', 'du'}
+
+# Comandos que não são medidos por si: o 'time' mede o comando dentro dele
+# e a lista (a ; b && c) mede cada comando separadamente. O 'watch' só
+# termina no Ctrl-C: a duração dele não diz nada.
+UNMEASURED = {'time', 'list', 'watch'}
+
+def _motivo_ia(erro):
+    """Texto curto de uma falha passageira da IA (ex: 'limite da API (429)')."""
+    if erro.status == 429:
+        return "limite da API (429)"
+    if erro.status is not None:
+        return f"servidor indisponível ({erro.status})"
+    return "falha de rede"
+
+def exit_status(code):
+    """Converte o código do processo no status do shell (sinal N -> 128+N)."""
+    if code is None:
+        return 0
+    return 128 - code if code < 0 else code
 
 class ClearScreenSignal(Exception):
     """Sinal para a GUI limpar a tela"""
@@ -18,31 +63,88 @@ class Executor:
         """
         
         #Inicializa o historico
-        self.history = []
-        pass
+        # Histórico persistente, compartilhado entre sessões. Quem registra
+        # os comandos é a interface (a linha do jeito que foi digitada).
+        self.history = History()
+
+        # Para onde vai a saída dos comandos (ver output.py). Sem GUI, direto
+        # ao terminal; a GUI injeta uma QueueSink e a esvazia com root.after.
+        self.output = TerminalSink()
+
+        # Processo externo (ou resposta da IA) rodando em primeiro plano,
+        # apenas no modo GUI.
+        self.foreground = None
+
+        # Quantas vezes algo foi escrito no stderr (o execute usa para saber
+        # se um builtin gerador falhou)
+        self.stderr_writes = 0
+
+        # Status do último comando (o '$?'). Na GUI, o de um comando que
+        # segue rodando só é conhecido quando ele termina (finish_foreground).
+        self.last_status = 0
+
+        # Resto de uma lista (a && b ; c) esperando o comando em primeiro
+        # plano terminar, na GUI (ver exec_list)
+        self._pending_list = None
+
+        # Jobs em segundo plano ('comando &')
+        self.jobs = JobTable()
+
+        # Tempo e recursos de cada comando, agregados por nome ('stats').
+        # _measurement é a medição do comando sendo despachado agora.
+        self.metrics = Metrics()
+        self._measurement = None
+
+        # Abre o paginador do 'show --pager' (a GUI preenche; sem GUI o
+        # arquivo é simplesmente mostrado inteiro).
+        self.pager = None
+
+        # Expansão de curingas (*.py, src/**/x.c), com as listagens de pasta em cache
+        self.expander = GlobExpander()
+
+        # Cliente do Gemini e cache de respostas, criados no primeiro uso do ia_mode.
+        self.ia_client = None
+        self.ia_cache = None
+
+        # Tamanho das pastas já medidas pelo 'du' (ver disk_usage.py), em
+        # ~/.termia; criado no primeiro uso.
+        self.du_cache = None
+
+        # Memória da conversa do ia_mode (ver conversation.py)
+        self.ia_conversa = None
+
+        # Limite de taxa da API (balde de fichas) e fila de perguntas em
+        # paralelo ('pergunta &'), ver ia_queue.py
+        self.ia_limite = None
+        self.ia_fila = None
     
-    def execute(self, ast_node):
+    def execute(self, ast_node, report=None):
         """
         O 'Despachante' (Dispatcher) Central.
         Recebe a Árvore Sintática Abstrata (AST) gerada pelo Parser e decide
         dinamicamente qual método deve ser chamado para executar a ação.
+        'report' é chamado com a medição (metrics.Measurement) quando o
+        comando termina; o prefixo 'time' usa isso para mostrar os números.
         """
         # 1. Verificação de segurança: Se o usuário apertou apenas ENTER,
         # o parser retorna None. Aqui evitamos que o programa quebre.
         if ast_node is None:
-            return
+            return 0
         
         # 2. Extrai o tipo do comando da AST (ex: 'cd', 'ls', 'mkdir')
         command_type = ast_node.get('type')
         
-        command_flag =" " if ast_node.get('flags') == None else ast_node.get('flags')
-        
-        command_path =" " if ast_node.get('path') == None else ast_node.get('path')
-        
-        full_command = f"{command_type} {command_flag} {command_path}"
-        
-        self.history.append(full_command)
-        
+        # Fase de expansão: os curingas viram os caminhos que existem agora.
+        # Todo comando passa por aqui antes de rodar (builtins, pipelines e
+        # programas externos), então cada handler já recebe a lista pronta.
+        # O '$?' vira o status do comando anterior na mesma fase.
+        try:
+            ast_node = self.expander.expand(ast_node, self.last_status)
+        except GlobError as e:
+            self.print(f"TermIA: {command_type}: {e}", tag='stderr')
+            self.last_status = 1
+            return 1
+
         # 3. Metaprogramação: Cria o nome da função que deveria existir.
         # Ex: Se command_type é 'cd', procura por 'exec_cd'.
         method_name = f'exec_{command_type}'
@@ -52,21 +154,169 @@ class Executor:
         # - Se achar (ex: exec_cd), coloca ele na variável 'handler'.
         # - Se NÃO achar, coloca 'self.exec_generic' na variável 'handler'.
         handler = getattr(self, method_name, self.exec_generic)
+        if command_type in THREADED_BUILTINS and self.output.asynchronous:
+            handler = self._run_in_thread
+
+        # Medição do comando (tempo de parede, CPU, rusage dos filhos).
+        # Comandos que seguem rodando depois daqui (processos na GUI) param
+        # a medição só quando terminam (ver run_foreground).
+        measurement = None
+        if command_type not in UNMEASURED:
+            measurement = self.metrics.start(command_type, report)
+        outer, self._measurement = self._measurement, measurement
         
+        # Status de saída, como no shell: 0 = sucesso. Quem roda um processo
+        # devolve o código dele; um builtin gerador pode devolver o seu
+        # (return 1) e, se não devolver, conta como falha (1) quando
+        # escreveu no stderr.
+        errors_before = self.stderr_writes
+        status = 1
         try:
-            # 5. Executa a função escolhida passando os dados da AST
-            handler(ast_node)
+            # 5. Executa a função escolhida passando os dados da AST.
+            # Builtins que produzem saída (ls, show, echo...) são geradores:
+            # aqui, fora de um pipeline, a saída deles vai direto para a tela.
+            result = handler(ast_node)
+            if inspect.isgenerator(result):
+                result = self._drain_builtin(result)
+                if result is None:
+                    result = 1 if self.stderr_writes != errors_before else 0
+            status = result if isinstance(result, int) else 0
+            return status
+        except ClearScreenSignal:
+            # Não é um erro: é um pedido para a GUI, que precisa recebê-lo.
+            status = 0
+            raise
         except Exception as e:
             # 6. Proteção Global: Se qualquer erro ocorrer na execução,
             # capturamos aqui para impedir que o Shell feche sozinho (crash).
-            print(f"[EXEC] Erro ao executar '{command_type}': {e}")
+            self.print(f"[EXEC] Erro ao executar '{command_type}': {e}", tag='stderr')
+            return 1
+        finally:
+            self._measurement = outer
+            self.last_status = exit_status(status)
+            if measurement is not None and not measurement.deferred:
+                measurement.stop(status)
     
+    def _drain_builtin(self, generator):
+        """
+        Manda a saída de um builtin gerador para a tela e devolve o status
+        que ele deu no 'return' (None se não deu), como o Pipeline._drain.
+        """
+        try:
+            while True:
+                try:
+                    chunk = next(generator)
+                except StopIteration as stop:
+                    return stop.value if isinstance(stop.value, int) else None
+                self.emit(chunk)
+        finally:
+            generator.close()
+
+    def _run_in_thread(self, node):
+        """Roda um builtin gerador fora da thread da GUI (ver THREADED_BUILTINS)."""
+        stage = {'type': 'stage', 'command': node, 'redirs': ()}
+        return self.run_foreground(Pipeline(self, [stage]))
+
+    def builtin_handler(self, node):
+        """Método exec_* do comando, ou None se for um programa externo."""
+        return getattr(self, f"exec_{node.get('type')}", None)
+
+    def emit(self, text, tag='stdout'):
+        """
+        Envia um pedaço de saída ao sink, de qualquer thread.
+        tag: 'stdout', 'stderr', 'ia', 'job' (aviso de job terminado),
+        'report' (relatório do 'time'), 'watch' (quadro do watch, uma lista
+        de linhas) ou 'done' (fim do comando em primeiro plano).
+        """
+        if tag == 'stderr':
+            self.stderr_writes += 1
+        self.output.write(text, tag)
+
+    def print(self, *values, sep=" ", end="\n", tag='stdout'):
+        """Como o print(), mas para a saída do comando (erros com tag='stderr')."""
+        self.emit(sep.join(map(str, values)) + end, tag)
+
+    def run_foreground(self, task):
+        """
+        Inicia uma tarefa com start/wait/cancel/on_exit (processo externo,
+        pipeline ou resposta da IA). Sem GUI, espera aqui mesmo; com GUI,
+        ela segue em segundo plano e a GUI é avisada do fim por um evento
+        'done' na fila (ver TermIAGUI._drain_output).
+        """
+        measurement = self._measurement
+        if measurement is not None:
+            measurement.track(task) # o rusage dos processos entra na medição
+        if not self.output.asynchronous:
+            task.start()
+            try:
+                return task.wait()
+            except KeyboardInterrupt:
+                # O filho roda em outra sessão, então repassamos o Ctrl-C.
+                task.cancel()
+                return task.wait()
+
+        def finished(code):
+            # A medição para antes do 'done', para o relatório do 'time'
+            # aparecer antes do prompt.
+            if measurement is not None:
+                measurement.stop(code)
+            self.emit(code, 'done')
+
+        task.on_exit = finished
+        task.start()
+        if measurement is not None:
+            measurement.defer()
+        self.foreground = task
+        return 0 # Na GUI o código só é conhecido no evento 'done'
+
+    def cancel_foreground(self):
+        """Sinaliza (Ctrl-C) o comando em primeiro plano. Retorna True se havia algum."""
+        if self.foreground is None:
+            return False
+        self._pending_list = None # Como no sh: o Ctrl-C interrompe a lista inteira
+        self.foreground.cancel()
+        return True
+
+    def finish_foreground(self, code):
+        """
+        (GUI) O comando em primeiro plano terminou com 'code' (evento 'done').
+        Atualiza o '$?' e continua a lista de comandos que esperava por ele.
+        """
+        self.foreground = None
+        self.last_status = exit_status(code)
+        steps, self._pending_list = self._pending_list, None
+        if steps is not None:
+            self._run_list(steps, self.last_status)
+
+    # ----------------------------------------------
+    # LISTAS DE COMANDOS (a ; b, a && b, a || b)
+    # ----------------------------------------------
+    def exec_list(self, node):
+        """
+        Roda os comandos de uma linha em sequência, com curto-circuito:
+        '&&' só roda o próximo se o anterior deu certo (status 0) e '||' só
+        se falhou. Devolve o status do último comando que rodou.
+        """
+        return self._run_list(iter(node['items']), 0)
+
+    def _run_list(self, steps, status):
+        for op, command in steps:
+            if (op == '&&' and status != 0) or (op == '||' and status == 0):
+                continue # pulado: o status continua o do último que rodou
+            status = self.execute(command)
+            if self.foreground is not None:
+                # Na GUI o comando segue rodando e o status só chega no
+                # evento 'done': o resto da lista continua de lá.
+                self._pending_list = steps
+                return status
+        return status
+
     def exec_exit(self, node):
         """
         Comando Built-in: EXIT
         Encerra a execução do interpretador Python.
         """
-        print("Encerrando o Shell ...............")
+        self.print("Encerrando o Shell ...............")
         sys.exit(0) # '0' informa ao sistema operacional que saiu com sucesso/sem erros.
         
     def exec_cd(self, node):
@@ -84,35 +334,62 @@ class Executor:
             os.chdir(path)
         except FileNotFoundError:
             # Trata o erro semântico: a pasta não existe
-            print(f"TermIA> cd: diretório não encontrado: {path}")
+            self.print(f"TermIA> cd: diretório não encontrado: {path}", tag='stderr')
+            return 1
         except NotADirectoryError:
             # Trata o erro semântico: o caminho existe, mas é um arquivo, não pasta
-            print(f"TermIA> cd: não é um diretório: {path}")
+            self.print(f"TermIA> cd: não é um diretório: {path}", tag='stderr')
+            return 1
+        return 0
     
-    def exec_pwd(self, node):
+    def exec_pwd(self, node, entrada=None):
         """
         Comando Built-in: PWD (Print Working Directory)
         Imprime o caminho absoluto de onde o shell está localizado agora.
         """
-        print(os.getcwd())
+        yield os.getcwd() + "\n"
         
-    def exec_help(self, node):
+    def exec_help(self, node, entrada=None):
         """(Embutido) Mostra ajuda."""
-        print("--- Ajuda do TermIA ---")
-        print("  help          - Mostra esta ajuda")
-        print("  exit          - Sai do terminal")
-        print("  cd <path>     - Muda de diretório")
-        print("  pwd           - Mostra o diretório atual")
-        print("  ls [-flags] [path] - Mostra todos os arquivos no diretorio atual")
-        print("  mkdir <path> - Cria uma pasta com o nome desejado")
-        print("  rmdir <path> - Exclui uma pasta")
-        print("  touch <path> - Cria um arquivo com o nome desejado")
-        print("  echo <args...> - Printa no terminal a mensagem escrita")
-        print("  show <file> - Mostra todo o conteudo de um arquivo")
-        print("--- AI MODE ---")
-        print(" ai_mode - Entra no modo IA, onde voce pode fazer perguntas diretamente para o gemini e receber respostas em tempo real")
+        yield "--- Ajuda do TermIA ---\n"
+        yield "  help          - Mostra esta ajuda\n"
+        yield "  exit          - Sai do terminal\n"
+        yield "  cd <path>     - Muda de diretório\n"
+        yield "  pwd           - Mostra o diretório atual\n"
+        yield "  ls [-alrRSt] [-n N] [path...] - Mostra os arquivos do diretorio (-R recursivo, -S/-t por tamanho/data)\n"
+        yield "  mkdir [-p] <path...> - Cria pastas (-p cria as intermediárias)\n"
+        yield "  rmdir <path> - Exclui uma pasta vazia\n"
+        yield "  rm [-r] [-f] <path...> - Remove arquivos (-r remove pastas inteiras)\n"
+        yield "  cp [-r] <origem...> <destino> - Copia arquivos (-r copia pastas)\n"
+        yield "  mv <origem...> <destino> - Move ou renomeia arquivos e pastas\n"
+        yield "  grep [-r] [-i] [-n] [-m N] <padrão> [path...] - Procura um padrão (regex) nos arquivos\n"
+        yield "  du [-h] [-d N] [--top N] [path...] - Espaço ocupado pelas pastas (--no-cache lê tudo de novo)\n"
+        yield "  find [path...] [-name P] [-iname P] [-type f|d] - Procura arquivos pelo nome\n"
+        yield "  touch <path> - Cria um arquivo com o nome desejado\n"
+        yield "  echo <args...> - Printa no terminal a mensagem escrita\n"
+        yield "  show <file> - Mostra todo o conteudo de um arquivo\n"
+        yield "  show --head N | --tail N | --lines A:B <file> - Mostra so um trecho do arquivo\n"
+        yield "  show --pager <file> - Abre o arquivo num paginador (setas, PgUp/PgDn, q para fechar)\n"
+        yield "  history [padrao] - Mostra o historico (com padrao, so os comandos que o contem)\n"
+        yield "  Tab           - Completa comandos, programas do PATH e caminhos\n"
+        yield "  Ctrl-R        - Busca reversa no historico (Ctrl-R de novo = mais antigo, Esc cancela)\n"
+        yield "  a | b         - Liga a saída de um comando à entrada de outro\n"
+        yield "  a ; b, a && b, a || b - Roda em sequência (&& só se 'a' deu certo, || só se falhou)\n"
+        yield "  $?            - Status do último comando (0 = sucesso), ex: echo $?\n"
+        yield "  cmd > f, >> f, < f - Redireciona a saída (sobrescreve/anexa) ou a entrada\n"
+        yield "  *.py, src/**/*.c - Curingas: viram os arquivos que casam (entre aspas não expandem)\n"
+        yield "  Ctrl-C        - Interrompe o comando externo em execução\n"
+        yield "  cmd &         - Roda o comando em segundo plano (a saída fica guardada no job)\n"
+        yield "  jobs, fg [%n], kill [-SINAL] %n, wait [%n] - Lista, traz para a tela, encerra ou espera jobs\n"
+        yield "  time [--profile] cmd - Mostra quanto o comando levou (--profile grava um perfil do cProfile)\n"
+        yield "  watch [-n seg] cmd - Roda o comando de novo a cada -n segundos (padrão 2), e a cada mudança nas pastas dele; Ctrl-C para\n"
+        yield "  stats [cmd|reset] - Tempo e recursos dos comandos da sessão (com cmd, o histograma dele)\n"
+        yield "  ia_cache stats|clear - Estatísticas ou limpeza do cache de respostas da IA\n"
+        yield "--- AI MODE ---\n"
+        yield " ai_mode - Entra no modo IA, onde voce pode fazer perguntas diretamente para o gemini e receber respostas em tempo real\n"
+        yield "   (a IA lembra da conversa; /reset, /save <nome>, /load <nome>, /sessions, /context)\n"
     
-    def exec_echo(self, node):
+    def exec_echo(self, node, entrada=None):
         """
         Comando Built-in: ECHO
         Função: Repete na saída padrão (stdout) os argumentos recebidos.
@@ -122,8 +399,8 @@ class Executor:
         # O método .join junta esses itens colocando um espaço " " entre cada um.
         mensagem = " ".join(node['args'])
         
-        # Envia o texto final para o stdout (que sua GUI vai capturar)
-        print(mensagem)
+        # Entrega o texto para a tela ou para o próximo estágio do pipeline
+        yield mensagem + "\n"
     
     def exec_touch(self, node):
         """
@@ -136,8 +413,8 @@ class Executor:
         
         # 1. Validação de Argumento
         if not filename:
-            print("TermIA: touch: falta o nome do arquivo.")
-            return
+            self.print("TermIA: touch: falta o nome do arquivo.", tag='stderr')
+            return 1
 
         try:
             # 2. Verifica se o arquivo já existe no disco
@@ -155,65 +432,154 @@ class Executor:
                     
         except PermissionError:
             # Captura erro de permissão (ex: tentar criar arquivo em pasta de sistema)
-            print(f"TermIA: touch: permissão negada: {filename}")
+            self.print(f"TermIA: touch: permissão negada: {filename}", tag='stderr')
+            return 1
         except Exception as e:
             # Captura erros genéricos (ex: nome de arquivo inválido com caracteres proibidos)
-            print(f"TermIA: erro ao executar touch: {e}")
+            self.print(f"TermIA: erro ao executar touch: {e}", tag='stderr')
+            return 1
+        return 0
     
-    def exec_show(self, node):
+    def exec_show(self, node, entrada=None):
         """
         Comando Built-in: SHOW (Personalizado)
         Função: Lê um arquivo de texto e exibe seu conteúdo na tela.
         Equivalente ao comando 'cat' do Linux ou 'type' do Windows.
+        Sem arquivo, mas dentro de um pipeline, repassa a própria entrada.
+        Opções:
+         --head N    : Só as N primeiras linhas
+         --tail N    : Só as N últimas linhas
+         --lines A:B : Da linha A até a B (contando de 1, inclusive)
+         --pager     : Abre o arquivo num paginador (só na GUI)
         """
         filename = node.get('path')
         
         # 1. Validação de Argumento
         if not filename:
-            print("TermIA: show: falta o nome do arquivo.")
+            if entrada is not None:
+                yield from entrada
+                return
+            self.emit("TermIA: show: falta o nome do arquivo.\n", 'stderr')
+            return
+
+        try:
+            head, tail, line_range = self._show_options(node)
+        except ValueError as e:
+            self.emit(f"TermIA: show: {e}\n", 'stderr')
             return
 
         try:
-            # 2. Abertura de Arquivo
-            # 'r': Read mode (apenas leitura).
-            # encoding='utf-8': Essencial para ler arquivos com acentos (ç, ã, é) corretamente.
-            with open(filename, 'r', encoding='utf-8') as f:
-                content = f.read() # Lê o arquivo inteiro para a memória RAM
-                print(content)     # Joga o conteúdo na tela
+            # 2. Arquivos binários (imagem, executável...) são recusados logo
+            # de cara, olhando só o começo, em vez de falhar no meio da leitura.
+            if is_binary(filename):
+                self.emit(f"TermIA: show: '{filename}' é um arquivo binário.\n", 'stderr')
+                return
+
+            # 3. Arquivo inteiro: lido em blocos, nunca fica todo na memória RAM
+            if head is None and tail is None and line_range is None:
+                if self._wants_pager(node):
+                    self.pager(LineIndex(filename))
+                else:
+                    yield from iter_text(filename)
+                return
+
+            # 4. Só um trecho: o índice de linhas (mmap) acha o começo e o fim
+            # do trecho sem ler o resto do arquivo.
+            with LineIndex(filename) as index:
+                if tail is not None:
+                    start, end = index.tail_offset(tail), index.size
+                elif head is not None:
+                    start, end = 0, index.offset(head)
+                else:
+                    first, last = line_range
+                    start = index.offset(first - 1)
+                    end = index.size if last is None else index.offset(last)
+                yield from index.iter_range(start, end)
                 
         except FileNotFoundError:
             # Erro semântico clássico: o usuário pediu para ler algo que não existe.
-            print(f"TermIA: show: arquivo não encontrado: {filename}")
+            self.emit(f"TermIA: show: arquivo não encontrado: {filename}\n", 'stderr')
         except PermissionError:
             # O arquivo existe, mas o usuário não tem permissão de leitura.
-            print(f"TermIA: show: permissão negada para ler: {filename}")
+            self.emit(f"TermIA: show: permissão negada para ler: {filename}\n", 'stderr')
+        except IsADirectoryError:
+            self.emit(f"TermIA: show: '{filename}' é um diretório.\n", 'stderr')
         except Exception as e:
-            # Outros erros (ex: tentar ler um arquivo binário/imagem como se fosse texto)
-            print(f"TermIA: erro ao ler arquivo: {e}")
+            self.emit(f"TermIA: erro ao ler arquivo: {e}\n", 'stderr')
+
+    def _show_options(self, node):
+        """Valida --head/--tail/--lines. Levanta ValueError com a mensagem para o usuário."""
+        def count(name):
+            value = node.get(name)
+            if value is None:
+                return None
+            if not value.isdigit():
+                raise ValueError(f"valor inválido para --{name}: {value}")
+            return int(value)
+
+        head, tail = count('head'), count('tail')
+        line_range = None
+        if node.get('lines') is not None:
+            # "A:B", "A:" (até o fim) ou ":B" (desde o começo)
+            first, sep, last = node['lines'].partition(':')
+            if not sep or not (first or last) or not (first + last).isdigit():
+                raise ValueError(f"intervalo inválido para --lines: {node['lines']} (use A:B)")
+            first = int(first) if first else 1
+            last = int(last) if last else None
+            if first < 1 or (last is not None and last < first):
+                raise ValueError(f"intervalo inválido para --lines: {node['lines']}")
+            line_range = (first, last)
+
+        if sum(opt is not None for opt in (head, tail, line_range)) > 1:
+            raise ValueError("use só uma entre --head, --tail e --lines.")
+        return head, tail, line_range
+
+    def _wants_pager(self, node):
+        """
+        O paginador é uma janela do Tk: só existe na GUI e só pode ser
+        criado pela thread principal (em um pipeline o show roda em outra).
+        """
+        flags = node.get('flags') or ()
+        return (('--pager' in flags or '-p' in flags) and self.pager is not None
+                and threading.current_thread() is threading.main_thread())
     
     def exec_mkdir(self, node):
         """
-        (Embutido) Cria um diretório.
+        (Embutido) Cria diretórios.
         Feito em Python para garantir que funcione no Windows e Linux.
+         -p : Cria também as pastas intermediárias e não reclama se já existir
         """
-        path = node.get('path')
+        paths = node.get('paths') or []
+        parents = '-p' in (node.get('flags') or ())
         
-        if not path:
-            print("TermIA: mkdir: falta o nome do diretório.")
-            return
+        if not paths:
+            self.print("TermIA: mkdir: falta o nome do diretório.", tag='stderr')
+            return 1
 
-        try:
-            # os.makedirs cria a pasta (e as subpastas se necessário)
-            # exist_ok=False faz dar erro se a pasta já existir (comportamento padrão do mkdir)
-            os.makedirs(path, exist_ok=False)
-            print(f"Diretório '{path}' criado com sucesso.") # Opcional: feedback visual
-            
-        except FileExistsError:
-            print(f"TermIA: mkdir: não foi possível criar o diretório '{path}': O arquivo já existe.")
-        except PermissionError:
-            print(f"TermIA: mkdir: permissão negada para criar '{path}'.")
-        except Exception as e:
-            print(f"TermIA: erro desconhecido ao criar diretório: {e}")
+        status = 0
+        for path in paths:
+            try:
+                if parents:
+                    # os.makedirs cria a pasta e as intermediárias que faltarem
+                    os.makedirs(path, exist_ok=True)
+                else:
+                    # Sem -p, como no mkdir: a pasta de cima precisa existir
+                    os.mkdir(path)
+                    self.print(f"Diretório '{path}' criado com sucesso.") # Opcional: feedback visual
+
+            except FileExistsError:
+                self.print(f"TermIA: mkdir: não foi possível criar o diretório '{path}': O arquivo já existe.", tag='stderr')
+                status = 1
+            except FileNotFoundError:
+                self.print(f"TermIA: mkdir: não foi possível criar '{path}': a pasta de cima não existe (use mkdir -p).", tag='stderr')
+                status = 1
+            except PermissionError:
+                self.print(f"TermIA: mkdir: permissão negada para criar '{path}'.", tag='stderr')
+                status = 1
+            except Exception as e:
+                self.print(f"TermIA: erro desconhecido ao criar diretório: {e}", tag='stderr')
+                status = 1
+        return status
     
     def exec_rmdir(self, node):
         """(Embutido) Remove um diretório vazio."""
@@ -221,62 +587,188 @@ class Executor:
         
         # 1. Validação básica
         if not path:
-            print("TermIA: rmdir: falta o nome do diretório.")
-            return
+            self.print("TermIA: rmdir: falta o nome do diretório.", tag='stderr')
+            return 1
 
         # 2. Execução Segura
         try:
             os.rmdir(path)
-            print(f"Diretório '{path}' removido.")
+            self.print(f"Diretório '{path}' removido.")
             
         except FileNotFoundError:
-            print(f"TermIA: rmdir: falha ao remover '{path}': Diretório não encontrado.")
+            self.print(f"TermIA: rmdir: falha ao remover '{path}': Diretório não encontrado.", tag='stderr')
+            return 1
             
+        except PermissionError:
+            self.print(f"TermIA: rmdir: permissão negada para remover '{path}'.", tag='stderr')
+            return 1
+
         except OSError as e:
             # Esse erro (WinError 145 ou OSError 39) acontece se a pasta NÃO estiver vazia
-            print(f"TermIA: rmdir: falha ao remover '{path}': A pasta não está vazia.")
-            print("Dica: O comando rmdir só remove pastas vazias por segurança.")
-            
-        except PermissionError:
-            print(f"TermIA: rmdir: permissão negada para remover '{path}'.")
+            self.print(f"TermIA: rmdir: falha ao remover '{path}': A pasta não está vazia.", tag='stderr')
+            self.print("Dica: O comando rmdir só remove pastas vazias por segurança.", tag='stderr')
+            return 1
+        return 0
     
-    def exec_rm(self, node):
-        """(Embutido) Remove um arquivo (não remove pastas)."""
-        filename = node.get('path')
-        
+    def exec_rm(self, node, entrada=None):
+        """
+        (Embutido) Remove arquivos.
+         -r : Remove pastas inteiras (os arquivos são apagados em paralelo)
+         -f : Não reclama do que não existe
+        """
+        paths = node.get('paths') or []
+        flags = "".join(node.get('flags') or [])
+        recursive = 'r' in flags or 'R' in flags
+        force = 'f' in flags
+
         # 1. Validação básica
-        if not filename:
-            print("TermIA: rm: falta o nome do arquivo.")
-            return
+        if not paths:
+            self.emit("TermIA: rm: falta o nome do arquivo.\n", 'stderr')
+            return 1
 
-        # 2. Execução
+        errors_before = self.stderr_writes
+        op = BulkOperation('rm')
         try:
-            os.remove(filename)
-            print(f"Arquivo '{filename}' removido.")
-            
-        except FileNotFoundError:
-            print(f"TermIA: rm: não foi possível remover '{filename}': Arquivo não encontrado.")
-            
-        except IsADirectoryError:
-            # Esse erro acontece se você tentar usar 'rm' em uma pasta
-            print(f"TermIA: rm: não foi possível remover '{filename}': É um diretório.")
-            print("Dica: Para remover diretórios, use o comando 'rmdir'.")
-            
-        except PermissionError:
-            # Acontece se o arquivo estiver aberto em outro programa ou for protegido
-            print(f"TermIA: rm: permissão negada para remover '{filename}'.")
-            
-        except Exception as e:
-            print(f"TermIA: erro desconhecido no rm: {e}")
+            for path in paths:
+                # Como no rm do GNU: '.', '..' e a raiz nunca (um 'rm -r .'
+                # apagaria a pasta atual inteira)
+                if os.path.basename(path.rstrip('/\\')) in ('.', '..'):
+                    self.emit(f"TermIA: rm: recusando remover '.' ou '..': '{path}' ignorado.\n", 'stderr')
+                    continue
+                real = os.path.realpath(path)
+                if os.path.dirname(real) == real and not os.path.islink(path):
+                    self.emit(f"TermIA: rm: é perigoso remover a raiz '{path}': ignorado.\n", 'stderr')
+                    continue
+                if os.path.isdir(path) and not os.path.islink(path):
+                    if not recursive:
+                        # Esse erro acontece se você tentar usar 'rm' em uma pasta
+                        self.emit(f"TermIA: rm: não foi possível remover '{path}': É um diretório.\n"
+                                  "Dica: Para remover a pasta e tudo dentro dela, use 'rm -r'.\n", 'stderr')
+                        continue
+                    files, dirs = op.files, op.dirs
+                    yield from remove_path(op, path)
+                    yield (f"Pasta '{path}' removida ({op.files - files} arquivos, "
+                           f"{op.dirs - dirs} pastas).\n")
+                    continue
+
+                # 2. Execução (arquivo ou link)
+                try:
+                    os.remove(path)
+                    yield f"Arquivo '{path}' removido.\n"
+                except FileNotFoundError:
+                    if not force:
+                        self.emit(f"TermIA: rm: não foi possível remover '{path}': Arquivo não encontrado.\n", 'stderr')
+                except PermissionError:
+                    # Acontece se o arquivo estiver aberto em outro programa ou for protegido
+                    self.emit(f"TermIA: rm: permissão negada para remover '{path}'.\n", 'stderr')
+                except OSError as e:
+                    self.emit(f"TermIA: rm: não foi possível remover '{path}': {e.strerror}\n", 'stderr')
+        finally:
+            op.close()
+        return self._bulk_errors(op, errors_before)
+
+    def exec_cp(self, node, entrada=None):
+        """
+        (Embutido) Copia arquivos: 'cp origem destino' ou 'cp a b c pasta/'.
+         -r : Copia pastas inteiras (vários arquivos ao mesmo tempo)
+        O conteúdo é copiado dentro do kernel (ver fileops.copy_data).
+        """
+        recursive = any(c in "".join(node.get('flags') or []) for c in 'rR')
+        pairs = self._bulk_targets('cp', node.get('paths') or [])
+        if pairs is None:
+            return 1
+
+        errors_before = self.stderr_writes
+        op = BulkOperation('cp')
+        try:
+            for src, dst in pairs:
+                if os.path.isdir(src) and not recursive:
+                    self.emit(f"TermIA: cp: '{src}' é um diretório (use cp -r).\n", 'stderr')
+                    continue
+                if self._inside(dst, src):
+                    self.emit(f"TermIA: cp: não dá para copiar '{src}' para dentro dela mesma.\n", 'stderr')
+                    continue
+                try:
+                    yield from copy_path(op, src, dst)
+                except OSError as e:
+                    op.error(e.filename or src, e)
+        finally:
+            op.close()
+        if op.files > 1 or op.dirs:
+            yield (f"{op.files} arquivos copiados ({human_size(op.bytes)}) "
+                   f"em {op.elapsed():.1f}s.\n")
+        return self._bulk_errors(op, errors_before)
+
+    def exec_mv(self, node, entrada=None):
+        """
+        (Embutido) Move ou renomeia: 'mv origem destino' ou 'mv a b c pasta/'.
+        No mesmo disco é um rename; entre discos, copia e apaga a origem.
+        """
+        pairs = self._bulk_targets('mv', node.get('paths') or [])
+        if pairs is None:
+            return 1
+
+        errors_before = self.stderr_writes
+        op = BulkOperation('mv')
+        try:
+            for src, dst in pairs:
+                if self._inside(dst, src):
+                    self.emit(f"TermIA: mv: não dá para mover '{src}' para dentro dela mesma.\n", 'stderr')
+                    continue
+                try:
+                    yield from move_path(op, src, dst)
+                except OSError as e:
+                    op.error(e.filename or src, e)
+        finally:
+            op.close()
+        return self._bulk_errors(op, errors_before)
+
+    def _bulk_targets(self, name, paths):
+        """
+        Pares (origem, destino final) do cp/mv. Como no shell: se o último
+        caminho é uma pasta existente, cada origem vai para dentro dela.
+        """
+        if len(paths) < 2:
+            self.emit(f"TermIA: {name}: informe a origem e o destino.\n", 'stderr')
+            return None
+        *sources, dest = paths
+        if os.path.isdir(dest):
+            return [(src, os.path.join(dest, os.path.basename(src.rstrip('/\\')))) for src in sources]
+        if len(sources) > 1:
+            self.emit(f"TermIA: {name}: o destino '{dest}' precisa ser uma pasta.\n", 'stderr')
+            return None
+        return [(sources[0], dest)]
+
+    @staticmethod
+    def _inside(path, folder):
+        """Se 'path' é 'folder' ou fica dentro dela."""
+        path, folder = os.path.realpath(path), os.path.realpath(folder)
+        return os.path.isdir(folder) and os.path.commonpath([path, folder]) == folder
+
+    def _bulk_errors(self, op, errors_before, shown=20):
+        """
+        Mostra os erros de uma operação em massa (só os primeiros) e devolve
+        o status do comando (1 se algo deu errado).
+        """
+        for path, e in op.errors[:shown]:
+            reason = e.strerror or str(e) if isinstance(e, OSError) else str(e)
+            self.emit(f"TermIA: {op.verb}: {path}: {reason}\n", 'stderr')
+        if len(op.errors) > shown:
+            self.emit(f"TermIA: {op.verb}: ... e mais {len(op.errors) - shown} erros\n", 'stderr')
+        return 1 if self.stderr_writes != errors_before else 0
       
-    def exec_ls(self, node):
+    def exec_ls(self, node, entrada=None):
         """
         (Embutido) Lista arquivos com suporte a flags:
          -a : Mostra ocultos
          -r : Inverte a ordem
          -l : Mostra detalhes (tamanho e data)
+         -S : Ordena por tamanho (maiores primeiro)
+         -t : Ordena por data de modificação (mais recentes primeiro)
+         -R : Lista as subpastas recursivamente
+         -n N : Mostra só as N primeiras entradas de cada pasta
         """
-        target_dir = node.get('path') or '.'
+        target_dirs = list(node.get('paths') or ['.'])
         flags_list = node.get('flags') or [] # Ex: ['-l', '-a'] ou ['-la']
         
         # 1. Detectar quais opções estão ativas
@@ -284,162 +776,790 @@ class Executor:
         # Ex: ['-l', '-a'] vira "-l-a". Ex: ['-la'] vira "-la"
         flags_str = "".join(flags_list)
         
-        show_all = 'a' in flags_str   # Flag -a
-        reverse  = 'r' in flags_str   # Flag -r
-        long_fmt = 'l' in flags_str   # Flag -l
+        show_all  = 'a' in flags_str   # Flag -a
+        reverse   = 'r' in flags_str   # Flag -r
+        long_fmt  = 'l' in flags_str   # Flag -l
+        recursive = 'R' in flags_str   # Flag -R
+        sort_by = 'size' if 'S' in flags_str else 'time' if 't' in flags_str else 'name'
 
-        try:
-            # Pega todos os arquivos
-            files = os.listdir(target_dir)
-            
-            # LÓGICA DO -a (ALL)
-            # Se NÃO tiver a flag -a, filtramos tirando os que começam com '.'
-            if not show_all:
-                files = [f for f in files if not f.startswith('.')]
-            
-            # Ordenação Padrão (Alfabética)
-            files.sort()
+        limit = node.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                self.emit(f"TermIA: ls: valor inválido para -n: {limit}\n", 'stderr')
+                return
 
-            # LÓGICA DO -r (REVERSE)
-            if reverse:
-                files.reverse() # Inverte a lista
-            
-            # LÓGICA DO -l (LONG FORMAT)
+        # O stat só é necessário para o modo longo ou para ordenar por tamanho/data
+        need_stat = long_fmt or sort_by != 'name'
+
+        def listing_lines(entries):
+            entries = sort_entries(entries, sort_by, reverse, limit)
             if long_fmt:
-                for filename in files:
-                    full_path = os.path.join(target_dir, filename)
-                    
-                    # Pega estatísticas do arquivo (tamanho, data, etc)
-                    stats = os.stat(full_path)
-                    
-                    # Tamanho em Bytes
-                    size = stats.st_size
-                    
-                    # Data de modificação (convertendo timestamp para texto legível)
-                    mod_time = datetime.datetime.fromtimestamp(stats.st_mtime)
-                    date_str = mod_time.strftime('%Y-%m-%d %H:%M')
-                    
-                    # Identifica se é pasta <DIR> ou arquivo
-                    tipo = "<DIR>" if os.path.isdir(full_path) else "     "
+                return self._ls_long_lines(entries)
+            return [e.name + "\n" for e in entries]
+
+        # Arquivos pedidos pelo nome (ex: 'ls *.py') saem primeiro, juntos,
+        # e as pastas depois, cada uma com o seu título, como no ls do Unix.
+        files = []
+        for path in [p for p in target_dirs if os.path.lexists(p) and not os.path.isdir(p)]:
+            try:
+                files.append(file_entry(path, need_stat))
+            except OSError as e:
+                self.emit(f"TermIA: ls: não foi possível ler '{path}': {e.strerror}\n", 'stderr')
+            target_dirs.remove(path)
+        if files:
+            yield from self._ls_chunks(listing_lines(files))
+
+        for n, target_dir in enumerate(target_dirs):
+            if n > 0 or files:
+                yield "\n"
+            try:
+                if recursive:
+                    def on_error(path, e):
+                        self.emit(f"TermIA: ls: não foi possível ler '{path}': {e.strerror}\n", 'stderr')
+
+                    for path, entries in walk_parallel(target_dir, show_all, need_stat, on_error):
+                        yield f"{path}:\n"
+                        yield from self._ls_chunks(listing_lines(entries))
+                        yield "\n"
+                else:
+                    if len(target_dirs) > 1 or files:
+                        yield f"{target_dir}:\n"
+                    entries = scan_dir(target_dir, show_all, need_stat)
+                    yield from self._ls_chunks(listing_lines(entries))
                     
-                    # Imprime formatado (alinhado em colunas)
-                    # {:<10} significa "ocupe 10 espaços alinhado à esquerda"
-                    print(f"{date_str}  {tipo}  {size:<10} {filename}")
+            except FileNotFoundError:
+                self.emit(f"TermIA: ls: diretório não encontrado: {target_dir}\n", 'stderr')
+            except NotADirectoryError:
+                self.emit(f"TermIA: ls: '{target_dir}' não é um diretório.\n", 'stderr')
+            except Exception as e:
+                self.emit(f"TermIA: erro no ls: {e}\n", 'stderr')
+
+    def _ls_long_lines(self, entries):
+        """Linhas do 'ls -l': data, tipo, tamanho e nome."""
+        lines = []
+        # Arquivos modificados no mesmo minuto têm a mesma data formatada:
+        # guardamos as já formatadas para não repetir o strftime.
+        dates = {}
+        for e in entries:
+            minute = int(e.stat.st_mtime // 60)
+            date_str = dates.get(minute)
+            if date_str is None:
+                # Data de modificação (convertendo timestamp para texto legível)
+                mod_time = datetime.datetime.fromtimestamp(minute * 60)
+                date_str = dates[minute] = mod_time.strftime('%Y-%m-%d %H:%M')
             
-            else:
-                # Se não for modo longo, imprime simples
-                for f in files:
-                    print(f)
-                
-        except FileNotFoundError:
-            print(f"TermIA: ls: diretório não encontrado: {target_dir}")
-        except NotADirectoryError:
-            print(f"TermIA: ls: '{target_dir}' não é um diretório.")
-        except Exception as e:
-            print(f"TermIA: erro no ls: {e}")
+            # Identifica se é pasta <DIR> ou arquivo
+            tipo = "<DIR>" if e.is_dir else "     "
             
+            # Imprime formatado (alinhado em colunas)
+            # {:<10} significa "ocupe 10 espaços alinhado à esquerda"
+            lines.append(f"{date_str}  {tipo}  {e.stat.st_size:<10} {e.name}\n")
+        return lines
+
+    def _ls_chunks(self, lines, size=LS_CHUNK_LINES):
+        """Entrega as linhas em blocos, em vez de uma escrita por arquivo."""
+        for i in range(0, len(lines), size):
+            yield "".join(lines[i:i + size])
+            
+    def exec_du(self, node, entrada=None):
+        """
+        (Embutido) Espaço em disco ocupado por pastas e subpastas:
+         -h : Tamanhos legíveis (1.5K, 3.0G); sem ela, em KB, como o du
+         -d N : Mostra só até N níveis abaixo da pasta pedida
+         --top N : Mostra só as N maiores pastas, da maior para a menor
+         --no-cache : Lê tudo de novo, sem confiar no cache de tamanhos
+        As pastas que não mudaram desde o último 'du' vêm do cache.
+        """
+        paths = list(node.get('paths') or ['.'])
+        flags = node.get('flags') or []
+        invalid = [f for f in flags if f != '--no-cache' and (f.startswith('--') or set(f[1:]) - {'h'})]
+        if invalid:
+            self.emit(f"TermIA: du: opção inválida: {invalid[0]} (use -h, -d N, --top N, --no-cache)\n", 'stderr')
+            return 2
+        human = any(not f.startswith('--') for f in flags)
+        fresh = '--no-cache' in flags
+
+        limits = {}
+        for name, flag in (('depth', '-d'), ('top', '--top')):
+            value = node.get(name)
+            if value is None:
+                continue
+            try:
+                limits[name] = int(value)
+                if limits[name] < 0:
+                    raise ValueError(value)
+            except ValueError:
+                self.emit(f"TermIA: du: valor inválido para {flag}: {value}\n", 'stderr')
+                return 2
+
+        def size_text(nbytes):
+            return human_size(nbytes) if human else str((nbytes + 1023) // 1024)
+
+        if self.du_cache is None:
+            self.du_cache = SizeCache(data_file("du_cache.pickle"))
+        status = 0
+        try:
+            for path in paths:
+                if not os.path.isdir(path) or os.path.islink(path):
+                    # Arquivo (ou link): o tamanho dele mesmo, como no du
+                    try:
+                        yield f"{size_text(disk_bytes(os.lstat(path)))}\t{path}\n"
+                    except OSError as e:
+                        self.emit(f"TermIA: du: não foi possível ler '{path}': {e.strerror}\n", 'stderr')
+                        status = 1
+                    continue
+
+                usage = DiskUsage(self.du_cache, fresh)
+                root = yield from usage.run(path)
+                for where, e in usage.errors:
+                    self.emit(f"TermIA: du: não foi possível ler '{where}': {e.strerror}\n", 'stderr')
+                    status = 1
+                if root is None:
+                    return 130 # cancelado
+
+                found = rows(root, limits.get('depth'))
+                if 'top' in limits:
+                    found = heapq.nlargest(limits['top'], found, key=lambda row: row[0])
+                yield from self._ls_chunks([f"{size_text(total)}\t{where}\n" for total, where in found])
+        finally:
+            # Também depois de um Ctrl-C: o que já foi lido vale para a próxima vez
+            self.du_cache.save()
+        # Como o du: status 1 se alguma pasta não pôde ser lida
+        return status
+
+    def exec_grep(self, node, entrada=None):
+        """
+        (Embutido) Procura linhas que casam com uma regex (sintaxe do Python).
+         -r : Procura em todas as subpastas (menos as ocultas)
+         -i : Ignora maiúsculas/minúsculas
+         -n : Mostra o número da linha
+         -m N : Para depois de N linhas encontradas (no total)
+        Os arquivos são varridos por mmap em vários processos ao mesmo tempo.
+        """
+        pattern = node.get('pattern')
+        paths = node.get('paths') or []
+        flags = "".join(node.get('flags') or [])
+
+        if pattern is None:
+            self.emit("TermIA: grep: falta o padrão. Ex: grep -r \"def main\" src\n", 'stderr')
+            return 1
+        try:
+            limit = int(node['max_count']) if node.get('max_count') is not None else None
+            compile_pattern(pattern, 'i' in flags) # Erro de sintaxe aparece aqui, uma vez só
+        except ValueError:
+            self.emit(f"TermIA: grep: valor inválido para -m: {node['max_count']}\n", 'stderr')
+            return 1
+        except re.error as e:
+            self.emit(f"TermIA: grep: padrão inválido: {e}\n", 'stderr')
+            return 1
+
+        def on_error(path, reason):
+            self.emit(f"TermIA: grep: {path}: {reason}\n", 'stderr')
+
+        grep = Grep(pattern, ignore_case='i' in flags, numbers='n' in flags,
+                    limit=limit, on_error=on_error)
+        if paths:
+            yield from grep.run(paths, recursive='r' in flags or 'R' in flags)
+        elif entrada is not None:
+            yield from grep.lines(entrada) # Ex: show app.log | grep ERROR
+        else:
+            self.emit("TermIA: grep: informe onde procurar (arquivos, ou -r e uma pasta).\n", 'stderr')
+            return 1
+        # Como o grep: status 1 quando nada foi encontrado
+        return 0 if grep.found else 1
+
+    def exec_find(self, node, entrada=None):
+        """
+        (Embutido) Lista caminhos dentro das pastas (padrão: a atual).
+         -name GLOB  : Só os nomes que casam (use aspas: -name "*.py")
+         -iname GLOB : Igual, ignorando maiúsculas/minúsculas
+         -type f|d   : Só arquivos ou só pastas
+        """
+        kind = node.get('kind')
+        if kind not in (None, 'f', 'd'):
+            self.emit(f"TermIA: find: tipo inválido: {kind} (use f ou d)\n", 'stderr')
+            return 1
+        if node.get('flags'):
+            # -name/-iname/-type já saíram como valores: o que sobra é inválido
+            self.emit(f"TermIA: find: opção desconhecida ou sem valor: {node['flags'][0]}\n", 'stderr')
+            return 1
+
+        errors = []
+
+        def on_error(path, reason):
+            errors.append(path)
+            self.emit(f"TermIA: find: {path}: {reason}\n", 'stderr')
+
+        name = node.get('iname') or node.get('name')
+        yield from find(node.get('paths') or ['.'], name=name,
+                        ignore_case=node.get('iname') is not None, kind=kind, on_error=on_error)
+        # Como o find: status 1 se algum caminho não pôde ser lido
+        return 1 if errors else 0
+
     def exec_clear(self, node):
         """(Embutido) Lança um sinal para a GUI limpar o texto."""
         # Não fazemos a limpeza aqui, apenas pedimos para a GUI fazer.
         raise ClearScreenSignal()
     
-    def exec_history(self,node):
-        
-        if not self.history:
-            print("Historico vazio")
+    def exec_history(self, node, entrada=None):
+        """
+        (Embutido) Mostra o histórico de comandos (de todas as sessões).
+        Com um padrão, só os comandos que o contêm: 'history git'.
+        """
+        pattern = node.get('pattern')
+        entries = self.history.find(pattern) if pattern else self.history.numbered()
+
+        if not entries:
+            yield "Historico vazio\n" if not pattern else f"Nenhum comando com '{pattern}' no historico\n"
             return
 
-        print("=== Histórico de Comandos ===")
+        yield "=== Histórico de Comandos ===\n"
         
-        for i,cmd in enumerate(self.history):
-            print(cmd)
+        lines = [f"{seq + 1:>6}  {cmd}\n" for seq, cmd in entries]
+        yield from self._ls_chunks(lines)
+
     # ----------------------------------------------
-    # MODO INTERATIVO DE IA (SUB-SHELL)
+    # MEDIÇÃO (time, stats)
     # ----------------------------------------------
-    def chamar_api_ia(self, prompt):
+    def exec_time(self, node):
         """
-        Integração com IA via API REST (Google Gemini).
-        Envia o texto do usuário para a nuvem e recebe a resposta gerada.
+        (Embutido) 'time <comando>': roda o comando e mostra quanto ele levou.
+        Com --profile, roda também o cProfile e grava o perfil em
+        ~/.termia/profiles (o perfil cobre o trabalho do próprio TermIA;
+        os programas externos aparecem só no tempo total).
         """
-        
-        # Recupera a chave de API das variáveis de ambiente (.env).
-        # Isso é crucial para segurança, evitando deixar senhas no código (Hardcoding).
-        api_key = os.getenv("GEMINI_API_KEY")
-
-        # ⚠️ ALERTA: A versão '2.5' ainda não existe publicamente.
-        # Isso vai gerar um Erro 404. O correto atualmente é "gemini-1.5-flash".
-        modelo = "gemini-2.5-flash" 
-
-        # Monta a URL do endpoint da API do Google.
-        # Usa f-string para inserir o modelo e a chave na URL.
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{modelo}:generateContent?key={api_key}"
-
-        # Cabeçalho padrão para informar que estamos enviando dados em JSON.
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        
-        # Estrutura do corpo da requisição (Payload) exigida pela documentação do Google.
-        # A estrutura é aninhada: contents -> lista -> parts -> lista -> text
-        payload = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
+        flag = node.get('flag')
+        if flag not in (None, '--profile'):
+            self.print(f"TermIA: time: opção inválida: {flag} (use --profile)", tag='stderr')
+            return 2
+        if flag is None:
+            return self.execute(node['command'], report=self._print_timing)
 
+        import cProfile # Só carregado quando alguém pede um perfil
+        profiler = cProfile.Profile()
+        profiler.enable()
         try:
-            print(f"☁️  Conectando ao Gemini ({modelo})...")
-            
-            # Realiza a chamada HTTP POST real.
-            # O Python "congela" aqui esperando a resposta da internet.
-            response = requests.post(url, headers=headers, json=payload)
+            status = self.execute(node['command'], report=self._print_timing)
+        finally:
+            profiler.disable()
 
-            # Código 200 significa "OK" / Sucesso.
-            if response.status_code == 200:
-                
-                # Converte a resposta bruta (bytes) para um dicionário Python.
-                data = response.json()
-                
-                try:
-                    # Navega pelo JSON de resposta para extrair apenas o texto da IA.
-                    # Exemplo: {'candidates': [{'content': {'parts': [{'text': 'Olá!'}]}}]}
-                    texto_resposta = data['candidates'][0]['content']['parts'][0]['text']
-                    
-                    return texto_resposta
-                
-                except (KeyError, IndexError):
-                    # Proteção caso o Google mude o formato da resposta ou retorne vazio.
-                    return "Erro: A API retornou uma resposta vazia."
+        folder = data_file("profiles")
+        os.makedirs(folder, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(folder, f"{node['command']['type']}-{stamp}.prof")
+        profiler.dump_stats(path)
+        self.print(f"Perfil gravado em {path}")
+        self.print(f"  (para ver: python -m pstats {path})")
+        return status
 
-            else:
-                # Tratamento de erros HTTP (400, 401, 403, 404, 500).
-                
-                # Tratamento específico para Erro 404 (Not Found), comum se o nome do modelo estiver errado.
-                if response.status_code == 404:
-                    return "Erro 404: Modelo não encontrado."
-                
-                return f"Erro na API ({response.status_code}): {response.text}"
+    def _print_timing(self, measurement):
+        """Relatório do 'time' (pode vir da thread do processo, na GUI)."""
+        # Como no bash, fora da saída do comando (no terminal, vai para o stderr)
+        self.emit(measurement.describe(), 'report')
 
-        except requests.exceptions.ConnectionError:
-            # Captura falhas de rede (sem internet, DNS falhou, etc).
-            return "Erro: Falha na conexão. Verifique sua internet."
+    def exec_stats(self, node, entrada=None):
+        """
+        (Embutido) Tempo e recursos dos comandos desta sessão.
+        'stats' mostra a tabela, 'stats <comando>' o histograma de latência
+        dele e 'stats reset' zera tudo.
+        """
+        target = node.get('command')
+        if target == 'reset':
+            self.metrics.reset()
+            yield "Estatísticas zeradas.\n"
+            return
 
+        if target is not None:
+            stats = self.metrics.get(target)
+            if stats is None:
+                self.emit(f"TermIA: stats: nenhuma execução de '{target}'\n", 'stderr')
+                return
+            yield (f"{target}: {stats.count} execuções, {stats.failures} com falha, "
+                   f"total {format_seconds(stats.wall)}\n")
+            yield (f"  p50 {format_seconds(stats.percentile(0.5))}   "
+                   f"p95 {format_seconds(stats.percentile(0.95))}   "
+                   f"p99 {format_seconds(stats.percentile(0.99))}   "
+                   f"máx {format_seconds(stats.wall_max)}\n")
+            yield from stats.histogram.bars()
+            return
+
+        commands = self.metrics.all()
+        if not commands:
+            yield "Nenhum comando medido ainda.\n"
+            return
+        yield (f"{'comando':<14}{'n':>6}{'falhas':>7}{'total':>10}{'média':>10}{'p50':>10}"
+               f"{'p95':>10}{'máx':>10}{'cpu':>10}{'cpu filhos':>11}{'mem máx':>10}\n")
+        for s in commands:
+            memory = f"{s.maxrss_kb / 1024:.1f}MB" if s.maxrss_kb else "-"
+            child = format_seconds(s.child_cpu) if s.child_cpu else "-"
+            yield (f"{s.name[:13]:<14}{s.count:>6}{s.failures:>7}{format_seconds(s.wall):>10}"
+                   f"{format_seconds(s.wall / s.count):>10}"
+                   f"{format_seconds(s.percentile(0.5)):>10}"
+                   f"{format_seconds(s.percentile(0.95)):>10}"
+                   f"{format_seconds(s.wall_max):>10}{format_seconds(s.cpu):>10}"
+                   f"{child:>11}{memory:>10}\n")
+
+    # ----------------------------------------------
+    # REPETIÇÃO (watch)
+    # ----------------------------------------------
+    def exec_watch(self, node):
+        """
+        (Embutido) 'watch [-n segundos] <comando>': roda o comando de novo
+        e de novo até o Ctrl-C. Na GUI a saída fica sempre no mesmo lugar
+        da tela; com pastas no comando, roda também a cada mudança (inotify).
+        """
+        interval = DEFAULT_INTERVAL
+        flag = node.get('flag')
+        if flag is not None:
+            if flag != '-n':
+                self.print(f"TermIA: watch: opção inválida: {flag} (use -n segundos)", tag='stderr')
+                return 2
+            try:
+                interval = max(MIN_INTERVAL, float(node['interval']))
+            except ValueError:
+                self.print(f"TermIA: watch: intervalo inválido: {node['interval']}", tag='stderr')
+                return 2
+
+        if self.output.asynchronous:
+            # A GUI redesenha a região do watch só nas linhas que mudaram
+            def on_frame(lines):
+                self.emit(lines, 'watch')
+        else:
+            # No terminal não dá para voltar e reescrever: o quadro é
+            # impresso de novo só quando a saída muda
+            last = None
+
+            def on_frame(lines):
+                nonlocal last
+                if lines[1:] != last:
+                    last = lines[1:]
+                    self.emit("\n".join(lines) + "\n\n")
+
+        task = Watch(self, node['command'], node.get('text'), interval, on_frame)
+        return self.run_foreground(task)
+
+    # ----------------------------------------------
+    # MODO INTERATIVO DE IA (SUB-SHELL)
+    # ----------------------------------------------
+    def _cliente_ia(self):
+        """
+        Cria o cliente do Gemini só no primeiro uso e o reaproveita depois,
+        mantendo a conexão HTTP aberta entre uma pergunta e outra.
+        """
+        if self.ia_client is None:
+            # Import tardio: o 'requests' sozinho custa ~100 ms na inicialização
+            # e só é necessário para quem entra no ia_mode.
+            from ia_client import GeminiClient
+            self.ia_client = GeminiClient()
+        return self.ia_client
+
+    def _cache_ia(self):
+        """Abre o cache de respostas (memória + SQLite) no primeiro uso."""
+        if self.ia_cache is None:
+            from ia_cache import IACache
+            self.ia_cache = IACache()
+        return self.ia_cache
+
+    def _conversa_ia(self):
+        if self.ia_conversa is None:
+            from conversation import Conversation
+            self.ia_conversa = Conversation()
+        return self.ia_conversa
+
+    def _limite_ia(self):
+        if self.ia_limite is None:
+            from ia_queue import DEFAULT_BURST, DEFAULT_RATE, TokenBucket, env_number
+            self.ia_limite = TokenBucket(env_number("TERMIA_IA_RATE", DEFAULT_RATE),
+                                         env_number("TERMIA_IA_BURST", DEFAULT_BURST, int))
+        return self.ia_limite
+
+    def stream_ia(self, prompt, contexto=None, cancel=None, on_retry=None):
+        """
+        Integração com IA via API REST (Google Gemini), em modo streaming.
+        Gerador que devolve os pedaços da resposta conforme chegam da nuvem.
+        Lança IAError se algo der errado.
+
+        'contexto' (conversation.Context) leva junto o trecho da conversa
+        escolhido para esta pergunta; sem ele, a pergunta vai sozinha.
+
+        Cada pedido respeita o limite de taxa, e falhas passageiras (429,
+        503, rede) são repetidas com espera (ver ia_queue.with_retry);
+        'cancel' interrompe a espera e on_retry avisa cada nova tentativa.
+
+        Antes da rede, consulta o cache: uma pergunta já respondida volta
+        inteira, de uma vez, sem gastar latência nem cota. O contexto faz
+        parte da chave, então a mesma pergunta em outra conversa não acerta.
+        """
+        client = self._cliente_ia()
+        cache = self._cache_ia()
+        context = contexto.key() if contexto is not None else ""
+
+        cached = cache.get(client.model, prompt, context)
+        if cached is not None:
+            yield cached
+            return
+
+        partes = []
+        history, system = (contexto.contents, contexto.system) if contexto is not None else ((), None)
+        from ia_queue import with_retry
+
+        chamada = lambda: client.stream(prompt, history, system)
+        for chunk in with_retry(chamada, self._limite_ia(), cancel, on_retry=on_retry):
+            partes.append(chunk)
+            yield chunk
+
+        # Só chega aqui se a resposta veio completa (sem erro nem Ctrl-C).
+        cache.put(client.model, prompt, "".join(partes), context)
+
+    def chamar_api_ia(self, prompt):
+        """
+        Versão bloqueante: envia o texto do usuário e devolve a resposta
+        inteira (ou a mensagem de erro) como uma string.
+        """
+        from ia_client import IAError
+
+        try:
+            return "".join(self.stream_ia(prompt))
+        except IAError as e:
+            return str(e)
         except Exception as e:
             # Captura qualquer outro erro não previsto.
             return f"Erro inesperado: {e}"
-    
-    def exec_generic(self, node):
+
+    def exec_ia_cache(self, node):
         """
-        O 'Goleiro' (Fallback) do Executor.
-        Tenta executar qualquer comando que NÃO seja built-in (não tem um método exec_ próprio).
-        Ex: git, python, gcc, node, etc.
+        Comando Built-in: IA_CACHE
+        ia_cache stats -> mostra acertos, taxa de acerto e bytes economizados
+        ia_cache clear -> apaga o cache em memória e em disco
         """
+        action = node.get('action') or 'stats'
+        cache = self._cache_ia()
 
-        command_name = node['type'] # O nome do comando (ex: 'git')
-        
-        # 1. Montagem da lista de argumentos para o subprocess.
-        # O subprocess exige o formato lista: ['comando', '-flag', 'argumento']
-        cmd_list = [command_name] 
+        if action == 'clear':
+            cache.clear()
+            self.print("Cache da IA apagado.")
+        elif action == 'stats':
+            entradas, tamanho = cache.disk.usage()
+            self.print("=== Cache da IA ===")
+            self.print(f"  acertos (memória): {cache.memory_hits}")
+            self.print(f"  acertos (disco):   {cache.disk_hits}")
+            self.print(f"  faltas:            {cache.misses}")
+            self.print(f"  taxa de acerto:    {cache.hit_rate():.1%}")
+            self.print(f"  bytes economizados: {cache.bytes_saved}")
+            self.print(f"  em disco:          {entradas} respostas, {tamanho} bytes")
+        else:
+            self.print(f"TermIA: ia_cache: ação desconhecida: {action} (use stats ou clear)", tag='stderr')
+            return 1
+        return 0
+
+    def perguntar_ia(self, prompt):
+        """
+        Envia uma pergunta do ia_mode e mostra a resposta token a token.
+        Com GUI, a leitura do stream acontece em uma thread e os pedaços vão
+        para a fila com a tag 'ia'; sem GUI, são escritos direto no terminal.
+
+        A pergunta leva junto parte da conversa (dentro do orçamento de
+        tokens) e, se a resposta chegar inteira, a troca entra na memória.
+        """
+        from ia_client import StreamingAnswer
+
+        conversa = self._conversa_ia()
+        contexto = conversa.pack(prompt)
+        cancel = threading.Event()
+
+        def nova_tentativa(erro, tentativa, espera):
+            self.emit(f"\n[IA] {_motivo_ia(erro)}: tentativa {tentativa + 1} em {espera:.1f} s...\n", 'job')
+
+        def chunks():
+            partes = []
+            stream = self.stream_ia(prompt, contexto, cancel, nova_tentativa)
+            try:
+                for chunk in stream:
+                    partes.append(chunk)
+                    yield chunk
+            finally:
+                stream.close()
+            # Não chega aqui se houve erro ou Ctrl-C: a troca fica de fora.
+            # (Roda na thread do StreamingAnswer, ao mesmo tempo que os
+            # /comandos da GUI: a Conversation tem lock próprio.)
+            if partes and not cancel.is_set():
+                conversa.add(prompt, "".join(partes))
+
+        self.run_foreground(StreamingAnswer(chunks(), on_output=self.emit, cancel=cancel))
+
+    def enfileirar_ia(self, prompt):
+        """
+        'pergunta &' no ia_mode: a pergunta entra na fila e o prompt volta na
+        hora. Várias podem estar em andamento; cada resposta aparece inteira,
+        marcada com o número da pergunta, assim que fica pronta.
+        """
+        if not prompt:
+            self.print("TermIA: escreva a pergunta antes do '&'.", tag='stderr')
+            return None
+        if self.ia_fila is None:
+            from ia_queue import IAScheduler
+            self.ia_fila = IAScheduler(self._buscar_na_fila, self._resposta_da_fila)
+
+        contexto = self._conversa_ia().pack(prompt)
+        request = self.ia_fila.submit(prompt, contexto)
+        na_frente = self.ia_fila.pending() - 1
+        extra = f" ({na_frente} antes dela)" if na_frente else ""
+        self.print(f"[#{request.id}] na fila{extra}. /queue mostra o andamento, /cancel {request.id} cancela.")
+        return request
+
+    def _buscar_na_fila(self, request):
+        """Gerador da resposta de uma pergunta da fila (roda numa thread do pool)."""
+        def nova_tentativa(erro, tentativa, espera):
+            request.state = 'repetindo'
+            request.attempts = tentativa
+            self.emit(f"[#{request.id}] {_motivo_ia(erro)}: tentativa {tentativa + 1} em {espera:.1f} s\n", 'job')
+
+        def enviando():
+            request.state = 'enviando'
+            yield from self.stream_ia(request.prompt, request.context, request.cancel, nova_tentativa)
+
+        return enviando()
+
+    def _resposta_da_fila(self, request, texto, erro):
+        """Entrega a resposta de uma pergunta da fila (thread do pool)."""
+        titulo = request.prompt if len(request.prompt) <= 60 else request.prompt[:57] + "..."
+        if erro is not None:
+            self.emit(f"[#{request.id}] {titulo}\n{erro}\n", 'stderr')
+        elif texto is None:
+            self.emit(f"[#{request.id}] cancelada.\n", 'job')
+        else:
+            self._conversa_ia().add(request.prompt, texto)
+            self.emit(f"\n🤖 [#{request.id}] {titulo}\n{texto.rstrip()}\n", 'ia')
+
+    def comando_ia(self, texto):
+        """
+        Comandos do ia_mode (linhas que começam com '/'):
+          /reset          -> esquece a conversa
+          /save <nome>    -> grava a conversa em ~/.termia/ia_sessoes/<nome>.json
+          /load <nome>    -> continua uma conversa gravada
+          /sessions       -> lista as conversas gravadas
+          /context        -> tamanho da memória e do último pedido
+          /queue          -> perguntas da fila ('pergunta &') ainda sem resposta
+          /cancel <n>     -> cancela a pergunta #n da fila
+        """
+        from conversation import list_sessions
+
+        partes = texto.split()
+        comando, nome = partes[0].lower(), (partes[1] if len(partes) > 1 else None)
+        conversa = self._conversa_ia()
+
+        if comando == '/reset':
+            conversa.reset()
+            self.print("Conversa apagada: a próxima pergunta começa do zero.")
+        elif comando in ('/save', '/load'):
+            if nome is None:
+                self.print(f"TermIA: {comando}: falta o nome da sessão. Ex: {comando} projeto", tag='stderr')
+                return
+            try:
+                if comando == '/save':
+                    conversa.save(nome)
+                    self.print(f"Sessão '{nome}' salva ({len(conversa.exchanges)} trocas).")
+                else:
+                    conversa.load(nome)
+                    self.print(f"Sessão '{nome}' carregada ({len(conversa.exchanges)} trocas"
+                               f"{', com resumo' if conversa.summary else ''}).")
+            except FileNotFoundError:
+                self.print(f"TermIA: {comando}: sessão não encontrada: {nome} (veja /sessions)", tag='stderr')
+            except (OSError, ValueError, KeyError) as e:
+                self.print(f"TermIA: {comando}: {e}", tag='stderr')
+        elif comando == '/sessions':
+            sessoes = list_sessions()
+            if not sessoes:
+                self.print("Nenhuma sessão salva.")
+            for nome, tamanho, mtime in sessoes:
+                data = datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
+                self.print(f"  {data}  {human_size(tamanho):>8}  {nome}")
+        elif comando == '/context':
+            self.print("=== Conversa ===")
+            self.print(f"  trocas na memória: {len(conversa.exchanges)} (~{conversa.memory_tokens()} tokens)")
+            self.print(f"  trocas no resumo:  {len(conversa.summary)}"
+                       f"{f' (+{conversa.dropped} omitidas)' if conversa.dropped else ''}")
+            self.print(f"  último pedido:     ~{conversa.last_tokens} de {conversa.budget} tokens")
+        elif comando == '/queue':
+            ativas = self.ia_fila.active() if self.ia_fila is not None else []
+            if not ativas:
+                self.print("Nenhuma pergunta na fila.")
+            agora = time.monotonic()
+            for request in ativas:
+                tentativas = f", {request.attempts} repetições" if request.attempts else ""
+                self.print(f"  [#{request.id}] {request.state:<10} {agora - request.created:5.1f} s{tentativas}  {request.prompt}")
+        elif comando == '/cancel':
+            try:
+                numero = int((nome or '').lstrip('#'))
+            except ValueError:
+                self.print("TermIA: /cancel: informe o número da pergunta. Ex: /cancel 2", tag='stderr')
+                return
+            if self.ia_fila is None or not self.ia_fila.cancel(numero):
+                self.print(f"TermIA: /cancel: não há pergunta #{numero} na fila.", tag='stderr')
+        else:
+            self.print(f"TermIA: comando desconhecido: {comando} (use /reset, /save, /load, /sessions, /context, /queue ou /cancel)", tag='stderr')
+
+    def exec_pipeline(self, node):
+        """
+        Pipeline (a | b) e/ou redirecionamentos (<, >, >>).
+        Os estágios rodam ao mesmo tempo, ligados por pipes (ver pipeline.py).
+        """
+        try:
+            return self.run_foreground(Pipeline(self, node['stages']))
+        except FileNotFoundError as e:
+            self.print(f"TermIA: arquivo não encontrado: {e.filename}", tag='stderr')
+        except PermissionError as e:
+            self.print(f"TermIA: permissão negada: {e.filename}", tag='stderr')
+        except IsADirectoryError as e:
+            self.print(f"TermIA: é um diretório: {e.filename}", tag='stderr')
+        return 1
+
+    # ----------------------------------------------
+    # JOBS EM SEGUNDO PLANO (cmd &)
+    # ----------------------------------------------
+    def exec_background(self, node):
+        """
+        'comando &': inicia o comando e devolve o prompt na hora.
+        A saída fica guardada no buffer do job até alguém pedir 'fg'.
+        """
+        command = node['command']
+        job = self.jobs.new(node.get('text') or command['type'])
+
+        if command['type'] == 'pipeline':
+            task = Pipeline(self, command['stages'], on_output=job.write)
+        elif self.builtin_handler(command) is None:
+            task = ExternalProcess(self.argv(command), on_output=job.write)
+        else:
+            # Builtin sozinho (ex: "ls -R / &"): um pipeline de um estágio
+            stage = {'type': 'stage', 'command': command, 'redirs': ()}
+            task = Pipeline(self, [stage], on_output=job.write)
+
+        # O job entra no 'stats' com a duração inteira, não só a do '&'
+        measurement = self.metrics.start(command['type'])
+        measurement.track(task)
+
+        def finished(code):
+            measurement.stop(code)
+            job.finished(code)
+
+        job.task = task
+        task.on_exit = finished
+        job.on_finish(self._job_finished)
+        try:
+            task.start()
+        except FileNotFoundError as e:
+            self.jobs.remove(job)
+            self.print(f"TermIA: comando não encontrado: {e.filename or command['type']}", tag='stderr')
+            return
+        except PermissionError as e:
+            self.jobs.remove(job)
+            self.print(f"TermIA: permissão negada: {e.filename}", tag='stderr')
+            return
+
+        # Como no bash: número do job e PID do (último) processo
+        pids = task.pids()
+        self.print(f"[{job.id}] {pids[-1]}" if pids else f"[{job.id}]")
+
+    def _job_finished(self, job):
+        """Avisa na tela quando um job em segundo plano termina (thread do job)."""
+        if job.sink is not None:
+            return # Estava em primeiro plano ('fg'): a saída já apareceu
+        hint = f"  ('fg %{job.id}' mostra a saída)" if job.has_output() else ""
+        self.emit(f"[{job.id}]  {job.status():<12} {job.command}{hint}\n", 'job')
+
+    def exec_jobs(self, node, entrada=None):
+        """(Embutido) Lista os jobs da sessão."""
+        jobs = self.jobs.all()
+        if not jobs:
+            yield "Nenhum job.\n"
+            return
+        current = self.jobs.current_id()
+        for job in jobs:
+            mark = "+" if job.id == current else " "
+            yield f"[{job.id}]{mark} {job.status():<12} {job.command}\n"
+
+    def exec_fg(self, node):
+        """(Embutido) Traz um job para o primeiro plano: mostra a saída guardada e o resto ao vivo."""
+        try:
+            job = self.jobs.get(node.get('job'))
+        except (KeyError, ValueError) as e:
+            self.print(f"TermIA: fg: {e.args[0]}", tag='stderr')
+            return 1
+
+        self.print(job.command)
+        self.jobs.remove(job)
+        job.attach(self.emit)
+        if job.running():
+            # Ctrl-C agora interrompe o job, como um comando comum
+            return self.run_foreground(JobWaiter([job], interrupt=True))
+        return job.returncode
+
+    def exec_kill(self, node):
+        """
+        (Embutido) Envia um sinal a jobs (%n) ou processos (PID).
+        Padrão: SIGTERM. Ex: kill %1, kill -9 %2, kill -INT 4312
+        """
+        sig = signal.SIGTERM
+        for flag in node.get('flags') or ():
+            name = flag[1:].upper()
+            try:
+                sig = int(name) if name.isdigit() else getattr(signal, name if name.startswith('SIG') else 'SIG' + name)
+            except AttributeError:
+                self.print(f"TermIA: kill: sinal inválido: {flag}", tag='stderr')
+                return 1
+
+        if not node.get('targets'):
+            self.print("TermIA: kill: informe um job (%n) ou PID.", tag='stderr')
+            return 1
+
+        status = 0
+        for target in node['targets']:
+            try:
+                if target.startswith('%'):
+                    job = self.jobs.get(target)
+                    if job.running():
+                        job.task.kill(sig)
+                elif target.isdigit():
+                    os.kill(int(target), sig)
+                else:
+                    self.print(f"TermIA: kill: alvo inválido: {target}", tag='stderr')
+                    status = 1
+            except (KeyError, ValueError) as e:
+                self.print(f"TermIA: kill: {e.args[0]}", tag='stderr')
+                status = 1
+            except ProcessLookupError:
+                self.print(f"TermIA: kill: ({target}) processo não existe", tag='stderr')
+                status = 1
+            except PermissionError:
+                self.print(f"TermIA: kill: ({target}) permissão negada", tag='stderr')
+                status = 1
+        return status
+
+    def exec_wait(self, node):
+        """(Embutido) Espera os jobs (todos, ou os indicados) terminarem. Ctrl-C para de esperar."""
+        try:
+            jobs = [self.jobs.get(spec) for spec in node.get('jobs') or ()] or self.jobs.all()
+        except (KeyError, ValueError) as e:
+            self.print(f"TermIA: wait: {e.args[0]}", tag='stderr')
+            return 1
+        jobs = [job for job in jobs if job.running()]
+        if jobs:
+            return self.run_foreground(JobWaiter(jobs))
+        return 0
+
+    def argv(self, node):
+        """
+        Montagem da lista de argumentos para o subprocess.
+        O subprocess exige o formato lista: ['comando', '-flag', 'argumento']
+        """
+        # Comandos genéricos trazem as palavras na ordem em que foram digitadas
+        # (ex: git commit -m "msg"), que é a ordem que o programa espera.
+        if node.get('argv') is not None:
+            return [node['type']] + list(node['argv'])
+
+        cmd_list = [node['type']]
         
         # Adiciona flags se existirem na AST (ex: -v, --version)
         if node.get('flags'):
@@ -452,24 +1572,33 @@ class Executor:
         # Adiciona caminho se existir (legado de algumas regras do parser)
         if node.get('path'):
             cmd_list.append(node.get('path'))
+        return cmd_list
+
+    def exec_generic(self, node):
+        """
+        O 'Goleiro' (Fallback) do Executor.
+        Tenta executar qualquer comando que NÃO seja built-in (não tem um método exec_ próprio).
+        Ex: git, python, gcc, node, etc.
+        """
+
+        command_name = node['type'] # O nome do comando (ex: 'git')
+        
+        # 1. Montagem da lista de argumentos para o subprocess.
+        cmd_list = self.argv(node)
 
         try:
             # 2. Execução no Sistema Operacional.
             # shell=False (padrão implícito) é usado por segurança contra Shell Injection.
-            # check=True faz o Python lançar um erro se o programa retornar falha (código != 0).
-            subprocess.run(cmd_list, check=True)
+            # stdout/stderr são lidos em blocos por threads próprias (process_runner).
+            return self.run_foreground(ExternalProcess(cmd_list, on_output=self.emit))
             
         except FileNotFoundError:
             # ERRO SEMÂNTICO CRÍTICO: O usuário digitou um comando que não existe no PC.
             # Ex: 'batata', 'lss'.
-            print(f"TermIA: comando não encontrado: {command_name}")
-            
-        except subprocess.CalledProcessError as e:
-            # O comando existe, rodou, mas falhou (ex: 'git status' fora de um repo).
-            # O 'pass' significa que não imprimimos nada extra, pois o próprio comando
-            # já deve ter impresso o erro no stderr.
-            pass
+            self.print(f"TermIA: comando não encontrado: {command_name}", tag='stderr')
+            return 127 # Mesmo código do bash
             
         except PermissionError:
             # O arquivo existe, mas não é executável ou o usuário não tem permissão.
-            print(f"TermIA: permissão negada para executar: {command_name}")
+            self.print(f"TermIA: permissão negada para executar: {command_name}", tag='stderr')
+            return 126
@@ -0,0 +1,375 @@
+"""
+Operações de arquivos em massa para os builtins 'rm -r', 'cp [-r]' e 'mv'.
+
+A árvore é percorrida com os.scandir (listing.walk_parallel: as próximas
+pastas já vão sendo lidas por threads) e o trabalho de cada arquivo (apagar,
+copiar) vai para um pool de threads enquanto o percurso continua. São
+operações presas em E/S, então várias threads ao mesmo tempo mantêm o disco
+ocupado mesmo com o GIL.
+
+O conteúdo dos arquivos é copiado dentro do kernel, sem passar por buffers
+do Python: os.copy_file_range (que em btrfs/XFS pode até só compartilhar os
+blocos) e, se o sistema não tiver, os.sendfile. Só em último caso a cópia
+é feita com read/write.
+
+As funções de percurso são geradores que, de tempos em tempos, produzem uma
+linha de progresso (e '' nos intervalos, para quem está consumindo poder
+cancelar a operação sem esperar o fim).
+"""
+import errno
+import os
+import shutil
+import stat
+import threading
+import time
+from concurrent import futures
+
+from listing import walk_parallel
+
+# Threads do pool: o trabalho é de E/S, então mais threads que núcleos
+WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Arquivos apagados por tarefa do pool (uma tarefa por arquivo custaria
+# mais em agendamento do que o próprio unlink)
+UNLINK_BATCH = 256
+
+# Bytes por chamada de copy_file_range/sendfile. Entre uma chamada e outra
+# o progresso é contado e o cancelamento é verificado.
+COPY_CHUNK = 16 * 1024 * 1024
+
+# Tamanho do buffer da cópia comum (quando não dá para copiar no kernel)
+BUFFER_SIZE = 1024 * 1024
+
+# Intervalo entre as linhas de progresso e entre as checagens de cancelamento
+PROGRESS_INTERVAL = 1.0
+TICK = 0.1
+
+# Erros de copy_file_range/sendfile que só querem dizer "aqui não dá":
+# outro sistema de arquivos, kernel antigo, tipo de arquivo não suportado.
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP), errno.EBADF}
+
+
+class Cancelled(Exception):
+    """A operação foi interrompida (Ctrl-C)."""
+
+
+def human_size(size):
+    """Tamanho legível: 1536 -> '1.5K', 3221225472 -> '3.0G'."""
+    for unit in ('B', 'K', 'M', 'G', 'T'):
+        if size < 1024 or unit == 'T':
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+# ----------------------------------------------------------------------
+# Cópia de um arquivo
+# ----------------------------------------------------------------------
+def _copy_loop(step, on_bytes):
+    """Chama step() até ele devolver 0 (fim do arquivo)."""
+    copied = 0
+    while True:
+        n = step(copied)
+        if n == 0:
+            return copied
+        copied += n
+        on_bytes(n)
+
+
+def copy_data(infd, outfd, on_bytes):
+    """
+    Copia o conteúdo de infd (do começo) para outfd, de preferência sem
+    sair do kernel. on_bytes(n) é chamado a cada bloco copiado.
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            return _copy_loop(lambda done: os.copy_file_range(infd, outfd, COPY_CHUNK), on_bytes)
+        except OSError as e:
+            # Só dá para trocar de método se nada foi escrito ainda
+            if e.errno not in _UNSUPPORTED or os.lseek(outfd, 0, os.SEEK_CUR):
+                raise
+
+    if hasattr(os, 'sendfile'):
+        try:
+            return _copy_loop(lambda done: os.sendfile(outfd, infd, done, COPY_CHUNK), on_bytes)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED or os.lseek(outfd, 0, os.SEEK_CUR):
+                raise
+
+    def read_write(done):
+        data = os.read(infd, BUFFER_SIZE)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(outfd, view):]
+        return len(data)
+    return _copy_loop(read_write, on_bytes)
+
+
+def copy_file(src, dst, on_bytes=lambda n: None, preserve=False):
+    """
+    Copia um arquivo comum. Como o cp, copia as permissões; com preserve
+    (usado pelo mv entre discos), copia também as datas.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        copied = copy_data(fsrc.fileno(), fdst.fileno(), on_bytes)
+    if preserve:
+        shutil.copystat(src, dst)
+    else:
+        shutil.copymode(src, dst)
+    return copied
+
+
+# ----------------------------------------------------------------------
+# Operação em massa: pool, contadores, progresso e cancelamento
+# ----------------------------------------------------------------------
+class BulkOperation:
+    """
+    Estado compartilhado de um 'rm -r', 'cp -r' ou 'mv': o pool de threads,
+    o que já foi feito e o que está planejado (para o progresso), os erros
+    e o pedido de cancelamento.
+    """
+
+    def __init__(self, verb):
+        self.verb = verb
+        self.cancelled = threading.Event()
+        self.files = self.bytes = self.dirs = 0
+        self.planned_files = self.planned_bytes = 0
+        self.errors = []  # (caminho, exceção)
+        self.started = time.perf_counter()
+        self._pool = futures.ThreadPoolExecutor(max_workers=WORKERS)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._last_report = self._last_tick = self.started
+
+    # --- Chamados pelos workers -------------------------------------------
+    def add(self, files=0, nbytes=0):
+        """Contabiliza trabalho feito. Levanta Cancelled se pediram para parar."""
+        if self.cancelled.is_set():
+            raise Cancelled()
+        with self._lock:
+            self.files += files
+            self.bytes += nbytes
+
+    def error(self, path, exc):
+        with self._lock:
+            self.errors.append((path, exc))
+
+    # --- Chamados pelo gerador do builtin ---------------------------------
+    def submit(self, func, *args):
+        self._pending.add(self._pool.submit(self._guard, func, *args))
+
+    def _guard(self, func, *args):
+        try:
+            func(self, *args)
+        except Cancelled:
+            pass
+        except OSError as e:
+            self.error(e.filename, e)
+
+    def tick(self):
+        """
+        Gerador: uma linha de progresso a cada PROGRESS_INTERVAL e, nos
+        intervalos, um '' a cada TICK (a chance de quem consome cancelar).
+        """
+        now = time.perf_counter()
+        if now - self._last_report >= PROGRESS_INTERVAL:
+            self._last_report = self._last_tick = now
+            yield self.progress_line()
+        elif now - self._last_tick >= TICK:
+            self._last_tick = now
+            yield ''
+
+    def wait(self):
+        """Gerador: espera o que foi enviado ao pool, mostrando o progresso."""
+        while self._pending:
+            _, self._pending = futures.wait(self._pending, timeout=TICK,
+                                            return_when=futures.FIRST_COMPLETED)
+            yield from self.tick()
+
+    def close(self):
+        """Encerra o pool. Se ainda havia trabalho (cancelamento), ele é abandonado."""
+        if self._pending:
+            self.cancelled.set()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def progress_line(self):
+        with self._lock:
+            files, nbytes = self.files, self.bytes
+        text = f"{self.verb}: {files}"
+        if self.planned_files:
+            text += f"/{self.planned_files}"
+        text += " arquivos"
+        if self.planned_bytes:
+            rate = nbytes / max(self.elapsed(), 1e-9)
+            text += (f", {human_size(nbytes)}/{human_size(self.planned_bytes)}"
+                     f" ({human_size(rate)}/s)")
+        return text + "\n"
+
+
+# ----------------------------------------------------------------------
+# Trabalho dos workers
+# ----------------------------------------------------------------------
+def _unlink_batch(op, paths):
+    removed = 0
+    for path in paths:
+        if op.cancelled.is_set():
+            break
+        try:
+            os.unlink(path)
+            removed += 1
+        except FileNotFoundError:
+            removed += 1  # Alguém já apagou: o objetivo foi atingido
+        except OSError as e:
+            op.error(path, e)
+    op.add(files=removed)
+
+
+def _copy_one(op, src, dst, preserve):
+    copy_file(src, dst, lambda n: op.add(nbytes=n), preserve)
+    op.add(files=1)
+
+
+# ----------------------------------------------------------------------
+# Percursos (geradores: produzem o progresso e devolvem o resultado)
+# ----------------------------------------------------------------------
+def plan_remove(op, top):
+    """
+    Percorre 'top' mandando apagar os arquivos de cada pasta assim que ela
+    é lida. Devolve as pastas, na ordem do percurso, para o remove_dirs.
+    """
+    dirs = []
+    for path, entries in walk_parallel(top, show_all=True, on_error=op.error):
+        if op.cancelled.is_set():
+            break
+        dirs.append(path)
+        # Links para pastas são apagados como arquivos (não são seguidos)
+        files = [e.path for e in entries if e.is_link or not e.is_dir]
+        op.planned_files += len(files)
+        for i in range(0, len(files), UNLINK_BATCH):
+            op.submit(_unlink_batch, files[i:i + UNLINK_BATCH])
+        yield from op.tick()
+    return dirs
+
+
+def remove_dirs(op, dirs):
+    """Apaga as pastas já vazias, das mais fundas para as de cima."""
+    for path in reversed(dirs):
+        try:
+            os.rmdir(path)
+            op.dirs += 1
+        except OSError as e:
+            # A pasta de cima de um erro não fica vazia: só o primeiro importa
+            if e.errno not in (errno.ENOTEMPTY, errno.EEXIST) or not op.errors:
+                op.error(path, e)
+
+
+def plan_copy(op, src, dst, preserve=False):
+    """
+    Percorre 'src' criando as pastas em 'dst' e mandando copiar os arquivos.
+    Devolve os pares (pasta de origem, pasta criada) para o finish_dirs.
+    """
+    dirs = []
+    for path, entries in walk_parallel(src, show_all=True, need_stat=True, on_error=op.error):
+        if op.cancelled.is_set():
+            break
+        rel = os.path.relpath(path, src)
+        target = dst if rel == os.curdir else os.path.join(dst, rel)
+        try:
+            os.mkdir(target)
+        except FileExistsError:
+            if not os.path.isdir(target):
+                op.error(target, FileExistsError(errno.EEXIST, "existe e não é uma pasta"))
+                continue
+        except OSError as e:
+            op.error(target, e)
+            continue
+        dirs.append((path, target))
+
+        for entry in entries:
+            dest = os.path.join(target, entry.name)
+            if entry.is_link:
+                try:
+                    os.symlink(os.readlink(entry.path), dest)
+                except OSError as e:
+                    op.error(dest, e)
+            elif entry.is_dir:
+                continue  # a própria pasta vem depois no percurso
+            elif stat.S_ISREG(entry.stat.st_mode):
+                op.planned_files += 1
+                op.planned_bytes += entry.stat.st_size
+                op.submit(_copy_one, entry.path, dest, preserve)
+            else:
+                # FIFO, socket, dispositivo: abrir um FIFO travaria a cópia
+                op.error(entry.path, OSError(errno.EINVAL, "não é um arquivo comum (ignorado)"))
+        yield from op.tick()
+    return dirs
+
+
+def finish_dirs(op, dirs, preserve=False):
+    """Copia as permissões (e as datas, com preserve) das pastas, de baixo para cima."""
+    for src, target in reversed(dirs):
+        try:
+            if preserve:
+                shutil.copystat(src, target)
+            else:
+                shutil.copymode(src, target)
+        except OSError as e:
+            op.error(target, e)
+        op.dirs += 1
+
+
+def copy_path(op, src, dst, preserve=False):
+    """Gerador: copia um arquivo ou uma árvore inteira para 'dst' (já resolvido)."""
+    if os.path.isdir(src) and not os.path.islink(src):
+        dirs = yield from plan_copy(op, src, dst, preserve)
+        yield from op.wait()
+        finish_dirs(op, dirs, preserve)
+    elif os.path.islink(src):
+        os.symlink(os.readlink(src), dst)
+        op.add(files=1)
+    else:
+        op.planned_files += 1
+        op.planned_bytes += os.path.getsize(src)
+        op.submit(_copy_one, src, dst, preserve)
+        yield from op.wait()
+
+
+def remove_path(op, path):
+    """Gerador: apaga um arquivo, link ou árvore inteira."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        dirs = yield from plan_remove(op, path)
+        yield from op.wait()
+        remove_dirs(op, dirs)
+    else:
+        os.unlink(path)
+        op.add(files=1)
+
+
+def move_path(op, src, dst):
+    """
+    Gerador: move 'src' para 'dst'. No mesmo disco é só um rename
+    (instantâneo); entre discos, copia (preservando datas) e apaga a origem
+    se a cópia deu certo.
+    """
+    try:
+        os.replace(src, dst)
+        op.add(files=1)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    errors_before = len(op.errors)
+    yield from copy_path(op, src, dst, preserve=True)
+    if len(op.errors) != errors_before or op.cancelled.is_set():
+        return  # A origem fica: a cópia está incompleta
+
+    # A remoção da origem tem contadores próprios (o progresso é o da cópia)
+    cleanup = BulkOperation(op.verb)
+    try:
+        yield from remove_path(cleanup, src)
+    finally:
+        cleanup.close()
+        op.errors.extend(cleanup.errors)
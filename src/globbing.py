@@ -0,0 +1,254 @@
+"""
+Expansão de curingas nos argumentos: *, ?, [abc], [!abc] e ** (pastas em
+qualquer profundidade), e do $? (status do último comando).
+
+O lexer marca as palavras com curinga como Glob (um str comum, só com outro
+tipo). Entre o parser e a execução, GlobExpander.expand troca cada Glob pelos
+caminhos que ela casa, em ordem alfabética, como o bash. Um padrão que não
+casa nada fica do jeito que foi digitado (e o comando reclama do arquivo),
+e palavras entre aspas nunca são expandidas: find -name "*.py" continua
+recebendo o padrão. O $? é trocado antes, inclusive entre aspas
+("status: $?"), como no sh.
+
+A AST que sai do parser fica no ParseCache e é reaproveitada, então a
+expansão acontece de novo a cada execução (os arquivos podem ter mudado),
+sem alterar a AST guardada. Para isso não custar uma listagem do disco a
+cada vez, as pastas lidas ficam no DirIndex, validadas pelo mtime da pasta:
+criar, apagar ou renomear uma entrada muda o mtime da pasta onde ela está.
+"""
+import fnmatch
+import functools
+import os
+import re
+import time
+from collections.abc import Mapping
+
+from lru import LRUCache
+
+# Pastas guardadas no índice (cada uma com a lista de entradas)
+DIR_CACHE_SIZE = 4096
+
+# Uma pasta alterada há menos que isto pode mudar de novo sem que o mtime
+# mude (sistemas de arquivos com mtime de 1 s ou 2 s). Essas não entram no
+# cache: são listadas de novo na próxima vez.
+RACY_NS = 2 * 10**9
+
+_MAGIC = re.compile(r'[*?[]')
+
+
+class Glob(str):
+    """Palavra com curinga ou $?, como saiu do lexer (ainda não expandida)."""
+    __slots__ = ()
+
+
+class Template(str):
+    """Texto entre aspas com $?: só o $? é trocado, sem curingas."""
+    __slots__ = ()
+
+
+class GlobError(Exception):
+    """Um curinga não pôde ser usado onde estava (ex: casou vários arquivos em 'cd')."""
+    pass
+
+
+def has_magic(text):
+    return _MAGIC.search(text) is not None
+
+
+@functools.lru_cache(maxsize=256)
+def _matcher(pattern):
+    """Casamento de um componente do caminho (sensível a maiúsculas, como no Unix)."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+class DirIndex:
+    """
+    Listagens de pasta em cache, indexadas pelo caminho absoluto.
+    Cada entrada é (nome, é_pasta, é_link), em ordem alfabética.
+    """
+
+    def __init__(self, maxsize=DIR_CACHE_SIZE):
+        self.cache = LRUCache(maxsize)
+        self.listings = 0  # listagens feitas de verdade (os acertos estão no cache)
+
+    def entries(self, path):
+        """Entradas da pasta 'path', ou () se ela não existe ou não pode ser lida."""
+        key = os.path.abspath(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return ()
+
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with os.scandir(path) as it:
+                entries = tuple(sorted(
+                    (e.name, _is_dir(e), e.is_symlink()) for e in it
+                ))
+        except OSError:
+            return ()
+        self.listings += 1
+
+        if time.time_ns() - mtime > RACY_NS:
+            self.cache.put(key, (mtime, entries))
+        else:
+            self.cache.pop(key)
+        return entries
+
+    def clear(self):
+        self.cache.clear()
+        self.listings = 0
+
+
+def _is_dir(entry):
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+class GlobExpander:
+    def __init__(self, index=None):
+        self.index = index or DirIndex()
+        self._status = '0'
+
+    # ---------- Um padrão ----------
+    def glob(self, pattern):
+        """Caminhos que casam com 'pattern', em ordem alfabética (lista vazia se nenhum)."""
+        dirs_only = pattern.endswith('/')
+        if pattern.startswith('/'):
+            base = '/'
+        else:
+            base = ''
+        parts = [p for p in pattern.split('/') if p]
+        if not parts:
+            return [pattern] if os.path.isdir(pattern) else []
+
+        found = dict.fromkeys(self._select(base, parts))
+        if dirs_only:
+            return sorted(p + '/' for p in found if os.path.isdir(p))
+        return sorted(found)
+
+    def _select(self, base, parts):
+        """Gera os caminhos a partir do prefixo 'base' ('' = pasta atual)."""
+        head, rest = parts[0], parts[1:]
+
+        if head == '**':
+            if not rest:
+                # 'src/**': tudo o que está dentro de src
+                yield from self._descendants(base, dirs_only=False)
+                return
+            # '**' casa zero ou mais pastas
+            yield from self._select(base, rest)
+            for sub in self._descendants(base, dirs_only=True):
+                yield from self._select(sub + '/', rest)
+            return
+
+        if not has_magic(head):
+            path = base + head
+            if rest:
+                yield from self._select(path + '/', rest)
+            elif os.path.lexists(path):
+                yield path
+            return
+
+        match = _matcher(head)
+        show_hidden = head.startswith('.')
+        for name, is_dir, _ in self.index.entries(base or '.'):
+            if name.startswith('.') and not show_hidden:
+                continue
+            if not match(name):
+                continue
+            if not rest:
+                yield base + name
+            elif is_dir:
+                yield from self._select(base + name + '/', rest)
+
+    def _descendants(self, base, dirs_only):
+        """
+        Tudo abaixo de 'base', em profundidade, sem entrar em pastas ocultas
+        nem seguir links (um link para '..' faria o '**' nunca terminar).
+        """
+        stack = [base]
+        while stack:
+            current = stack.pop()
+            below = []
+            for name, is_dir, is_link in self.index.entries(current or '.'):
+                if name.startswith('.'):
+                    continue
+                path = current + name
+                if is_dir or not dirs_only:
+                    yield path
+                if is_dir and not is_link:
+                    below.append(path + '/')
+            stack.extend(reversed(below))
+
+    # ---------- A AST inteira ----------
+    def expand(self, node, status=0):
+        """
+        A AST com os Glob expandidos e o $? trocado por 'status'. Nada é
+        alterado no lugar: as partes com curinga são copiadas e o resto é
+        compartilhado; sem nenhum curinga, devolve o próprio 'node'.
+        """
+        self._status = str(status)
+        return self._walk(node)
+
+    def _walk(self, value):
+        if isinstance(value, Glob):
+            return self._single(value)
+        if isinstance(value, Template):
+            return value.replace('$?', self._status)
+        if isinstance(value, Mapping):
+            if value.get('type') in ('script', 'list', 'watch'):
+                # Cada comando do script (ou da lista) é expandido só quando
+                # for executado: os anteriores podem criar ou apagar arquivos
+                # e mudam o $?. O 'watch' expande o dele a cada execução.
+                return value
+            out = {}
+            for key, item in value.items():
+                out[key] = self._redirs(item) if key == 'redirs' else self._walk(item)
+            if all(out[key] is value[key] for key in out):
+                return value
+            return out
+        if isinstance(value, (list, tuple)):
+            out = []
+            for item in value:
+                if isinstance(item, Glob):
+                    out.extend(self._many(item))
+                else:
+                    out.append(self._walk(item))
+            if len(out) == len(value) and all(a is b for a, b in zip(out, value)):
+                return value
+            return type(value)(out)
+        return value
+
+    def _redirs(self, redirs):
+        """Destino de '>', '>>' e '<' precisa ser um arquivo só."""
+        out = [(op, self._single(target)) for op, target in redirs]
+        if all(new is old for (_, new), (_, old) in zip(out, redirs)):
+            return redirs
+        return type(redirs)(out)
+
+    def _many(self, word):
+        """Um Glob numa lista de argumentos: vira zero ou mais palavras."""
+        text = word.replace('$?', self._status)
+        if not has_magic(text):
+            return [text]
+        return self.glob(text) or [text]
+
+    def _single(self, word):
+        """Um Glob num lugar que aceita um caminho só (ex: 'cd', 'show', '> arquivo')."""
+        if isinstance(word, Template):
+            return word.replace('$?', self._status)
+        if not isinstance(word, Glob):
+            return word
+        text = word.replace('$?', self._status)
+        if not has_magic(text):
+            return text
+        matches = self.glob(text)
+        if len(matches) > 1:
+            raise GlobError(f"{text}: o padrão casa {len(matches)} arquivos, mas aqui cabe só um")
+        return matches[0] if matches else text
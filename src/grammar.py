@@ -1,29 +1,7 @@
 import ply.yacc as yacc
 
-reserved = {
-    'help': 'HELP',
-    'exit': 'EXIT',
-    'echo': 'ECHO',
-    'history': 'HISTORY',
-    'pwd': 'PWD',
-    'ls': 'LS',
-    'show': 'SHOW',
-    'cd': 'CD',
-    'mkdir': 'MKDIR',
-    'rmdir' : 'RMDIR',
-    'rm' : 'RM',
-    'touch': 'TOUCH',
-    'ia_mode': 'IA',
-    'cls': 'CLEAR',
-    'history' : 'HISTORY'
-}
-
-tokens = [
-    'STRING',   # "texto com espaços"
-    'FLAG',     # -a, -la, --all, etc.
-    'ID',       # palavras/paths
-    'NEWLINE',
-] + list(reserved.values())
+# Os tokens vêm do lexer, assim a tabela de palavras reservadas fica em um lugar só.
+from lexer import report, tokens
 
 
 def ast(node_type, **kwargs):
@@ -33,57 +11,209 @@ def ast(node_type, **kwargs):
 
 precedence = ()
 
-def p_input_cmd_nl(p):
-    'input : command NEWLINE'
+# Uma entrada é uma ou mais linhas (o modo --script manda o arquivo inteiro
+# de uma vez). Cada linha tem uma lista de comandos; a última pode vir sem '\n'.
+def p_input(p):
+    '''input : lines
+             | lines cmdlist
+             | cmdlist'''
+    if len(p) == 3:
+        commands = p[1] + [_at_line(p[2], p.lexer.lineno)]
+    elif isinstance(p[1], list):
+        commands = p[1]
+    else:
+        commands = [_at_line(p[1], p.lexer.lineno)]
+
+    commands = [c for c in commands if c is not None]
+    if not commands:
+        p[0] = None        # Linha vazia (só ENTER)
+    elif len(commands) == 1:
+        p[0] = commands[0] # O caso do terminal interativo: uma linha só
+    else:
+        p[0] = ast('script', commands=commands)
+
+def p_lines(p):
+    '''lines : line
+             | lines line'''
+    if len(p) == 2:
+        p[0] = [p[1]]
+    else:
+        p[0] = p[1] + [p[2]]
+
+def p_line(p):
+    '''line : cmdlist NEWLINE
+            | NEWLINE'''
+    # O NEWLINE tem o número da linha em que o comando foi escrito
+    p[0] = _at_line(p[1], p.lineno(2)) if len(p) == 3 else None
+
+def _at_line(node, lineno):
+    '''Anota na AST a linha do comando (usada nas mensagens do modo --script).'''
+    if node is not None:
+        node['line'] = lineno
+    return node
+
+# --------- Listas de comandos (;, &&, ||) ----------
+# Uma linha inteira é avaliada de uma vez, como no sh:
+#   make && ./run || echo falhou ; ls
+# Cada item da lista guarda o operador que vem antes dele: ';' roda sempre,
+# '&&' só se o anterior deu certo (status 0) e '||' só se falhou.
+def p_cmdlist(p):
+    '''cmdlist : andor
+               | seq
+               | seq andor'''
+    if len(p) == 3:
+        items = p[1] + p[2]
+    else:
+        items = p[1]
+    if not items:
+        p[0] = None # Só havia um erro (ver p_stmt_background)
+    elif len(items) == 1:
+        # Um comando só: a AST é o próprio comando, como antes das listas
+        p[0] = items[0][1]
+    else:
+        p[0] = ast('list', items=items)
+
+def p_seq(p):
+    '''seq : stmt
+           | seq stmt'''
+    p[0] = p[1] if len(p) == 2 else p[1] + p[2]
+
+def p_stmt(p):
+    'stmt : andor SEMI'
     p[0] = p[1]
 
-def p_input_cmd(p):
-    'input : command'
+def p_stmt_background(p):
+    'stmt : andor AMP'
+    # Ex: "make -j8 &", "make & ls". O texto do comando vai junto, para o 'jobs' mostrar.
+    if len(p[1]) > 1:
+        report(p.lexer, "[PARSER] '&' depois de '&&' ou '||' ainda não é suportado: "
+                        "o segundo plano vale para um pipeline só.")
+        p.lexer.houve_erro = True
+        p[0] = []
+        return
+    data, end = p.lexer.lexdata, p.lexpos(2)
+    text = data[_statement_start(data, end):end].strip()
+    p[0] = [(';', ast('background', command=p[1][0][1], text=text))]
+
+def _statement_start(data, end):
+    '''Início do comando que termina em 'end': depois do último ';', '&' ou '\\n' fora de aspas.'''
+    start = data.rfind('\n', 0, end) + 1
+    cut, in_string = start, False
+    for i in range(start, end):
+        ch = data[i]
+        if ch == '"':
+            in_string = not in_string
+        elif not in_string and ch in ';&':
+            cut = i + 1
+    return cut
+
+def p_andor(p):
+    '''andor : job
+             | andor AND_IF job
+             | andor OR_IF job'''
+    if len(p) == 2:
+        p[0] = [(';', p[1])]
+    else:
+        p[0] = p[1] + [(p[2], p[3])]
+
+# --------- Medição ('time <comando>') ----------
+def p_job_time(p):
+    '''job : TIME pipeline
+           | TIME FLAG pipeline'''
+    # Ex: "time make", "time --profile ls -R /". O 'time' vale para o
+    # pipeline inteiro, como no bash.
+    if len(p) == 3:
+        p[0] = ast('time', command=p[2], flag=None)
+    else:
+        p[0] = ast('time', command=p[3], flag=p[2])
+
+# --------- Repetição ('watch <comando>') ----------
+def p_job_watch(p):
+    '''job : WATCH pipeline
+           | WATCH FLAG ID pipeline'''
+    # Ex: "watch ls -l build/", "watch -n 5 git status". Como no 'time', o
+    # comando é o pipeline inteiro; o texto dele vai junto para o cabeçalho.
+    data = p.lexer.lexdata
+    if len(p) == 3:
+        flag, interval, start = None, None, p.lexpos(1) + len(p[1])
+    else:
+        flag, interval, start = p[2], p[3], p.lexpos(3) + len(p[3])
+    text = data[start:_statement_end(data, start)].strip()
+    p[0] = ast('watch', command=p[len(p) - 1], flag=flag, interval=interval, text=text)
+
+def _statement_end(data, start):
+    '''Fim do comando que começa em 'start': o próximo ';', '&', '||' ou '\n' fora de aspas.'''
+    in_string = False
+    for i in range(start, len(data)):
+        ch = data[i]
+        if ch == '"':
+            in_string = not in_string
+        elif not in_string and (ch in ';&\n' or data.startswith('||', i)):
+            return i
+    return len(data)
+
+def p_job(p):
+    'job : pipeline'
     p[0] = p[1]
 
-def p_input_nl(p):
-    'input : NEWLINE'
-    p[0] = None
+# --------- Pipelines e Redirecionamentos ----------
+def p_pipeline(p):
+    'pipeline : stages'
+    stages = p[1]
+    # Um comando sozinho, sem redirecionamento: a AST é o próprio comando,
+    # exatamente como antes de existirem pipelines.
+    if len(stages) == 1 and not stages[0]['redirs']:
+        p[0] = stages[0]['command']
+    else:
+        p[0] = ast('pipeline', stages=stages)
+
+def p_stages(p):
+    '''stages : stage
+              | stages PIPE stage'''
+    if len(p) == 2:
+        p[0] = [p[1]]
+    else:
+        p[0] = p[1] + [p[3]]
+
+def p_stage(p):
+    '''stage : command
+             | command redirs'''
+    redirs = p[2] if len(p) == 3 else []
+    p[0] = ast('stage', command=p[1], redirs=redirs)
+
+def p_redirs(p):
+    '''redirs : redir
+              | redirs redir'''
+    if len(p) == 2:
+        p[0] = [p[1]]
+    else:
+        p[0] = p[1] + [p[2]]
+
+def p_redir(p):
+    '''redir : GT arg
+             | APPEND arg
+             | LT arg'''
+    p[0] = (p[1], p[2]) # Ex: ('>', 'saida.txt')
 
 def p_command(p):
     '''command : builtin
                | ia_mode'''
     p[0] = p[1]
     
-# --- (NOVO) Regra Genérica para Comandos Desconhecidos ou Externos ---
+# --- Regra Genérica para Comandos Desconhecidos ou Externos ---
 def p_command_generic(p):
     '''command : ID
-               | ID argseq
-               | ID flagseq
-               | ID flagseq argseq'''
-    
-    # Vamos montar a AST capturando o que veio
-    flags = []
-    args = []
-    
-    # A estrutura de p muda dependendo de qual regra foi usada:
-    
-    # Caso 1: ID (len=2) -> ex: "git"
-    if len(p) == 2:
-        pass 
-
-    # Caso 2: ID argseq (len=3) -> ex: "git pull"
-    elif len(p) == 3:
-        # Precisamos checar se p[2] é lista de flags ou args
-        # (Sua gramática retorna listas para argseq e flagseq)
-        first_element = p[2][0] 
-        if first_element.startswith('-'): # É flag
-             flags = p[2]
-        else: # É argumento
-             args = p[2]
-
-    # Caso 3: ID flagseq argseq (len=4) -> ex: "gcc -c main.c"
-    elif len(p) == 4:
-        flags = p[2]
-        args = p[3]
+               | ID wordseq'''
+    # Ex: "git", "git pull", "gcc -c main.c", "git commit -m 'msg'"
+    words = p[2] if len(p) == 3 else []
+
+    # 'argv' guarda tudo na ordem digitada, que é a que o programa espera.
+    # 'flags' e 'args' separam as duas coisas para quem quiser inspecionar.
+    flags = [w for w in words if w.startswith('-')]
+    args = [w for w in words if not w.startswith('-')]
 
     # O "type" da AST será o próprio nome do comando (ex: 'git', 'python', 'batata')
-    p[0] = ast(p[1], flags=flags, args=args)
+    p[0] = ast(p[1], flags=flags, args=args, argv=words)
 
 # --------- Builtins ----------
 def p_builtin_help(p):
@@ -99,42 +229,122 @@ def p_builtin_echo(p):
     p[0] = ast('echo', args=p[2])
 
 def p_builtin_history(p):
-    'builtin : HISTORY'
-    p[0] = ast('history')
+    '''builtin : HISTORY
+               | HISTORY wordseq'''
+    # Ex: "history", "history git push"
+    p[0] = ast('history', pattern=" ".join(p[2]) if len(p) == 3 else None)
+
+def p_builtin_jobs(p):
+    'builtin : JOBS'
+    p[0] = ast('jobs')
+
+def p_builtin_fg(p):
+    '''builtin : FG
+               | FG ID'''
+    # Ex: "fg", "fg %2"
+    p[0] = ast('fg', job=p[2] if len(p) == 3 else None)
+
+def p_builtin_kill(p):
+    'builtin : KILL wordseq'
+    # Ex: "kill %1", "kill -9 %2", "kill -KILL 4312"
+    flags, targets, _ = split_words(p[2], {})
+    p[0] = ast('kill', flags=flags, targets=targets)
+
+def p_builtin_wait(p):
+    '''builtin : WAIT
+               | WAIT wordseq'''
+    # Ex: "wait", "wait %1 %3"
+    p[0] = ast('wait', jobs=p[2] if len(p) == 3 else [])
+
+def p_builtin_stats(p):
+    '''builtin : STATS
+               | STATS command'''
+    # Ex: "stats", "stats git", "stats ls", "stats reset". O nome pode ser
+    # de um builtin (palavra reservada), por isso 'command' e não ID.
+    p[0] = ast('stats', command=p[2]['type'] if len(p) == 3 else None)
 
 def p_builtin_pwd(p):
     'builtin : PWD'
     p[0] = ast('pwd')
 
+def split_words(words, value_flags):
+    '''
+    Separa as palavras de um builtin em flags, caminhos e flags com valor.
+    value_flags diz quais flags consomem a palavra seguinte e com que nome
+    o valor entra na AST (ex: {'-n': 'limit'} faz "-n 50" virar limit='50').
+    '''
+    flags, paths, values = [], [], {}
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word in value_flags and i + 1 < len(words):
+            values[value_flags[word]] = words[i + 1]
+            i += 2
+            continue
+        if word.startswith('-'):
+            flags.append(word)
+        else:
+            paths.append(word)
+        i += 1
+    return flags, paths, values
+
+# Flags do ls que consomem a palavra seguinte como valor (ex: -n 50)
+LS_VALUE_FLAGS = {'-n': 'limit'}
+
 def p_builtin_ls_variants(p):
     '''builtin : LS
-               | LS flagseq
-               | LS ID
-               | LS flagseq ID'''
-    flags, path = [], None
-    if len(p) == 2:
-        pass
-    elif len(p) == 3:
-        if isinstance(p[2], list):
-            flags = p[2]
-        else:
-            path = p[2]
-    elif len(p) == 4:
-        flags = p[2]
-        path = p[3]
-    p[0] = ast('ls', flags=flags, path=path)
+               | LS wordseq'''
+    # Ex: "ls", "ls -la home", "ls -S -n 50 build", "ls src docs"
+    words = p[2] if len(p) == 3 else []
+    flags, paths, values = split_words(words, LS_VALUE_FLAGS)
+    p[0] = ast('ls', flags=flags, paths=paths, **values)
+
+# Flags do du que consomem a palavra seguinte como valor (ex: -d 2, --top 10)
+DU_VALUE_FLAGS = {'-d': 'depth', '--top': 'top'}
+
+def p_builtin_du(p):
+    '''builtin : DU
+               | DU wordseq'''
+    # Ex: "du", "du -h build", "du -h -d 1 .", "du --top 10 /var"
+    words = p[2] if len(p) == 3 else []
+    flags, paths, values = split_words(words, DU_VALUE_FLAGS)
+    p[0] = ast('du', flags=flags, paths=paths, **values)
+
+# Flags do show que consomem a palavra seguinte como valor
+SHOW_VALUE_FLAGS = {'--head': 'head', '--tail': 'tail', '--lines': 'lines'}
 
 def p_builtin_show(p):
     '''builtin : SHOW
-               | SHOW ID'''
-    if len(p) == 3: 
-        p[0] = ast('show', path=p[2])
-    else: 
-        p[0] = ast('show', path=None)
+               | SHOW wordseq'''
+    # Ex: "show log.txt", "show --tail 20 log.txt", "show --lines 100:200 log.txt"
+    words = p[2] if len(p) == 3 else []
+    flags, paths, values = split_words(words, SHOW_VALUE_FLAGS)
+    p[0] = ast('show', path=paths[0] if paths else None, flags=flags, **values)
+
+# Flags do grep e do find que consomem a palavra seguinte como valor
+GREP_VALUE_FLAGS = {'-m': 'max_count'}
+FIND_VALUE_FLAGS = {'-name': 'name', '-iname': 'iname', '-type': 'kind'}
+
+def p_builtin_grep(p):
+    '''builtin : GREP
+               | GREP wordseq'''
+    # Ex: "grep -rn TODO src", "grep -i -m 20 \"erro fatal\" app.log"
+    words = p[2] if len(p) == 3 else []
+    flags, rest, values = split_words(words, GREP_VALUE_FLAGS)
+    p[0] = ast('grep', flags=flags, pattern=rest[0] if rest else None,
+               paths=rest[1:], **values)
+
+def p_builtin_find(p):
+    '''builtin : FIND
+               | FIND wordseq'''
+    # Ex: "find", "find src -name \"*.py\"", "find . -type d -iname build"
+    words = p[2] if len(p) == 3 else []
+    flags, paths, values = split_words(words, FIND_VALUE_FLAGS)
+    p[0] = ast('find', flags=flags, paths=paths, **values)
 
 def p_builtin_cd(p):
     '''builtin : CD
-               | CD ID'''
+               | CD path'''
     if len(p) == 3: 
         p[0] = ast('cd', path=p[2])
     else: 
@@ -142,15 +352,15 @@ def p_builtin_cd(p):
 
 def p_builtin_mkdir(p):
     '''builtin : MKDIR
-               | MKDIR ID'''
-    if len(p) == 3: 
-        p[0] = ast('mkdir', path=p[2])
-    else: 
-        p[0] = ast('mkdir', path=None) 
+               | MKDIR wordseq'''
+    # Ex: "mkdir build", "mkdir -p src/app/models docs"
+    words = p[2] if len(p) == 3 else []
+    flags, paths, _ = split_words(words, {})
+    p[0] = ast('mkdir', flags=flags, paths=paths)
 
 def p_builtin_rmdir(p):
     '''builtin : RMDIR
-               | RMDIR ID'''
+               | RMDIR path'''
     if len(p) == 3:
         p[0] = ast('rmdir', path=p[2])
     else:
@@ -158,20 +368,38 @@ def p_builtin_rmdir(p):
 
 def p_bultin_rm(p):
     '''builtin : RM
-               | RM ID
-               | RM STRING'''
-    if len(p) == 3:
-        p[0] = ast('rm', path=p[2])
-    else:
-        p[0] = ast('rm', path=None)
+               | RM wordseq'''
+    # Ex: "rm a.txt", "rm -r node_modules build", "rm -rf dist"
+    words = p[2] if len(p) == 3 else []
+    flags, paths, _ = split_words(words, {})
+    p[0] = ast('rm', flags=flags, paths=paths)
+
+def p_builtin_cp_mv(p):
+    '''builtin : CP
+               | CP wordseq
+               | MV
+               | MV wordseq'''
+    # Ex: "cp a.txt b.txt", "cp -r src backup", "mv a.txt b.txt docs"
+    words = p[2] if len(p) == 3 else []
+    flags, paths, _ = split_words(words, {})
+    p[0] = ast(p[1], flags=flags, paths=paths)
+
 def p_builtin_touch(p):
     '''builtin : TOUCH
-               | TOUCH ID'''
+               | TOUCH path'''
     if len(p) == 3 : 
         p[0] = ast('touch', path=p[2])
     else: 
         p[0] = ast('touch', path=None)
         
+def p_builtin_ia_cache(p):
+    '''builtin : IA_CACHE
+               | IA_CACHE ID
+               | IA_CACHE STATS'''
+    # 'stats' também é um builtin (palavra reservada), daí a terceira forma
+    action = p[2] if len(p) == 3 else None
+    p[0] = ast('ia_cache', action=action)
+
 def p_builtin_clear(p):
     '''builtin : CLEAR'''
     p[0] = ast('clear')
@@ -184,31 +412,50 @@ def p_ia_mode(p):
     p[0] = ast('ia_mode')
 
 # --------- Sequências ----------
-def p_flagseq(p):
-    '''flagseq : FLAG
-               | flagseq FLAG'''
+def p_argseq(p):
+    '''argseq : arg
+              | argseq arg'''
     if len(p) == 2:
         p[0] = [p[1]]
     else:
         p[0] = p[1] + [p[2]]
 
-def p_argseq(p):
-    '''argseq : arg
-              | argseq arg'''
+def p_wordseq(p):
+    '''wordseq : word
+               | wordseq word'''
     if len(p) == 2:
         p[0] = [p[1]]
     else:
         p[0] = p[1] + [p[2]]
 
+def p_word(p):
+    '''word : FLAG
+            | STRING
+            | ID
+            | GLOB'''
+    p[0] = p[1]
+
 def p_arg(p):
     '''arg : STRING
-           | ID'''
+           | ID
+           | GLOB'''
+    p[0] = p[1]
+
+def p_path(p):
+    '''path : ID
+            | GLOB'''
+    # Um caminho só (cd, rmdir, touch); um GLOB aqui precisa casar um arquivo
     p[0] = p[1]
 
 def p_error(tok):
     if tok:
-        print(f"[PARSER] Erro próximo ao token {tok.type} ({tok.value!r}) na linha {tok.lineno}")
+        report(tok.lexer, f"[PARSER] Erro próximo ao token {tok.type} ({tok.value!r}) na linha {tok.lineno}")
+        tok.lexer.houve_erro = True
     else:
-        print("[PARSER] Erro de sintaxe no final da entrada.")
+        # Sem token não há lexer à mão; só acontece num script sem '\n' no fim
+        report(None, "[PARSER] Erro de sintaxe no final da entrada.")
 
-parser = yacc.yacc(start='input')
\ No newline at end of file
+# As tabelas LALR ficam em parsetab.py. O PLY confere a assinatura da
+# gramática e só as regera se alguma regra mudou; debug=False evita
+# escrever o parser.out a cada inicialização.
+parser = yacc.yacc(start='input', debug=False, write_tables=True, tabmodule='parsetab')
\ No newline at end of file
@@ -1,18 +1,40 @@
 import tkinter as tk
 from tkinter import font
-import sys
-import io
 import os
+from console import ConsoleRenderer, scrollback_from_env
+from executor import ClearScreenSignal
+from parse_cache import ParseCache
+from completion import common_prefix
+from input_line import InputLine
+from output import QueueSink
 
-class ClearScreenSignal(Exception):
-    """Sinal para a GUI limpar a tela"""
-    pass
+# Intervalo (ms) entre as leituras da fila de saída dos comandos externos
+OUTPUT_POLL_MS = 20
+
+# Máximo de eventos (e de texto) consumidos por leitura, para não travar a
+# janela quando um processo despeja muita saída de uma vez.
+OUTPUT_MAX_EVENTS = 500
+OUTPUT_MAX_BYTES = 256 * 1024
+
+# Listagem de opções do Tab: no máximo tantas opções, em colunas até esta largura
+COMPLETION_MAX_SHOWN = 200
+COMPLETION_COLUMNS_WIDTH = 100
+
+# Tag do Text usada para cada fluxo vindo da fila
+STREAM_TAGS = {'stdout': None, 'stderr': 'error', 'ia': 'ia', 'prompt': 'prompt'}
 
 class TermIAGUI:
     def __init__(self, parser, lexer, executor):
         self.parser = parser
         self.lexer = lexer
         self.executor = executor
+        self.parse_cache = ParseCache(parser, lexer) # Linhas repetidas não passam de novo pelo PLY
+        # Toda a saída (dos comandos, de qualquer thread, e da própria GUI)
+        # passa por esta fila de eventos e é desenhada em _drain_output
+        self.output = QueueSink()
+        self.executor.output = self.output
+        self.lexer.output = self.output # erros do lexer e do parser
+        self.executor.pager = self.open_pager # 'show --pager' abre uma janela própria
         self.is_ia_mode = False # Para controlar se estamos no "sub-shell" da IA
 
         # --- Configuração da Janela ---
@@ -35,6 +57,9 @@ class TermIAGUI:
             wrap="word"
         )
         self.output_area.pack(expand=True, fill="both", padx=5, pady=5)
+
+        # Toda escrita na tela passa pelo renderizador (quadros + scrollback limitado)
+        self.renderer = ConsoleRenderer(self.output_area, max_lines=scrollback_from_env())
         
         # Tag para colorir coisas diferentes (opcional)
         self.output_area.tag_config("prompt", foreground="#00ff00") # Verde hacker
@@ -42,8 +67,10 @@ class TermIAGUI:
         self.output_area.tag_config("ia", foreground="cyan")
 
         # --- Área de Entrada (Onde você digita) ---
-        self.input_entry = tk.Entry(
-            self.root, 
+        # Funciona como um tk.Entry, mas colore os tokens enquanto se digita
+        self.input_entry = InputLine(
+            self.root,
+            lexer,
             bg="#1e1e1e", # Um cinza bem escuro para diferenciar levemente
             fg="white", 
             insertbackground="white",
@@ -60,67 +87,155 @@ class TermIAGUI:
         self.update_prompt()
         
         #Controle de Histórico para navegação ---
-        self.command_history = [] # Guarda as strings digitadas
+        # O histórico é o mesmo do executor: persistente e compartilhado
+        # entre sessões. As setas navegam numa cópia da lista, tirada na
+        # primeira seta depois de cada comando.
+        self.history = self.executor.history
+        self.history_view = None  # Cópia da lista usada pelas setas
         self.history_index = 0    # Ponteiro de onde estamos na lista
         
         # Bind das Teclas de Seta ---
         self.input_entry.bind("<Up>", self.navigate_history_up)
         self.input_entry.bind("<Down>", self.navigate_history_down)
 
+        # Completação com Tab (comandos, executáveis do PATH e arquivos).
+        # O Completer é criado no primeiro Tab, não na inicialização.
+        self.completer = None
+        self.input_entry.bind("<Tab>", self.complete_input)
+
+        # Busca reversa no histórico (Ctrl-R), como no bash.
+        # A linha de status só aparece durante a busca.
+        self.search = None # {'pattern', 'seq', 'original'} enquanto a busca está ativa
+        self.search_label = tk.Label(
+            self.root,
+            bg="black",
+            fg="#00ff00",
+            font=self.console_font,
+            anchor="w"
+        )
+        self.input_entry.bind("<Control-r>", self.reverse_search)
+        self.input_entry.bind("<Control-g>", lambda e: self.end_search(accept=False))
+        self.input_entry.bind("<Escape>", lambda e: self.end_search(accept=False))
+        self.input_entry.bind("<KeyPress>", self.on_search_key)
+
+        # Ctrl-C interrompe o comando externo em execução
+        self.root.bind("<Control-c>", self.cancel_command)
+
+        # Começa a consumir a fila de saída dos processos externos
+        self.root.after(OUTPUT_POLL_MS, self._drain_output)
+
     def start(self):
         """Inicia o loop da interface gráfica"""
         self.root.mainloop()
 
-    def write_to_console(self, text, tag=None):
-        """Escreve texto na área de saída e rola para baixo"""
-        self.output_area.configure(state="normal") # Destrava
-        self.output_area.insert("end", text, tag)
-        self.output_area.see("end") # Rola para o final
-        self.output_area.configure(state="disabled") # Trava de novo
+    def write_to_console(self, text, tag='stdout'):
+        """
+        Escreve na área de saída, na ordem em relação à saída dos comandos:
+        entra na fila como qualquer outro evento (tag: 'stdout', 'stderr',
+        'ia' ou 'prompt').
+        """
+        self.output.write(text, tag)
+
+    def _drain_output(self):
+        """Leitura periódica da fila de saída"""
+        self.flush_output()
+        self.root.after(OUTPUT_POLL_MS, self._drain_output)
+
+    def flush_output(self):
+        """Move para a tela o que está na fila (até OUTPUT_MAX_EVENTS eventos)"""
+        for tag, text in self.output.drain(OUTPUT_MAX_EVENTS, OUTPUT_MAX_BYTES):
+            if tag == 'done':
+                # O comando em primeiro plano terminou: guarda o status
+                # ($?), continua a lista (a && b ; c) se ela esperava por
+                # ele e libera o prompt quando não sobrar nada rodando
+                self.renderer.close_region()
+                try:
+                    self.executor.finish_foreground(text)
+                except ClearScreenSignal:
+                    self.output.write("", 'clear')
+                if self.executor.foreground is None:
+                    self.update_prompt()
+            elif tag == 'job':
+                # Aviso de job terminado: numa linha própria, seguido de
+                # um prompt novo (se não houver comando rodando).
+                if self.executor.foreground is None:
+                    self.renderer.write("\n" + text)
+                    self.update_prompt()
+                else:
+                    self.renderer.write(text)
+            elif tag == 'clear':
+                self.renderer.clear() # Apaga tudo (inclusive o que estava pendente)
+            elif tag == 'watch':
+                self.renderer.update_region(text) # Redesenha só as linhas que mudaram
+            else:
+                self.renderer.write(text, STREAM_TAGS.get(tag))
+
+    def open_pager(self, index):
+        """Abre o paginador do 'show --pager' para um arquivo já indexado"""
+        from pager import Pager # Só carregado quando alguém usa o paginador
+        Pager(self.root, index, self.console_font)
+
+    def cancel_command(self, event):
+        """Ocorre quando aperta Ctrl-C (interrompe o processo ou a resposta da IA)"""
+        if self.executor.cancel_foreground():
+            self.write_to_console("^C\n", 'stderr')
+            return "break"
+        # Sem comando rodando: deixa o Ctrl-C com o comportamento normal (copiar)
 
     def update_prompt(self):
         """Mostra o prompt atual"""
         if self.is_ia_mode:
-            self.write_to_console("TermIA-GPT> ", "ia")
+            self.write_to_console("TermIA-GPT> ", 'ia')
         else:
             path = os.getcwd()
-            self.write_to_console(f"TermIA {path}> ", "prompt")
+            self.write_to_console(f"TermIA {path}> ", 'prompt')
 
     def process_input(self, event):
         """Ocorre quando aperta ENTER"""
+        # Um comando externo ainda está rodando: não aceitamos outro por enquanto
+        if self.executor.foreground is not None:
+            self.write_to_console("TermIA: aguarde o comando atual terminar (Ctrl-C para cancelar).\n", 'stderr')
+            return "break"
+
+        self.end_search(accept=True) # Enter durante o Ctrl-R executa o comando achado
         command_text = self.input_entry.get() # Pega o texto
         self.input_entry.delete(0, "end")     # Limpa o input
 
         # Escreve o comando que o usuário digitou na tela (para ficar no histórico)
+        # Quem acabou de digitar quer ver o resultado: volta a seguir o final.
+        self.renderer.follow()
         self.write_to_console(command_text + "\n")
 
         # Se estiver vazio, só mostra o prompt de novo
         if not command_text.strip():
             self.update_prompt()
+            self.flush_output()
             return
 
-        # Salva no histórico de navegação (visual) ---
-        if command_text.strip():
-            self.command_history.append(command_text)
-            self.history_index = len(self.command_history) # Reseta ponteiro pro final
+        # Salva no histórico (memória + arquivo) ---
+        self.history.add(command_text)
+        self.history_view = None # A próxima seta pega a lista atualizada
             
-        # --- Lógica de Captura do Print ---
-        # Aqui fazemos a mágica: Desviamos o sys.stdout para uma variável
-        # Assim, tudo que seu Executor der 'print', nós pegamos.
-        
-        old_stdout = sys.stdout
-        sys.stdout = buffer = io.StringIO()
-
+        # A saída não é capturada aqui: o Executor escreve na fila de eventos
+        # (self.output), de onde flush_output a leva para a tela.
         try:
             # 1. TRATAMENTO DO MODO IA (Estado)
             if self.is_ia_mode:
                 if command_text.strip().lower() in ['sair', 'exit', 'voltar']:
                     self.is_ia_mode = False
-                    print("Saindo do modo IA...")
+                    self.input_entry.set_highlighting(True)
+                    self.write_to_console("Saindo do modo IA...\n")
+                elif command_text.strip().startswith('/'):
+                    # /reset, /save, /load, /sessions, /context, /queue, /cancel
+                    self.executor.comando_ia(command_text.strip())
+                elif command_text.rstrip().endswith('&'):
+                    # Como um job do shell: vai para a fila e o prompt volta na hora
+                    self.executor.enfileirar_ia(command_text.rstrip()[:-1].strip())
                 else:
-                    # Chama direto a API
-                    resp = self.executor.chamar_api_ia(command_text)
-                    print(f"🤖 IA: {resp}")
+                    # Chama a API em streaming: os pedaços da resposta chegam
+                    # pela fila de saída enquanto a janela continua responsiva.
+                    self.write_to_console("🤖 IA: ", 'ia')
+                    self.executor.perguntar_ia(command_text)
             
             # 2. TRATAMENTO NORMAL (Parser -> Executor)
             else:
@@ -128,63 +243,168 @@ class TermIAGUI:
                 # (já que o parser funciona melhor com comandos completos)
                 if command_text.strip().lower() == 'ia_mode':
                     self.is_ia_mode = True
-                    print("="*40)
-                    print("🤖 MODO IA ATIVADO (GUI)")
-                    print("Digite 'sair' para voltar.")
-                    print("="*40)
-                    print("Faça perguntas livremente e receba respostas em tempo real.")
-                    print("="*40)
+                    self.input_entry.set_highlighting(False)
+                    self.write_to_console("\n".join([
+                        "="*40,
+                        "🤖 MODO IA ATIVADO (GUI)",
+                        "Digite 'sair' para voltar.",
+                        "="*40,
+                        "Faça perguntas livremente e receba respostas em tempo real.",
+                        "A IA lembra da conversa: /reset esquece, /save e /load <nome>",
+                        "guardam e retomam sessões, /sessions lista, /context mostra o tamanho.",
+                        "Termine a pergunta com '&' para mandá-la à fila e seguir digitando.",
+                        "="*40,
+                    ]) + "\n")
                 else:
-                    # Adiciona \n para o lexer funcionar (fix do newline)
-                    line_to_parse = command_text
-                    if not line_to_parse.endswith("\n"):
-                        line_to_parse += "\n"
-                    
-                    ast_node = self.parser.parse(line_to_parse, lexer=self.lexer)
+                    # Lexer + parser, ou a AST já pronta se a linha se repetiu
+                    ast_node = self.parse_cache.parse(command_text)
                     try:
                         self.executor.execute(ast_node)
                     except ClearScreenSignal:
                     # --- A MÁGICA DO CLEAR ACONTECE AQUI ---
-                        self.output_area.configure(state="normal")
-                        self.output_area.delete("1.0", "end") # Apaga tudo
-                        self.output_area.configure(state="disabled")
+                        # Um evento na fila: o que já foi escrito antes some junto
+                        self.write_to_console("", 'clear')
                     
 
         except Exception as e:
-            print(f"Erro Crítico: {e}")
+            self.write_to_console(f"Erro Crítico: {e}\n", 'stderr')
         
         finally:
-            # Recupera o que foi impresso
-            sys.stdout = old_stdout # Devolve o controle para o terminal real
-            output_content = buffer.getvalue()
-            
-            # Escreve na tela preta
-            self.write_to_console(output_content)
-            
-            # Prepara para o próximo comando
-            self.update_prompt()
+            # Prepara para o próximo comando. Se um processo externo ficou
+            # rodando, o prompt só volta quando ele terminar (evento 'done').
+            if self.executor.foreground is None:
+                self.update_prompt()
+            self.flush_output() # Mostra já o que o comando escreveu, sem esperar a próxima leitura
             
     def navigate_history_up(self, event):
         """Volta no histórico (Seta Cima)"""
-        if not self.command_history: return
+        self.end_search(accept=True)
+        if self.history_view is None:
+            self.history_view = self.history.commands()
+            self.history_index = len(self.history_view)
+        if not self.history_view: return
         
         # Decrementa o índice (sem passar de 0)
         self.history_index = max(0, self.history_index - 1)
         
         # Atualiza o input
         self.input_entry.delete(0, "end")
-        self.input_entry.insert(0, self.command_history[self.history_index])
+        self.input_entry.insert(0, self.history_view[self.history_index])
 
     def navigate_history_down(self, event):
         """Avança no histórico (Seta Baixo)"""
-        if not self.command_history: return
+        self.end_search(accept=True)
+        if not self.history_view: return
         
         # Incrementa o índice
-        if self.history_index < len(self.command_history) - 1:
+        if self.history_index < len(self.history_view) - 1:
             self.history_index += 1
             self.input_entry.delete(0, "end")
-            self.input_entry.insert(0, self.command_history[self.history_index])
+            self.input_entry.insert(0, self.history_view[self.history_index])
         else:
             # Se passar do último, limpa a linha (volta pro comando novo)
-            self.history_index = len(self.command_history)
-            self.input_entry.delete(0, "end")
\ No newline at end of file
+            self.history_index = len(self.history_view)
+            self.input_entry.delete(0, "end")
+
+    # ----------------------------------------------
+    # COMPLETAÇÃO (Tab)
+    # ----------------------------------------------
+    def complete_input(self, event):
+        """Tab: completa a palavra sob o cursor ou lista as opções"""
+        self.end_search(accept=True)
+        if self.completer is None:
+            from completion import Completer
+            self.completer = Completer()
+
+        line = self.input_entry.get()
+        cursor = self.input_entry.index("insert")
+        start, candidates = self.completer.complete(line, cursor)
+        word = line[start:cursor]
+
+        if len(candidates) == 1:
+            # Uma opção só: completa (pastas continuam abertas para o próximo Tab)
+            match = candidates[0]
+            self._replace_word(start, cursor, match if match.endswith('/') else match + " ")
+        elif candidates:
+            prefix = common_prefix(candidates)
+            if len(prefix) > len(word):
+                self._replace_word(start, cursor, prefix)
+            else:
+                self._list_candidates(line, candidates)
+        return "break" # Não deixa o Tab trocar o foco da janela
+
+    def _replace_word(self, start, end, text):
+        self.input_entry.delete(start, end)
+        self.input_entry.insert(start, text)
+        self.input_entry.icursor(start + len(text))
+
+    def _list_candidates(self, line, candidates):
+        """Mostra as opções em colunas, seguidas do prompt com a linha atual"""
+        shown = candidates[:COMPLETION_MAX_SHOWN]
+        width = max(len(c) for c in shown) + 2
+        columns = max(1, COMPLETION_COLUMNS_WIDTH // width)
+        rows = ["".join(c.ljust(width) for c in shown[i:i + columns]).rstrip()
+                for i in range(0, len(shown), columns)]
+        if len(candidates) > len(shown):
+            rows.append(f"... (mais {len(candidates) - len(shown)})")
+
+        self.renderer.follow()
+        self.write_to_console(line + "\n" + "\n".join(rows) + "\n")
+        self.update_prompt()
+
+    # ----------------------------------------------
+    # BUSCA REVERSA (Ctrl-R)
+    # ----------------------------------------------
+    def reverse_search(self, event):
+        """Ctrl-R: começa a busca, ou (já buscando) vai para o resultado mais antigo"""
+        if self.search is None:
+            self.search = {'pattern': "", 'seq': None, 'original': self.input_entry.get()}
+            self.search_label.pack(before=self.input_entry, fill="x", padx=5)
+            self._show_search(found=True)
+        elif self.search['pattern']:
+            self._run_search(before=self.search['seq'])
+        return "break"
+
+    def on_search_key(self, event):
+        """Teclas digitadas durante a busca vão para o padrão, não para a linha"""
+        if self.search is None:
+            return
+        if event.keysym == "BackSpace":
+            self.search['pattern'] = self.search['pattern'][:-1]
+            self._run_search(before=None) # Padrão menor: volta a buscar do mais novo
+            return "break"
+        if event.char and event.char.isprintable():
+            self.search['pattern'] += event.char
+            # Padrão maior: o resultado atual ainda pode servir
+            seq = self.search['seq']
+            self._run_search(before=None if seq is None else seq + 1)
+            return "break"
+        if not event.char and event.keysym.endswith(("_L", "_R")):
+            return "break" # Shift, Ctrl, Alt sozinhos não encerram a busca
+        # Qualquer outra tecla (setas, Home, Tab...) aceita o resultado
+        self.end_search(accept=True)
+
+    def _run_search(self, before):
+        pattern = self.search['pattern']
+        found = self.history.search(pattern, before=before) if pattern else None
+        if found:
+            self.search['seq'], command = found
+            self.input_entry.delete(0, "end")
+            self.input_entry.insert(0, command)
+            self.input_entry.icursor(command.casefold().find(pattern.casefold()))
+        self._show_search(found=found is not None or not pattern)
+
+    def _show_search(self, found):
+        status = "busca reversa" if found else "busca reversa falhou"
+        self.search_label.configure(text=f"({status}) '{self.search['pattern']}':")
+
+    def end_search(self, accept):
+        """Sai da busca, mantendo o comando achado (accept) ou o texto de antes"""
+        if self.search is None:
+            return
+        if not accept:
+            self.input_entry.delete(0, "end")
+            self.input_entry.insert(0, self.search['original'])
+        self.search = None
+        self.search_label.pack_forget()
+        return "break"
@@ -0,0 +1,117 @@
+"""
+Modo sem interface gráfica: 'main.py --script arquivo.tia' (ou '--script -'
+para ler do stdin). Feito para automação e CI.
+
+O script inteiro passa pelo lexer/parser de uma vez só (um erro de sintaxe
+em qualquer linha impede a execução de todas), e cada comando vai direto
+para o Executor: sem Tk, sem fila de saída, sem captura do stdout. A saída
+dos comandos vai para o stdout/stderr reais do processo.
+
+Código de saída: o do último comando executado (como no sh), o do comando
+que falhou com --fail-fast, ou 2 para erros de leitura/sintaxe do script.
+"""
+import sys
+import time
+
+from executor import ClearScreenSignal, exit_status
+
+# Código de saída para script ilegível ou com erro de sintaxe
+EXIT_USAGE = 2
+
+# Quantos comandos aparecem na lista dos mais lentos do --summary
+SUMMARY_SLOWEST = 10
+
+
+def read_script(path):
+    """Texto do script ('-' lê o stdin inteiro)."""
+    if path == '-':
+        return sys.stdin.read()
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def parse_script(text, parser, lexer):
+    """
+    Lista de comandos (ASTs com a chave 'line'), ou None se houve erro
+    de sintaxe (as mensagens já foram impressas pelo lexer/parser).
+    """
+    lexer.lineno = 1
+    lexer.houve_erro = False
+    if not text.endswith('\n'):
+        text += '\n'
+    tree = parser.parse(text, lexer=lexer)
+
+    if lexer.houve_erro:
+        return None
+    if tree is None:
+        # Script só com linhas vazias/comentários é válido; qualquer outra
+        # coisa que não virou AST foi um erro no fim da entrada.
+        has_code = any(line.split('#', 1)[0].strip() for line in text.splitlines())
+        return None if has_code else []
+    return tree['commands'] if tree['type'] == 'script' else [tree]
+
+
+class ScriptRunner:
+    def __init__(self, executor, parser, lexer, fail_fast=False):
+        self.executor = executor
+        self.parser = parser
+        self.lexer = lexer
+        self.fail_fast = fail_fast
+        self.timings = []  # (linha, segundos, status)
+
+    def run(self, text):
+        """Executa o script e retorna o código de saída."""
+        commands = parse_script(text, self.parser, self.lexer)
+        if commands is None:
+            print("TermIA: script não executado: erro de sintaxe.", file=sys.stderr)
+            return EXIT_USAGE
+
+        status = 0
+        for node in commands:
+            start = time.perf_counter()
+            try:
+                status = self.execute(node)
+            except SystemExit as e:
+                # 'exit' no script: encerra com o código pedido
+                status = e.code if isinstance(e.code, int) else 0
+                self.timings.append((node.get('line'), time.perf_counter() - start, status))
+                break
+            self.timings.append((node.get('line'), time.perf_counter() - start, status))
+
+            if self.fail_fast and status != 0:
+                sys.stdout.flush()
+                print(f"TermIA: --fail-fast: linha {node.get('line')} falhou (status {status}).",
+                      file=sys.stderr)
+                break
+
+        sys.stdout.flush()
+        return status
+
+    def execute(self, node):
+        if node['type'] == 'ia_mode':
+            print("TermIA: ia_mode só funciona na interface gráfica.", file=sys.stderr)
+            return EXIT_USAGE
+        try:
+            return exit_status(self.executor.execute(node))
+        except ClearScreenSignal:
+            return 0 # 'cls' não faz nada sem tela
+
+    def summary(self, text, stream=sys.stderr):
+        """Tempo de parede por comando: totais e os mais lentos."""
+        if not self.timings:
+            return
+        lines = text.splitlines()
+        durations = sorted(t for _, t, _ in self.timings)
+        total = sum(durations)
+        failed = sum(1 for _, _, status in self.timings if status != 0)
+        n = len(durations)
+
+        print(f"\n=== Resumo: {n} comandos em {total * 1000:.1f} ms "
+              f"({n / total if total else 0:.0f} comandos/s), {failed} com falha ===", file=stream)
+        print(f"  média {total / n * 1000:.2f} ms   mediana {durations[n // 2] * 1000:.2f} ms   "
+              f"máx {durations[-1] * 1000:.2f} ms", file=stream)
+        print("  mais lentos:", file=stream)
+        slowest = sorted(self.timings, key=lambda t: t[1], reverse=True)[:SUMMARY_SLOWEST]
+        for line, seconds, status in slowest:
+            source = lines[line - 1].strip() if line and line <= len(lines) else "?"
+            print(f"    linha {line:<5} {seconds * 1000:9.2f} ms  [{status}]  {source}", file=stream)
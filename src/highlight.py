@@ -0,0 +1,146 @@
+"""
+Destaque de sintaxe da linha de comando enquanto se digita.
+
+Usa as mesmas regras do lexer.py (uma cópia do lexer do PLY), então o que
+aparece colorido é exatamente o que o parser vai receber: palavras
+reservadas, flags, strings, curingas, operadores e caracteres inválidos.
+
+Relexar a linha inteira a cada tecla fica caro em linhas longas. O
+IncrementalLexer guarda os tokens da versão anterior e, a cada mudança:
+
+1. acha o trecho alterado (maior prefixo e maior sufixo em comum);
+2. volta até o token anterior à mudança (digitar 'l' e depois 's' muda o
+   token 'l' para 'ls') ou até uma aspa sem par na mesma linha (fechar a
+   aspa transforma o resto em STRING);
+3. relexa dali para a frente só até um token cair numa posição onde já
+   começava um token antigo, depois do trecho alterado: a partir desse
+   ponto o texto é o mesmo, então os tokens também são, e os antigos são
+   reaproveitados (com a posição deslocada).
+
+O resultado de update() é o trecho do texto novo cujo destaque mudou; quem
+desenha (input_line.InputLine) só retoca esse trecho.
+"""
+import bisect
+
+from lexer import reserved
+
+# Estilo de cada tipo de token (None = texto comum)
+STYLES = {
+    'STRING': 'string',
+    'FLAG': 'flag',
+    'GLOB': 'glob',
+    'PIPE': 'operator',
+    'APPEND': 'operator',
+    'GT': 'operator',
+    'LT': 'operator',
+    'AMP': 'operator',
+    'AND_IF': 'operator',
+    'OR_IF': 'operator',
+    'SEMI': 'operator',
+    'error': 'error',
+}
+STYLES.update(dict.fromkeys(reserved.values(), 'keyword'))
+
+
+def common_prefix_len(a, b):
+    """Tamanho do maior prefixo em comum (busca binária: as comparações rodam em C)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_suffix_len(a, b, limit):
+    """Tamanho do maior sufixo em comum, sem passar de 'limit'."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class IncrementalLexer:
+    """
+    Tokens de uma linha que muda aos poucos.
+    self.tokens é uma lista de (início, fim, estilo), em ordem.
+    """
+
+    def __init__(self, base_lexer):
+        # Cópia própria: o lexer principal continua livre para o parser, e
+        # os erros viram tokens 'error' em vez de prints "[LEXER] ...".
+        self.lexer = base_lexer.clone()
+        self.lexer.lexerrorf = self._error
+        self.text = ""
+        self.tokens = []
+        self.relexed = 0  # tokens gerados no último update (o resto foi reaproveitado)
+
+    @staticmethod
+    def _error(t):
+        t.type = 'error'
+        t.value = t.value[0]
+        t.lexer.skip(1)
+        return t
+
+    def update(self, text):
+        """
+        Passa para 'text'. Retorna (início, fim, tokens): o trecho do texto
+        novo cujo destaque precisa ser refeito e os tokens que caem nele;
+        None se nada mudou.
+        """
+        old, tokens = self.text, self.tokens
+        if text == old:
+            return None
+
+        start = common_prefix_len(old, text)
+        tail = common_suffix_len(old, text, min(len(old), len(text)) - start)
+        old_end = len(old) - tail
+        new_end = len(text) - tail
+        delta = new_end - old_end
+
+        # Recomeça no token anterior à mudança
+        i = bisect.bisect_left(tokens, (start,))
+        restart = min(tokens[i - 1][0], start) if i > 0 else 0
+
+        # ... ou numa aspa sem par antes dela, na mesma linha. Só a última
+        # aspa da linha pode estar sem par (duas aspas formariam uma STRING).
+        quote = old.rfind('"', old.rfind('\n', 0, start) + 1, start)
+        if 0 <= quote < restart:
+            j = bisect.bisect_left(tokens, (quote,))
+            if j < len(tokens) and tokens[j][0] == quote and tokens[j][2] == 'error':
+                restart = quote
+        keep = bisect.bisect_left(tokens, (restart,))
+
+        # Primeiro token antigo inteiro depois do trecho alterado: candidato
+        # a ponto de reencontro (na posição deslocada por 'delta')
+        k = bisect.bisect_left(tokens, (old_end,), keep)
+
+        lexer = self.lexer
+        lexer.input(text)
+        lexer.lexpos = restart
+        new, reused, end = [], [], len(text)
+        for tok in iter(lexer.token, None):
+            pos = tok.lexpos
+            while k < len(tokens) and tokens[k][0] + delta < pos:
+                k += 1
+            if k < len(tokens) and tokens[k][0] + delta == pos:
+                # Daqui em diante o texto (e portanto os tokens) é o mesmo
+                end = pos
+                reused = [(s + delta, e + delta, style) for s, e, style in tokens[k:]]
+                break
+            new.append((pos, lexer.lexpos, STYLES.get(tok.type)))
+
+        self.relexed = len(new)
+        self.tokens = tokens[:keep] + new + reused
+        self.text = text
+        return restart, end, new
+
+    def reset(self):
+        self.text = ""
+        self.tokens = []
@@ -0,0 +1,244 @@
+"""
+Histórico de comandos persistente e indexado.
+
+- Disco: um arquivo texto em ~/.termia, um comando por linha, só com
+  append. Todas as sessões escrevem no mesmo arquivo.
+- Memória: um "anel" com no máximo 'max_entries' comandos, sem
+  repetições (repetir um comando só o move para o fim).
+- Índice de trigramas: para cada sequência de 3 caracteres, a lista dos
+  comandos que a contêm. A busca (Ctrl-R, 'history <padrão>') olha só os
+  candidatos da lista mais curta, do mais novo para o mais antigo.
+
+Nada é lido na inicialização do shell: preload() carrega o arquivo e monta
+o índice numa thread, depois que o primeiro prompt já apareceu. Até o índice
+ficar pronto, as buscas percorrem o anel diretamente (mais lento, mas com o
+mesmo resultado).
+"""
+import bisect
+import os
+import threading
+
+from paths import data_file
+
+# Quantos comandos ficam na memória (variável de ambiente TERMIA_HISTSIZE)
+DEFAULT_MAX_ENTRIES = 100000
+
+HISTORY_FILE = "history"
+
+
+def max_entries_from_env():
+    try:
+        return max(1, int(os.getenv("TERMIA_HISTSIZE", DEFAULT_MAX_ENTRIES)))
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _index_into(index, seq, command):
+    for gram in trigrams(command.casefold()):
+        index.setdefault(gram, []).append(seq)
+
+
+class History:
+    def __init__(self, path=None, max_entries=None):
+        self.path = path
+        self.max_entries = max_entries or max_entries_from_env()
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._next_seq = 0
+        self._entries = {}   # seq -> comando (em ordem de inserção)
+        self._seq_of = {}    # comando -> seq (para a deduplicação)
+        self._index = None   # trigrama -> [seq, ...] em ordem crescente
+        self._dead = 0       # seqs no índice que já saíram do anel
+        self._building = False
+        self._backlog = []   # comandos que chegaram durante a montagem do índice
+
+    # ------------------------------------------------------------------
+    # Carga e gravação
+    # ------------------------------------------------------------------
+    def _file(self):
+        if self.path is None:
+            self.path = data_file(HISTORY_FILE)
+        return self.path
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self._file(), encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        for command in lines:
+            if command:
+                self._remember(command)
+
+        # O arquivo só cresce; quando ficar bem maior que o anel,
+        # reescrevemos só o que ainda está na memória.
+        if len(lines) > 2 * self.max_entries:
+            self._compact()
+
+    def _compact(self):
+        tmp = self._file() + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(command + "\n" for command in self._entries.values())
+            os.replace(tmp, self._file())
+        except OSError:
+            pass  # fica para a próxima sessão
+
+    def _append_to_file(self, command):
+        try:
+            # Modo 'a': cada linha vai inteira para o fim do arquivo, mesmo
+            # com outra sessão do TermIA escrevendo ao mesmo tempo.
+            with open(self._file(), "a", encoding="utf-8") as f:
+                f.write(command + "\n")
+        except OSError:
+            pass  # sem disco o histórico continua valendo para esta sessão
+
+    # ------------------------------------------------------------------
+    # Anel em memória
+    # ------------------------------------------------------------------
+    def _remember(self, command):
+        old = self._seq_of.pop(command, None)
+        if old is not None:
+            del self._entries[old]
+            self._dead += 1
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._entries[seq] = command
+        self._seq_of[command] = seq
+        if self._index is not None:
+            _index_into(self._index, seq, command)
+        if self._building:
+            self._backlog.append((seq, command))
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            del self._seq_of[self._entries.pop(oldest)]
+            self._dead += 1
+
+    def add(self, command):
+        """Registra um comando digitado (espaços nas pontas são ignorados)."""
+        command = command.strip().replace("\n", " ")
+        if not command:
+            return
+        with self._lock:
+            self._load()
+            if self._entries and self._entries[next(reversed(self._entries))] == command:
+                return  # mesmo comando de novo: nem a memória nem o disco mudam
+            self._remember(command)
+            self._append_to_file(command)
+
+    def commands(self):
+        """Lista dos comandos, do mais antigo para o mais novo."""
+        with self._lock:
+            self._load()
+            return list(self._entries.values())
+
+    def numbered(self):
+        """Pares (número, comando), do mais antigo para o mais novo."""
+        with self._lock:
+            self._load()
+            return list(self._entries.items())
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Índice e busca
+    # ------------------------------------------------------------------
+    def preload(self):
+        """Carrega o arquivo e monta o índice numa thread (não trava a GUI)."""
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+            self._backlog = []
+        threading.Thread(target=self.build_index, daemon=True).start()
+
+    def build_index(self):
+        """
+        Monta o índice de trigramas. A parte cara roda sem o lock, sobre uma
+        cópia das entradas; o que for adicionado enquanto isso entra no fim.
+        """
+        with self._lock:
+            self._load()
+            self._building = True
+            items = list(self._entries.items())
+
+        index = {}
+        for seq, command in items:
+            _index_into(index, seq, command)
+
+        with self._lock:
+            for seq, command in self._backlog:
+                _index_into(index, seq, command)
+            self._index = index
+            self._dead = 0
+            self._building = False
+            self._backlog = []
+
+    def _candidates(self, pattern, before=None):
+        """
+        Seqs que podem conter o padrão, do mais novo para o mais antigo.
+        Podem vir seqs que já saíram do anel ou falsos positivos: quem chama
+        confere cada um.
+        """
+        if self._index is None or self._dead > len(self._entries):
+            # Índice ainda não montado, ou com mais entradas mortas do que
+            # vivas: (re)monta em segundo plano.
+            self.preload()
+
+        if len(pattern) < 3 or self._index is None:
+            # Padrão curto demais para trigramas, ou índice ainda não pronto:
+            # percorre o anel mesmo (a busca para no primeiro resultado, que
+            # costuma estar no fim).
+            return reversed(self._entries)
+
+        postings = [self._index.get(gram) for gram in trigrams(pattern)]
+        if not all(postings):
+            return ()
+        shortest = min(postings, key=len)
+        # As listas estão em ordem crescente: o Ctrl-R repetido começa direto
+        # na posição certa em vez de pular os mais novos um a um.
+        end = len(shortest) if before is None else bisect.bisect_left(shortest, before)
+        return (shortest[i] for i in range(end - 1, -1, -1))
+
+    def search(self, pattern, before=None):
+        """
+        O comando mais recente que contém 'pattern' (sem diferenciar
+        maiúsculas), com número menor que 'before'. Retorna (número, comando)
+        ou None. Chamar de novo com before=número anda para trás (Ctrl-R).
+        """
+        for seq, command in self._matches(pattern, before):
+            return seq, command
+        return None
+
+    def find(self, pattern, limit=None):
+        """Todos os comandos que contêm 'pattern', do mais antigo para o mais novo."""
+        found = []
+        for item in self._matches(pattern):
+            found.append(item)
+            if limit is not None and len(found) >= limit:
+                break
+        found.reverse()
+        return found
+
+    def _matches(self, pattern, before=None):
+        pattern = pattern.casefold()
+        with self._lock:
+            self._load()
+            for seq in self._candidates(pattern, before):
+                if before is not None and seq >= before:
+                    continue
+                command = self._entries.get(seq)
+                if command is not None and pattern in command.casefold():
+                    yield seq, command
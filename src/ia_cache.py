@@ -0,0 +1,175 @@
+"""
+Cache de respostas da IA em dois níveis.
+
+1. Memória: um LRU pequeno, para a mesma pergunta repetida na sessão.
+2. Disco: um banco SQLite em ~/.termia, compartilhado entre sessões.
+
+A chave é um hash de (modelo, prompt normalizado, contexto da conversa).
+Entradas expiram depois de 'ttl' segundos e o arquivo em disco é mantido
+abaixo de 'max_bytes', descartando as entradas acessadas há mais tempo.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from lru import LRUCache
+from paths import data_file
+
+DEFAULT_TTL = 7 * 24 * 3600        # uma semana
+DEFAULT_MEMORY_ITEMS = 256
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def normalize_prompt(prompt):
+    """
+    Deixa equivalentes perguntas que só diferem em caixa, espaços ou
+    pontuação final ("How do I undo last commit?" == "how do i undo  last commit").
+    """
+    text = re.sub(r"\s+", " ", prompt.casefold()).strip()
+    return text.rstrip("?!. ")
+
+
+def cache_key(model, prompt, context=""):
+    raw = json.dumps([model, normalize_prompt(prompt), context], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """Nível persistente: uma tabela SQLite com política de TTL e tamanho."""
+
+    def __init__(self, path, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # As respostas são gravadas pelas threads do streaming da IA.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS respostas ("
+            " chave TEXT PRIMARY KEY,"
+            " criado REAL NOT NULL,"
+            " acesso REAL NOT NULL,"
+            " tamanho INTEGER NOT NULL,"
+            " texto TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_acesso ON respostas(acesso)")
+        self._db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT criado, texto FROM respostas WHERE chave = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[0] > self.ttl:
+                self._db.execute("DELETE FROM respostas WHERE chave = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE respostas SET acesso = ? WHERE chave = ?", (now, key))
+            self._db.commit()
+            return row[1]
+
+    def put(self, key, text):
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, size, text),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now):
+        """Remove as expiradas e, se ainda passar do limite, as menos acessadas."""
+        self._db.execute("DELETE FROM respostas WHERE criado < ?", (now - self.ttl,))
+        total = self._db.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._db.execute("SELECT chave, tamanho FROM respostas ORDER BY acesso"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM respostas WHERE chave = ?", victims)
+
+    def usage(self):
+        """(quantidade de entradas, bytes ocupados pelas respostas)"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM respostas"
+            ).fetchone()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM respostas")
+            self._db.commit()
+            self._db.execute("VACUUM")
+
+
+class IACache:
+    """Os dois níveis juntos, com as estatísticas mostradas por 'ia_cache stats'."""
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, memory_items=DEFAULT_MEMORY_ITEMS,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.memory = LRUCache(memory_items)
+        self.disk = DiskCache(path or data_file("ia_cache.sqlite3"), ttl, max_bytes)
+        # Contadores do 'ia_cache stats'. As perguntas da fila (ia_queue)
+        # consultam o cache de várias threads, então mudam sob o lock.
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def get(self, model, prompt, context=""):
+        key = cache_key(model, prompt, context)
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            expires, text = entry
+            if time.time() < expires:
+                size = len(text.encode("utf-8"))
+                with self._lock:
+                    self.memory_hits += 1
+                    self.bytes_saved += size
+                return text
+            self.memory.pop(key)
+
+        text = self.disk.get(key)
+        if text is not None:
+            size = len(text.encode("utf-8"))
+            with self._lock:
+                self.disk_hits += 1
+                self.bytes_saved += size
+            self.memory.put(key, (time.time() + self.ttl, text))
+            return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model, prompt, text, context=""):
+        key = cache_key(model, prompt, context)
+        self.memory.put(key, (time.time() + self.ttl, text))
+        self.disk.put(key, text)
+
+    def hit_rate(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+        return hits / total if total else 0.0
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+        with self._lock:
+            self.memory_hits = self.disk_hits = self.misses = self.bytes_saved = 0
@@ -0,0 +1,197 @@
+"""
+Cliente HTTP do Google Gemini usado pelo ia_mode.
+
+- Uma única requests.Session por cliente: a conexão TCP+TLS fica aberta
+  (keep-alive) e é reaproveitada entre as perguntas.
+- Timeouts separados de conexão e de leitura, para nunca travar para sempre.
+- Usa o endpoint streamGenerateContent (Server-Sent Events), entregando os
+  pedaços da resposta conforme chegam.
+
+O endereço base pode ser trocado pela variável GEMINI_API_BASE, o que
+permite apontar o cliente para um servidor local de testes
+(ver benchmarks/mock_gemini.py).
+"""
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+# (conexão, leitura) em segundos. O de leitura vale para o intervalo entre
+# dois pedaços do stream, não para a resposta inteira.
+DEFAULT_TIMEOUT = (5, 60)
+
+
+# Respostas que valem uma nova tentativa: limite de taxa e servidor sobrecarregado
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+
+class IAError(Exception):
+    """
+    Falha ao conversar com a API (HTTP, rede ou resposta inválida).
+    'transient' diz se tentar de novo pode dar certo (ver ia_queue.with_retry)
+    e 'retry_after' é a espera pedida pelo servidor, em segundos.
+    """
+
+    def __init__(self, message, status=None, retry_after=None, transient=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.transient = status in TRANSIENT_STATUS if transient is None else transient
+
+
+def _retry_after(response):
+    """Cabeçalho Retry-After em segundos (a forma com data é rara nessa API)."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
+
+
+class GeminiClient:
+    def __init__(self, api_key=None, model=DEFAULT_MODEL, base_url=None,
+                 timeout=DEFAULT_TIMEOUT, pool_size=4):
+        self.api_key = api_key if api_key is not None else os.getenv("GEMINI_API_KEY")
+        self.model = model
+        self.base_url = (base_url or os.getenv("GEMINI_API_BASE") or DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = timeout
+
+        # Pool de conexões persistentes. max_retries=0: quem decide se e
+        # quando repetir é quem chama, não o adaptador.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+    def _url(self, method):
+        return f"{self.base_url}/models/{self.model}:{method}"
+
+    def _payload(self, prompt, history=(), system=None):
+        contents = list(history)
+        contents.append({"role": "user", "parts": [{"text": prompt}]})
+        payload = {"contents": contents}
+        if system:
+            payload["systemInstruction"] = {"parts": [{"text": system}]}
+        return payload
+
+    def stream(self, prompt, history=(), system=None):
+        """
+        Gerador com os pedaços de texto da resposta, na ordem em que chegam.
+        'history' são as mensagens anteriores da conversa (papéis 'user' e
+        'model') e 'system' uma instrução de sistema (ver conversation.py).
+        Lança IAError em caso de falha.
+        """
+        if not self.api_key:
+            raise IAError("GEMINI_API_KEY não configurada (veja o arquivo .env).")
+
+        try:
+            response = self.session.post(
+                self._url("streamGenerateContent"),
+                params={"alt": "sse"},
+                # A chave vai no cabeçalho, e não na URL, para não vazar em logs.
+                headers={"x-goog-api-key": self.api_key},
+                json=self._payload(prompt, history, system),
+                stream=True,
+                timeout=self.timeout,
+            )
+        except requests.exceptions.ConnectTimeout:
+            raise IAError("Erro: Tempo esgotado ao conectar. Verifique sua internet.", transient=True)
+        except requests.exceptions.ConnectionError:
+            raise IAError("Erro: Falha na conexão. Verifique sua internet.", transient=True)
+
+        with response:
+            if response.status_code != 200:
+                if response.status_code == 404:
+                    raise IAError("Erro 404: Modelo não encontrado.", 404)
+                raise IAError(f"Erro na API ({response.status_code}): {response.text}",
+                              response.status_code, _retry_after(response))
+            try:
+                yield from self._parse_sse(response)
+            except requests.exceptions.RequestException:
+                raise IAError("Erro: A conexão caiu no meio da resposta.", transient=True)
+
+    def _parse_sse(self, response):
+        """Extrai o texto de cada evento 'data: {...}' do stream SSE."""
+        # chunk_size pequeno: cada evento é entregue assim que chega.
+        for line in response.iter_lines(chunk_size=64):
+            if not line.startswith(b"data:"):
+                continue
+            try:
+                data = json.loads(line[5:].decode("utf-8"))
+            except ValueError:
+                raise IAError("Erro: A API retornou um evento inválido.")
+            if "error" in data:
+                raise IAError(f"Erro na API: {data['error'].get('message', data['error'])}")
+            for candidate in data.get("candidates", []):
+                for part in candidate.get("content", {}).get("parts", []):
+                    if part.get("text"):
+                        yield part["text"]
+
+    def generate(self, prompt, history=(), system=None):
+        """Versão bloqueante: devolve a resposta inteira como uma string."""
+        return "".join(self.stream(prompt, history, system))
+
+    def close(self):
+        self.session.close()
+
+
+class StreamingAnswer:
+    """
+    Consome um gerador de pedaços de resposta em uma thread própria.
+    Tem a mesma interface do process_runner.ExternalProcess
+    (start/wait/cancel/on_exit), para a GUI tratá-los do mesmo jeito.
+    """
+
+    def __init__(self, chunks, on_output, on_exit=None, cancel=None):
+        self.chunks = chunks
+        self.on_output = on_output
+        self.on_exit = on_exit
+        self.returncode = None
+        # Quem gera os pedaços pode receber o mesmo Event, para parar também
+        # enquanto espera (ex: o intervalo entre duas tentativas).
+        self._cancel = cancel or threading.Event()
+        self._done = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self):
+        code = 0
+        try:
+            for chunk in self.chunks:
+                if self._cancel.is_set():
+                    code = 130
+                    break
+                self.on_output(chunk, 'ia')
+            if self._cancel.is_set():
+                code = 130 # cancelado enquanto esperava uma nova tentativa
+            self.on_output("\n", 'ia')
+        except IAError as e:
+            self.on_output(f"\n{e}\n", 'stderr')
+            code = 1
+        except Exception as e:
+            self.on_output(f"\nErro inesperado: {e}\n", 'stderr')
+            code = 1
+        finally:
+            # Fecha o gerador (e com ele a resposta HTTP) mesmo se cancelado.
+            self.chunks.close()
+        self.returncode = code
+        self._done.set()
+        if self.on_exit:
+            self.on_exit(code)
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.returncode
+
+    def running(self):
+        return not self._done.is_set()
+
+    def cancel(self):
+        self._cancel.set()
@@ -0,0 +1,205 @@
+"""
+Fila de perguntas do ia_mode: várias em andamento ao mesmo tempo, sem
+estourar o limite da API.
+
+- Concorrência limitada: no máximo 'concurrency' pedidos em voo (um pool
+  de threads); as outras perguntas esperam a vez na fila.
+- Balde de fichas (token bucket): cada pedido gasta uma ficha e as fichas
+  voltam a 'rate' por segundo, até 'burst'. Isso segura rajadas mesmo com
+  vários pedidos livres no pool. O mesmo balde vale para a pergunta em
+  primeiro plano, então as duas formas dividem o limite.
+- Falhas passageiras (429, 5xx, rede) são repetidas com espera exponencial
+  e aleatória ("full jitter"), respeitando o Retry-After do servidor. Um 429
+  esvazia o balde: as outras threads também esperam, em vez de insistir.
+
+Só se repete um pedido que ainda não entregou nenhum pedaço da resposta;
+depois disso, repetir duplicaria o texto na tela.
+"""
+import itertools
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ia_client import IAError
+
+DEFAULT_CONCURRENCY = 3
+DEFAULT_RATE = 1.0      # pedidos por segundo, em média
+DEFAULT_BURST = 4       # pedidos seguidos sem esperar
+DEFAULT_RETRIES = 5
+BACKOFF_BASE = 0.5      # segundos (1ª repetição: até 0.5 s, 2ª: até 1 s, ...)
+BACKOFF_CAP = 30.0
+
+
+def env_number(name, default, kind=float):
+    try:
+        return kind(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, cancel=None):
+        """Espera uma ficha. Retorna False se 'cancel' (threading.Event) foi acionado antes."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if cancel is not None:
+                if cancel.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+    def hold(self, seconds):
+        """Nenhuma ficha nova pelos próximos 'seconds' (o servidor pediu para esperar)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+def backoff_delay(attempt, retry_after=None, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Espera antes da repetição número 'attempt' (0 = primeira)."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def with_retry(call, bucket=None, cancel=None, retries=DEFAULT_RETRIES, on_retry=None,
+               base=BACKOFF_BASE):
+    """
+    Gerador: repassa os pedaços de call() (que devolve um gerador novo a
+    cada tentativa), pegando uma ficha do balde antes de cada uma.
+    on_retry(erro, tentativa, espera) é chamado antes de cada espera.
+    Termina sem nada se 'cancel' for acionado enquanto espera.
+    """
+    attempt = 0
+    while True:
+        if bucket is not None and not bucket.acquire(cancel):
+            return
+        started = False
+        try:
+            for chunk in call():
+                started = True
+                yield chunk
+            return
+        except IAError as e:
+            if started or not e.transient or attempt >= retries:
+                raise
+            if e.status == 429 and bucket is not None:
+                bucket.hold(e.retry_after or base)
+            delay = backoff_delay(attempt, e.retry_after, base)
+            attempt += 1
+            if on_retry is not None:
+                on_retry(e, attempt, delay)
+        if cancel is not None:
+            if cancel.wait(delay):
+                return
+        else:
+            time.sleep(delay)
+
+
+class IARequest:
+    """Uma pergunta da fila."""
+
+    def __init__(self, request_id, prompt, context=None):
+        self.id = request_id
+        self.prompt = prompt
+        self.context = context          # conversation.Context da hora em que entrou
+        self.state = 'na fila'          # 'na fila', 'enviando' ou 'repetindo' (depois de uma falha)
+        self.attempts = 0
+        self.created = time.monotonic()
+        self.cancel = threading.Event()
+        self.future = None
+
+
+class IAScheduler:
+    """
+    Roda as perguntas em um pool de threads.
+    - fetch(request) -> gerador com os pedaços da resposta (já com o
+      with_retry por dentro);
+    - on_done(request, texto, erro): chamado na thread do pool quando a
+      pergunta termina (erro é None no sucesso; texto é None se cancelada).
+    """
+
+    def __init__(self, fetch, on_done, concurrency=None):
+        self.fetch = fetch
+        self.on_done = on_done
+        self.concurrency = concurrency or env_number("TERMIA_IA_CONCURRENCY", DEFAULT_CONCURRENCY, int)
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ia")
+        self._ids = itertools.count(1)
+        self._active = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, prompt, context=None):
+        request = IARequest(next(self._ids), prompt, context)
+        with self._lock:
+            self._active[request.id] = request
+        request.future = self._pool.submit(self._run, request)
+        return request
+
+    def _run(self, request):
+        text, error = None, None
+        try:
+            request.state = 'enviando'
+            parts = []
+            stream = self.fetch(request)
+            try:
+                for chunk in stream:
+                    if request.cancel.is_set():
+                        break
+                    parts.append(chunk)
+            finally:
+                stream.close() # fecha a conexão se a pergunta foi cancelada
+            if not request.cancel.is_set():
+                text = "".join(parts)
+        except Exception as e:
+            error = e
+        finally:
+            with self._lock:
+                self._active.pop(request.id, None)
+        self.on_done(request, text, error)
+
+    def cancel(self, request_id):
+        """Cancela uma pergunta (na fila ou em andamento). Retorna False se não existe."""
+        with self._lock:
+            request = self._active.get(request_id)
+        if request is None:
+            return False
+        request.cancel.set()
+        if request.future.cancel():
+            # Ainda não tinha começado: o pool não vai chamar o _run
+            with self._lock:
+                self._active.pop(request_id, None)
+            self.on_done(request, None, None)
+        return True
+
+    def active(self):
+        """Perguntas na fila ou em andamento, da mais antiga para a mais nova."""
+        with self._lock:
+            return list(self._active.values())
+
+    def pending(self):
+        return len(self._active)
+
+    def shutdown(self):
+        for request in self.active():
+            self.cancel(request.id)
+        self._pool.shutdown(wait=False)
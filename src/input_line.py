@@ -0,0 +1,115 @@
+"""
+Linha de entrada do TermIA com destaque de sintaxe.
+
+O tk.Entry não colore partes do texto, então a linha é um tk.Text de uma
+linha só que imita a interface do Entry usada pela GUI (get, insert,
+delete, index, icursor, com posições em caracteres). Assim o histórico, o
+Tab e o Ctrl-R continuam iguais.
+
+O destaque não roda a cada tecla: cada mudança reagenda um único
+redesenho para daqui a HIGHLIGHT_DELAY_MS, e quem digita rápido paga um só
+no fim. O redesenho usa o highlight.IncrementalLexer, que só relexa o
+trecho alterado; as tags do Text andam junto com o texto, então as de fora
+desse trecho continuam certas sem ser tocadas.
+"""
+import tkinter as tk
+
+from highlight import IncrementalLexer
+
+# Espera (ms) depois da última mudança antes de redesenhar o destaque
+HIGHLIGHT_DELAY_MS = 30
+
+# Cores de cada estilo (ver highlight.STYLES)
+STYLE_COLORS = {
+    'keyword': {'foreground': "#569cd6"},
+    'flag': {'foreground': "#dcdcaa"},
+    'string': {'foreground': "#ce9178"},
+    'glob': {'foreground': "#c586c0"},
+    'operator': {'foreground': "#00ff00"},
+    'error': {'foreground': "red", 'underline': True},
+}
+
+# Teclas que o Text trataria como num editor (nova linha, tabulação, mudar
+# de linha) e que numa linha de comando não fazem nada por si
+_ENTRY_KEYS = ("<Return>", "<KP_Enter>", "<Tab>", "<Up>", "<Down>")
+
+
+class InputLine(tk.Text):
+    def __init__(self, master, lexer, **options):
+        super().__init__(master, height=1, wrap="none", undo=False, highlightthickness=0, **options)
+        self.highlighter = IncrementalLexer(lexer)
+        self.highlighting = True # desligado no ia_mode, onde a linha é texto livre
+        self._pending = None
+
+        for style, config in STYLE_COLORS.items():
+            self.tag_config(style, **config)
+
+        # As teclas de _ENTRY_KEYS param numa bindtag própria, entre as do
+        # widget (onde a GUI liga Enter, setas e Tab) e a classe Text
+        tags = list(self.bindtags())
+        tags.insert(tags.index("Text"), "InputLine")
+        self.bindtags(tuple(tags))
+        for seq in _ENTRY_KEYS:
+            self.bind_class("InputLine", seq, lambda e: "break")
+
+        self.bind("<<Modified>>", self._on_modified)
+
+    # ---------- Interface do tk.Entry ----------
+    @staticmethod
+    def _index(i):
+        if isinstance(i, int):
+            return f"1.0+{i}c"
+        return "end-1c" if i == "end" else i
+
+    def get(self):
+        return super().get("1.0", "end-1c")
+
+    def insert(self, index, text):
+        super().insert(self._index(index), text)
+
+    def delete(self, first, last=None):
+        if last is None:
+            last = f"{self._index(first)}+1c"
+        super().delete(self._index(first), self._index(last))
+
+    def index(self, i):
+        """Posição em caracteres (como no Entry), não 'linha.coluna'."""
+        n = self.count("1.0", self._index(i), "chars")
+        return n[0] if n else 0
+
+    def icursor(self, i):
+        self.mark_set("insert", self._index(i))
+        self.see("insert")
+
+    # ---------- Destaque ----------
+    def _on_modified(self, event):
+        if not self.edit_modified():
+            return # o próprio edit_modified(False) abaixo gera este evento
+        self.edit_modified(False)
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(HIGHLIGHT_DELAY_MS, self.highlight)
+
+    def set_highlighting(self, on):
+        self.highlighting = on
+        if not on:
+            for style in STYLE_COLORS:
+                self.tag_remove(style, "1.0", "end")
+            self.highlighter.reset()
+        self.highlight()
+
+    def highlight(self):
+        """Recolore só o trecho que mudou desde o último destaque."""
+        self._pending = None
+        if not self.highlighting:
+            return
+        changed = self.highlighter.update(self.get())
+        if changed is None:
+            return
+        start, end, tokens = changed
+        first, last = self._index(start), self._index(end)
+        for style in STYLE_COLORS:
+            self.tag_remove(style, first, last)
+        for s, e, style in tokens:
+            if style is not None:
+                self.tag_add(style, self._index(s), self._index(e))
@@ -0,0 +1,199 @@
+"""
+Jobs em segundo plano ('comando &').
+
+Cada job é um ExternalProcess ou Pipeline rodando sem prender o prompt.
+Enquanto está em segundo plano, a saída dele vai para um buffer próprio
+(limitado); 'fg %n' despeja o buffer na tela e passa a mostrar o resto ao
+vivo. O fim de cada processo é tratado pela thread que espera por ele
+(ExternalProcess._wait), então nenhum filho fica zumbi esperando o usuário
+digitar alguma coisa.
+"""
+import signal
+import threading
+from collections import deque
+
+# Quanto de saída cada job guarda enquanto ninguém está olhando
+JOB_BUFFER_BYTES = 1024 * 1024
+
+# Quantos jobs já terminados continuam na tabela esperando um 'fg'
+MAX_FINISHED_JOBS = 20
+
+
+def signal_name(number):
+    try:
+        return signal.Signals(number).name
+    except ValueError:
+        return f"sinal {number}"
+
+
+class Job:
+    def __init__(self, job_id, command):
+        self.id = job_id
+        self.command = command
+        self.task = None
+        self.returncode = None
+        self.sink = None  # None: guarda no buffer; senão, repassa (fg)
+        self._buffer = deque()
+        self._buffered = 0
+        self._dropped = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._on_finish = []
+
+    # ------------------------------------------------------------------
+    # Saída
+    # ------------------------------------------------------------------
+    def write(self, text, tag='stdout'):
+        """on_output do processo: chamado pelas threads leitoras."""
+        with self._lock:
+            if self.sink is not None:
+                self.sink(text, tag)
+                return
+            self._buffer.append((text, tag))
+            self._buffered += len(text)
+            while self._buffered > JOB_BUFFER_BYTES and len(self._buffer) > 1:
+                old, _ = self._buffer.popleft()
+                self._buffered -= len(old)
+                self._dropped = True
+
+    def has_output(self):
+        with self._lock:
+            return bool(self._buffer)
+
+    def attach(self, sink):
+        """Despeja o buffer em 'sink' e passa a mandar a saída nova direto para ele."""
+        with self._lock:
+            if self._dropped:
+                sink("[... saída mais antiga descartada ...]\n", 'stderr')
+            for text, tag in self._buffer:
+                sink(text, tag)
+            self._buffer.clear()
+            self._buffered = 0
+            self._dropped = False
+            self.sink = sink
+
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+    def finished(self, code):
+        """on_exit do processo."""
+        self.returncode = code
+        self._done.set()
+        for callback in self._on_finish:
+            callback(self)
+
+    def on_finish(self, callback):
+        self._on_finish.append(callback)
+
+    def running(self):
+        return not self._done.is_set()
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.returncode
+
+    def status(self):
+        if self.running():
+            return "Rodando"
+        if self.returncode == 0:
+            return "Concluído"
+        if self.returncode < 0:
+            return f"Morto ({signal_name(-self.returncode)})"
+        return f"Saiu ({self.returncode})"
+
+
+class JobTable:
+    """Os jobs da sessão, numerados como no bash: [1], [2], ..."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def new(self, command):
+        with self._lock:
+            # Jobs terminados ficam na tabela (para o 'fg' mostrar a saída),
+            # mas só os mais recentes.
+            done = [k for k in sorted(self._jobs) if not self._jobs[k].running()]
+            for k in done[:max(0, len(done) - MAX_FINISHED_JOBS + 1)]:
+                del self._jobs[k]
+            job_id = max(self._jobs, default=0) + 1
+            job = self._jobs[job_id] = Job(job_id, command)
+            return job
+
+    def get(self, spec=None):
+        """
+        Acha um job por '%n' ou 'n'. Sem spec, o mais recente.
+        Levanta ValueError/KeyError com mensagens para o usuário.
+        """
+        with self._lock:
+            if spec is None:
+                if not self._jobs:
+                    raise KeyError("nenhum job")
+                return self._jobs[max(self._jobs)]
+            number = spec[1:] if spec.startswith('%') else spec
+            if not number.isdigit():
+                raise ValueError(f"job inválido: {spec}")
+            try:
+                return self._jobs[int(number)]
+            except KeyError:
+                raise KeyError(f"{spec}: job não existe") from None
+
+    def remove(self, job):
+        with self._lock:
+            self._jobs.pop(job.id, None)
+
+    def all(self):
+        with self._lock:
+            return [self._jobs[k] for k in sorted(self._jobs)]
+
+    def current_id(self):
+        with self._lock:
+            return max(self._jobs, default=None)
+
+    def __len__(self):
+        return len(self._jobs)
+
+
+class JobWaiter:
+    """
+    'fg' e 'wait' como tarefa em primeiro plano (mesma interface do
+    ExternalProcess): na GUI o prompt volta quando os jobs terminam, sem
+    travar a janela.
+    """
+
+    def __init__(self, jobs, interrupt=False):
+        self.jobs = jobs
+        self.interrupt = interrupt # Ctrl-C chega aos jobs (fg) ou só para a espera (wait)
+        self.on_exit = None
+        self.returncode = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self):
+        for job in self.jobs:
+            while job.running() and not self._cancel.is_set():
+                job.wait(0.1)
+        self.returncode = 130 if self._cancel.is_set() else (
+            self.jobs[-1].returncode if self.jobs else 0)
+        self._done.set()
+        if self.on_exit:
+            self.on_exit(self.returncode)
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.returncode
+
+    def running(self):
+        return not self._done.is_set()
+
+    def cancel(self):
+        """Ctrl-C: no 'fg' interrompe o job; no 'wait' só para de esperar."""
+        if self.interrupt:
+            for job in self.jobs:
+                job.task.cancel()
+        else:
+            self._cancel.set()
@@ -1,4 +1,9 @@
-import ply.lex as lex   
+import os
+import zlib
+
+import ply.lex as lex
+
+from globbing import Glob, Template, has_magic
 
 reserved = {
     'help': 'HELP',
@@ -12,8 +17,21 @@ reserved = {
     'mkdir': 'MKDIR',
     'rmdir' : 'RMDIR',
     'rm' : 'RM',
+    'cp': 'CP',
+    'mv': 'MV',
+    'grep': 'GREP',
+    'find': 'FIND',
     'touch': 'TOUCH',
     'ia_mode': 'IA',
+    'ia_cache': 'IA_CACHE',
+    'jobs': 'JOBS',
+    'fg': 'FG',
+    'kill': 'KILL',
+    'wait': 'WAIT',
+    'time': 'TIME',
+    'stats': 'STATS',
+    'watch': 'WATCH',
+    'du': 'DU',
     'cls': 'CLEAR',
     'history' : 'HISTORY'
 }
@@ -22,14 +40,40 @@ tokens = [
     'STRING',   # "texto com espaços"
     'FLAG',     # -a, -la, --all, etc.
     'ID',       # palavras/paths
+    'GLOB',     # paths com curinga: *.py, src/**/test_?.py, [abc]*
     'NEWLINE',
+    'PIPE',     # |
+    'APPEND',   # >>
+    'GT',       # >
+    'LT',       # <
+    'AMP',      # & (roda em segundo plano)
+    'AND_IF',   # && (roda o próximo se este deu certo)
+    'OR_IF',    # || (roda o próximo se este falhou)
+    'SEMI',     # ; (roda um depois do outro)
 ] + list(reserved.values())
 
 t_ignore = ' \t'
 
+# Comentários ('# ...' até o fim da linha), úteis nos scripts .tia
+t_ignore_COMMENT = r'\#[^\n]*'
+
+# Operadores de pipeline, redirecionamento e listas.
+# (o PLY testa as regras em string da maior para a menor, então '>>' vem
+# antes de '>', '&&' antes de '&' e '||' antes de '|')
+t_AND_IF = r'&&'
+t_OR_IF  = r'\|\|'
+t_SEMI   = r';'
+t_PIPE   = r'\|'
+t_APPEND = r'>>'
+t_GT     = r'>'
+t_LT     = r'<'
+t_AMP    = r'&'
+
 def t_STRING(t):
     r'"[^"\n\r]*"'
     t.value = t.value[1:-1]  # remove aspas
+    if '$?' in t.value:
+        t.value = Template(t.value) # "status: $?" -> trocado na hora de executar
     return t
 
 def t_FLAG(t):
@@ -37,8 +81,13 @@ def t_FLAG(t):
     return t
 
 def t_ID(t):
-    r'[A-Za-z0-9._/\-]+'
-    t.type = reserved.get(t.value, 'ID')
+    r'[A-Za-z0-9_./\-:%*?\[\]!$]+'
+    # Com curinga (ou $?) vira GLOB, expandido só na hora de executar (ver globbing.py)
+    if has_magic(t.value) or '$?' in t.value:
+        t.type = 'GLOB'
+        t.value = Glob(t.value)
+    else:
+        t.type = reserved.get(t.value, 'ID')
     return t
 
 def t_NEWLINE(t):
@@ -46,8 +95,60 @@ def t_NEWLINE(t):
     t.lexer.lineno += len(t.value)
     return t
 
+def report(lexer, message):
+    """
+    Mensagem de erro do lexer ou do parser. Vai para a saída do Executor
+    (lexer.output, um sink de output.py) se houver uma; senão, para o print.
+    """
+    output = getattr(lexer, 'output', None)
+    if output is None:
+        print(message)
+    else:
+        output.write(message + "\n", 'stderr')
+
 def t_error(t):
-    print(f"[LEXER] Caractere inválido: {t.value[0]!r}")
+    report(t.lexer, f"[LEXER] Caractere inválido: {t.value[0]!r}")
+    t.lexer.houve_erro = True # Avisa o ParseCache para não guardar esta linha
     t.lexer.skip(1)
 
-lexer = lex.lex()
\ No newline at end of file
+# --------- Tabelas pré-geradas ----------
+# Em vez de refletir sobre este módulo e validar cada regra a cada
+# inicialização, o lexer é carregado do lextab.py (modo optimize). A tabela
+# guarda uma assinatura das regras; se alguma regra mudar, ela é refeita.
+
+_TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _assinatura():
+    """
+    Hash das regras (tokens, palavras reservadas e expressões regulares).
+    CRC32 basta para detectar mudança, e evita importar o hashlib (~5 ms).
+    """
+    regras = sorted(
+        (nome, obj.__doc__ if callable(obj) else obj)
+        for nome, obj in globals().items() if nome.startswith('t_')
+    )
+    dados = repr((tokens, sorted(reserved.items()), regras))
+    return format(zlib.crc32(dados.encode('utf-8')), '08x')
+
+def build_lexer():
+    assinatura = _assinatura()
+    try:
+        import lextab
+        valida = getattr(lextab, '_assinatura', None) == assinatura
+    except ImportError:
+        valida = False
+
+    if valida:
+        return lex.lex(optimize=True, lextab='lextab')
+
+    # Tabela ausente ou desatualizada: constrói validando as regras e regrava.
+    novo = lex.lex()
+    try:
+        novo.writetab('lextab', _TABLES_DIR)
+        with open(os.path.join(_TABLES_DIR, 'lextab.py'), 'a') as f:
+            f.write(f"_assinatura = {assinatura!r}\n")
+    except OSError:
+        pass  # pasta somente leitura: funciona, só não acelera a próxima vez
+    return novo
+
+lexer = build_lexer()
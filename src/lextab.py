@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AMP', 'AND_IF', 'APPEND', 'CD', 'CLEAR', 'CP', 'DU', 'ECHO', 'EXIT', 'FG', 'FIND', 'FLAG', 'GLOB', 'GREP', 'GT', 'HELP', 'HISTORY', 'IA', 'IA_CACHE', 'ID', 'JOBS', 'KILL', 'LS', 'LT', 'MKDIR', 'MV', 'NEWLINE', 'OR_IF', 'PIPE', 'PWD', 'RM', 'RMDIR', 'SEMI', 'SHOW', 'STATS', 'STRING', 'TIME', 'TOUCH', 'WAIT', 'WATCH'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_STRING>"[^"\\n\\r]*")|(?P<t_FLAG>--[a-zA-Z0-9_-]+|-{1}[a-zA-Z]+)|(?P<t_ID>[A-Za-z0-9_./\\-:%*?\\[\\]!$]+)|(?P<t_NEWLINE>\\n+)|(?P<t_ignore_COMMENT>\\#[^\\n]*)|(?P<t_OR_IF>\\|\\|)|(?P<t_AND_IF>&&)|(?P<t_PIPE>\\|)|(?P<t_APPEND>>>)|(?P<t_SEMI>;)|(?P<t_GT>>)|(?P<t_LT><)|(?P<t_AMP>&)', [None, ('t_STRING', 'STRING'), ('t_FLAG', 'FLAG'), ('t_ID', 'ID'), ('t_NEWLINE', 'NEWLINE'), (None, None), (None, 'OR_IF'), (None, 'AND_IF'), (None, 'PIPE'), (None, 'APPEND'), (None, 'SEMI'), (None, 'GT'), (None, 'LT'), (None, 'AMP')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_assinatura = '81470c1b'
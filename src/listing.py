@@ -0,0 +1,119 @@
+"""
+Listagem de diretórios para o builtin 'ls'.
+
+Usa os.scandir: o tipo de cada entrada (pasta ou arquivo) já vem da própria
+leitura do diretório, sem um stat por arquivo. O stat só é feito quando a
+listagem precisa dele (-l, -S, -t), e uma única vez por entrada.
+"""
+import heapq
+import os
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+# Quantas pastas o 'ls -R' pode ter lidas à frente do que já foi mostrado
+PREFETCH = 64
+
+WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+class Entry:
+    """O que o ls precisa de cada item do diretório."""
+    __slots__ = ('name', 'path', 'is_dir', 'is_link', 'stat')
+
+    def __init__(self, name, path, is_dir, is_link, stat):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.is_link = is_link
+        self.stat = stat
+
+
+def scan_dir(path, show_all=False, need_stat=False):
+    """
+    Lê um diretório. Com need_stat, faz o stat de cada entrada aqui mesmo
+    (no 'ls -R' isso acontece nas threads, em paralelo).
+    """
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if not show_all and entry.name.startswith('.'):
+                continue
+            try:
+                is_dir = entry.is_dir()
+                is_link = entry.is_symlink()
+            except OSError:
+                is_dir = is_link = False
+            stat = None
+            if need_stat:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Link simbólico quebrado: usa os dados do próprio link
+                    stat = entry.stat(follow_symlinks=False)
+            entries.append(Entry(entry.name, entry.path, is_dir, is_link, stat))
+    return entries
+
+
+def file_entry(path, need_stat=False):
+    """Entry de um arquivo pedido diretamente (ex: 'ls *.py'); o nome é o caminho digitado."""
+    is_link = os.path.islink(path)
+    stat = os.stat(path) if need_stat and not is_link else None
+    if need_stat and stat is None:
+        stat = os.lstat(path)
+    return Entry(path, path, False, is_link, stat)
+
+
+SORT_KEYS = {
+    'name': (lambda e: e.name, False),
+    'size': (lambda e: e.stat.st_size, True),   # maiores primeiro
+    'time': (lambda e: e.stat.st_mtime, True),  # mais recentes primeiro
+}
+
+
+def sort_entries(entries, sort_by='name', reverse=False, limit=None):
+    """
+    Ordena como o ls. Com limit, usa seleção top-k (heapq) em vez de ordenar
+    tudo: O(n log k) em vez de O(n log n) quando só os primeiros importam.
+    """
+    key, descending = SORT_KEYS[sort_by]
+    descending = descending != reverse
+    if limit is not None and limit < len(entries):
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        return pick(limit, entries, key=key)
+    return sorted(entries, key=key, reverse=descending)
+
+
+def walk_parallel(top, show_all=False, need_stat=False, on_error=None):
+    """
+    Gerador de (pasta, entradas) para o 'ls -R', na mesma ordem do ls
+    (profundidade primeiro, pastas em ordem alfabética). As próximas pastas
+    da fila já vão sendo lidas por um pool de threads enquanto a atual é
+    mostrada.
+    """
+    pool = ThreadPoolExecutor(max_workers=WORKERS)
+    pending = deque([[top, None]])
+
+    def prefetch():
+        for item in islice(pending, PREFETCH):
+            if item[1] is None:
+                item[1] = pool.submit(scan_dir, item[0], show_all, need_stat)
+
+    try:
+        while pending:
+            prefetch()
+            path, future = pending.popleft()
+            try:
+                entries = future.result()
+            except OSError as e:
+                if on_error:
+                    on_error(path, e)
+                continue
+            yield path, entries
+
+            # Links para pastas não são seguidos (evita ciclos), como no ls.
+            subdirs = sorted((e for e in entries if e.is_dir and not e.is_link),
+                             key=lambda e: e.name)
+            pending.extendleft([e.path, None] for e in reversed(subdirs))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,18 +1,121 @@
 #Davi Pereira Bossi - 2024014355
 
-from dotenv import load_dotenv
-from executor import Executor
-from grammar import parser
-from lexer import lexer
-from gui import TermIAGUI
+import time
+_T0 = time.perf_counter() # Referência para o --startup-profile
+
+import argparse
+import sys
+
+
+class StartupProfile:
+    """
+    Marca o tempo de cada etapa da inicialização até o primeiro prompt.
+    Cada marca guarda o tempo da etapa, o acumulado e quantos módulos
+    novos foram importados nela (o grosso do custo de uma partida a frio).
+    """
+
+    def __init__(self, t0):
+        self.t0 = t0
+        self.marks = []
+        self._last = t0
+        self._modules = len(sys.modules)
+
+    def mark(self, label):
+        now = time.perf_counter()
+        modules = len(sys.modules)
+        self.marks.append((label, now - self._last, now - self.t0, modules - self._modules))
+        self._last = now
+        self._modules = modules
+
+    def report(self, stream=sys.stderr):
+        print(f"{'etapa':<28}{'ms':>10}{'total ms':>10}{'módulos':>9}", file=stream)
+        for label, delta, total, modules in self.marks:
+            print(f"{label:<28}{delta * 1000:>10.1f}{total * 1000:>10.1f}{modules:>9}", file=stream)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="TermIA - Terminal Inteligente")
+    ap.add_argument("--startup-profile", action="store_true",
+                    help="mostra no stderr quanto tempo cada etapa da inicialização levou")
+    ap.add_argument("--exit-after-startup", action="store_true",
+                    help="fecha logo após o primeiro prompt (usado pelos benchmarks)")
+    ap.add_argument("--script", metavar="ARQUIVO",
+                    help="roda os comandos do arquivo sem interface gráfica ('-' lê do stdin)")
+    ap.add_argument("--fail-fast", action="store_true",
+                    help="com --script, para no primeiro comando que falhar")
+    ap.add_argument("--summary", action="store_true",
+                    help="com --script, mostra no stderr o tempo de cada comando")
+    return ap.parse_args()
+
+
+def run_headless(args):
+    """Modo --script: lexer, parser e executor, sem importar o tkinter."""
+    from lexer import lexer
+    from grammar import parser
+    from executor import Executor
+    from headless import EXIT_USAGE, ScriptRunner, read_script
+
+    try:
+        text = read_script(args.script)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"TermIA: não foi possível ler o script '{args.script}': {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    executor = Executor()
+    lexer.output = executor.output # erros de sintaxe no stderr, como os dos comandos
+    runner = ScriptRunner(executor, parser, lexer, fail_fast=args.fail_fast)
+    status = runner.run(text)
+    if args.summary:
+        runner.summary(text)
+    return status
+
 
 if __name__ == "__main__":
-    # Carrega variáveis de ambiente (segurança)
-    load_dotenv() 
+    args = parse_args()
+    if args.script is not None:
+        sys.exit(run_headless(args))
+
+    perfil = StartupProfile(_T0)
+    perfil.mark("python + argparse")
+
+    # Lexer e parser vêm das tabelas pré-geradas (lextab.py / parsetab.py)
+    from lexer import lexer
+    perfil.mark("lexer (lextab)")
+    from grammar import parser
+    perfil.mark("parser (parsetab)")
+    from executor import Executor
+    perfil.mark("executor")
+    from gui import TermIAGUI
+    perfil.mark("gui (tkinter)")
 
     # Instancia o Executor
     executor_instance = Executor()
-    
+
     # Inicia a Interface Gráfica em vez do repl()
     app = TermIAGUI(parser, lexer, executor_instance)
+    perfil.mark("janela Tk")
+
+    def init_tardia():
+        """O que não é necessário para desenhar o primeiro prompt fica para depois."""
+        # Carrega variáveis de ambiente (segurança)
+        from dotenv import load_dotenv
+        load_dotenv()
+        perfil.mark("dotenv (adiado)")
+
+        # Histórico: lê o arquivo e monta o índice de busca numa thread
+        app.executor.history.preload()
+
+        if args.startup_profile:
+            perfil.report()
+        if args.exit_after_startup:
+            app.root.destroy()
+
+    def primeiro_prompt():
+        app.flush_output() # boas-vindas e prompt: da fila de saída para o renderizador
+        app.renderer.flush()
+        app.root.update_idletasks()
+        perfil.mark("primeiro prompt")
+        app.root.after_idle(init_tardia)
+
+    app.root.after_idle(primeiro_prompt)
     app.start()
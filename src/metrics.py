@@ -0,0 +1,214 @@
+"""
+Medição dos comandos: tempo de parede, tempo de CPU e recursos dos filhos.
+
+Cada comando despachado pelo Executor vira uma Measurement. Ela anota o
+relógio e o tempo de CPU do TermIA no início e, no fim, junta o uso de
+recursos dos processos filhos (rusage: CPU, pico de memória e blocos de
+E/S), quando o comando rodou algum.
+
+Os números vão para a tabela de agregados (Metrics), uma linha por comando
+('ls', 'git', 'pipeline'...), com um histograma de latência por comando.
+O histograma usa baldes em escala logarítmica (potências de 2 em
+microssegundos): guardar um comando custa um incremento, e a memória não
+cresce com o número de execuções.
+"""
+import os
+import sys
+import threading
+import time
+
+# Baldes do histograma: o balde k guarda durações em [2^(k-1), 2^k) µs.
+# 40 baldes vão de 1 µs a ~6 dias.
+HISTOGRAM_BUCKETS = 40
+
+
+def exit_code(status):
+    """Código de saída a partir do status do wait (sinal N vira -N, como no Popen)."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def child_usage(ru):
+    """Resumo de um struct rusage (os.wait4) em um dict."""
+    return {
+        'utime': ru.ru_utime,
+        'stime': ru.ru_stime,
+        # ru_maxrss vem em KB no Linux e em bytes no macOS
+        'maxrss_kb': ru.ru_maxrss // 1024 if sys.platform == 'darwin' else ru.ru_maxrss,
+        'inblock': ru.ru_inblock,
+        'oublock': ru.ru_oublock,
+    }
+
+
+def merge_usage(usages):
+    """Soma o uso de vários filhos (o pico de memória é o do maior)."""
+    usages = [u for u in usages if u]
+    if not usages:
+        return None
+    return {
+        'utime': sum(u['utime'] for u in usages),
+        'stime': sum(u['stime'] for u in usages),
+        'maxrss_kb': max(u['maxrss_kb'] for u in usages),
+        'inblock': sum(u['inblock'] for u in usages),
+        'oublock': sum(u['oublock'] for u in usages),
+    }
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+class Histogram:
+    """Histograma de durações com baldes logarítmicos."""
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds):
+        bucket = min(int(seconds * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.counts[bucket] += 1
+
+    def percentile(self, fraction):
+        """Estimativa do percentil (o limite superior do balde em que ele cai)."""
+        total = sum(self.counts)
+        if not total:
+            return 0.0
+        wanted = fraction * total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                return (1 << bucket) / 1e6
+        return (1 << (HISTOGRAM_BUCKETS - 1)) / 1e6
+
+    def bars(self, width=30):
+        """Linhas '  <= 512µs  ####  12' dos baldes não vazios."""
+        peak = max(self.counts) or 1
+        first = next((i for i, c in enumerate(self.counts) if c), 0)
+        last = max((i for i, c in enumerate(self.counts) if c), default=0)
+        for bucket in range(first, last + 1):
+            count = self.counts[bucket]
+            bar = '#' * max(1 if count else 0, count * width // peak)
+            yield f"  <= {format_seconds((1 << bucket) / 1e6):>8}  {bar:<{width}} {count}\n"
+
+
+class CommandStats:
+    """Agregados de um comando."""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.failures = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.wall_max = 0.0
+        self.child_cpu = 0.0
+        self.maxrss_kb = 0
+        self.inblock = 0
+        self.oublock = 0
+        self.histogram = Histogram()
+
+    def add(self, measurement):
+        self.count += 1
+        if measurement.status:
+            self.failures += 1
+        self.wall += measurement.wall
+        self.cpu += measurement.cpu
+        self.wall_max = max(self.wall_max, measurement.wall)
+        self.histogram.add(measurement.wall)
+        usage = measurement.usage
+        if usage:
+            self.child_cpu += usage['utime'] + usage['stime']
+            self.maxrss_kb = max(self.maxrss_kb, usage['maxrss_kb'])
+            self.inblock += usage['inblock']
+            self.oublock += usage['oublock']
+
+    def percentile(self, fraction):
+        # O balde só dá um limite superior; o máximo real é mais preciso
+        return min(self.histogram.percentile(fraction), self.wall_max)
+
+
+class Measurement:
+    """
+    Um comando sendo medido. O Executor chama stop() quando ele termina;
+    na GUI, comandos que seguem em segundo plano (processos, pipelines)
+    são 'adiados' e param só no evento de fim (ver Executor.run_foreground).
+    """
+
+    def __init__(self, metrics, name, report=None):
+        self.metrics = metrics
+        self.name = name
+        self.report = report   # chamado com a medição pronta (o prefixo 'time')
+        self.deferred = False
+        self.tasks = []        # processos/pipelines cujo rusage entra na conta
+        self.status = None
+        self.wall = self.cpu = 0.0
+        self.usage = None
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._stopped = False
+
+    def track(self, task):
+        self.tasks.append(task)
+
+    def defer(self):
+        self.deferred = True
+
+    def stop(self, status):
+        if self._stopped:
+            return
+        self._stopped = True
+        self.wall = time.perf_counter() - self._wall0
+        # Tempo de CPU do próprio TermIA (todas as threads) durante o comando
+        self.cpu = time.process_time() - self._cpu0
+        self.status = status or 0
+        self.usage = merge_usage(getattr(task, 'rusage', None) for task in self.tasks)
+        self.metrics.add(self)
+        if self.report:
+            self.report(self)
+
+    def describe(self):
+        """Texto do prefixo 'time'."""
+        text = f"\nreal {format_seconds(self.wall)}   cpu (TermIA) {format_seconds(self.cpu)}"
+        if self.usage:
+            u = self.usage
+            text += (f"\nuser {format_seconds(u['utime'])}   sys {format_seconds(u['stime'])}   "
+                     f"memória máx {u['maxrss_kb'] / 1024:.1f} MB   "
+                     f"blocos lidos {u['inblock']}   escritos {u['oublock']}")
+        return text + "\n"
+
+
+class Metrics:
+    """Tabela de agregados por comando, segura para várias threads."""
+
+    def __init__(self):
+        self._commands = {}
+        self._lock = threading.Lock()
+
+    def start(self, name, report=None):
+        return Measurement(self, name, report)
+
+    def add(self, measurement):
+        with self._lock:
+            stats = self._commands.get(measurement.name)
+            if stats is None:
+                stats = self._commands[measurement.name] = CommandStats(measurement.name)
+            stats.add(measurement)
+
+    def get(self, name):
+        with self._lock:
+            return self._commands.get(name)
+
+    def all(self):
+        """Agregados em ordem decrescente de tempo total."""
+        with self._lock:
+            return sorted(self._commands.values(), key=lambda s: s.wall, reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._commands.clear()
@@ -0,0 +1,158 @@
+"""
+Saída dos comandos: para onde vai tudo o que o Executor escreve.
+
+Os handlers não escrevem no sys.stdout: chamam executor.emit/print, que
+entregam cada pedaço de texto, com uma tag, ao sink (sumidouro) injetado
+no Executor:
+
+  'stdout', 'stderr'  saída normal e mensagens de erro
+  'ia'                resposta da IA
+  'job', 'report'     avisos de jobs e relatório do 'time'
+  'prompt', 'clear'   prompt e limpeza da tela (só a GUI usa)
+  'done'              fim do comando em primeiro plano (o texto é o código)
+  'watch'             quadro do 'watch' (o texto é uma lista de linhas)
+
+- TerminalSink (modo --script): escreve direto no terminal, com os erros e
+  o relatório do 'time' no stderr.
+- QueueSink (GUI): fila de eventos segura entre threads. Qualquer thread
+  escreve; a thread da GUI consome aos poucos (drain) e desenha. Como nada
+  troca o sys.stdout, comandos em threads diferentes podem escrever ao
+  mesmo tempo sem misturar os fluxos.
+
+A fila tem teto de memória. Passando de memory_limit bytes (ou de
+max_events eventos), os eventos seguintes vão para um arquivo temporário,
+na ordem em que chegaram, e são lidos de volta quando a GUI alcançar. Um
+comando que despeja centenas de MB não ocupa mais que o teto, e quem
+escreve nunca espera: bloquear a thread da GUI, que é quem consome,
+travaria tudo.
+"""
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import deque
+
+# Teto da parte em memória da fila (TERMIA_OUTPUT_MEMORY, em MB)
+DEFAULT_MEMORY_MB = 8
+MAX_EVENTS = 10000
+
+# Tags que o terminal manda para o stderr
+STDERR_TAGS = {'stderr', 'report'}
+
+
+def memory_limit_from_env():
+    """Lê TERMIA_OUTPUT_MEMORY (MB), caindo no padrão se estiver vazio ou inválido."""
+    try:
+        mb = float(os.getenv("TERMIA_OUTPUT_MEMORY") or DEFAULT_MEMORY_MB)
+    except ValueError:
+        mb = DEFAULT_MEMORY_MB
+    return max(1, int(mb * 1024 * 1024))
+
+
+class TerminalSink:
+    """Escreve no terminal (os fluxos do momento, para o redirect_stdout continuar valendo)."""
+    asynchronous = False  # o comando termina antes do execute voltar
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def write(self, text, tag='stdout'):
+        if tag in ('done', 'prompt', 'clear', 'watch'):
+            return
+        with self._lock:
+            if tag in STDERR_TAGS:
+                sys.stdout.flush() # o erro aparece depois do que já saiu
+                sys.stderr.write(text)
+                sys.stderr.flush()
+            else:
+                sys.stdout.write(text)
+                if threading.current_thread() is not threading.main_thread():
+                    # Saída de processo (thread leitora): aparece na hora
+                    sys.stdout.flush()
+
+
+class QueueSink:
+    """Fila de eventos (tag, texto) entre as threads dos comandos e a GUI."""
+    asynchronous = True  # comandos seguem rodando depois do execute (evento 'done')
+
+    def __init__(self, memory_limit=None, max_events=MAX_EVENTS):
+        self.memory_limit = memory_limit or memory_limit_from_env()
+        self.max_events = max_events
+        self._events = deque()
+        self._bytes = 0          # tamanho do texto na parte em memória
+        self._lock = threading.Lock()
+
+        # Transbordo: criado no primeiro uso. Os eventos ficam entre as
+        # posições de leitura e escrita; alcançada a escrita, o arquivo é
+        # esvaziado e a fila volta a usar só a memória.
+        self._spill = None
+        self._read_pos = 0
+        self._write_pos = 0
+        self.spilled_events = 0
+        self.spilled_bytes = 0
+
+    def write(self, text, tag='stdout'):
+        size = len(text) if isinstance(text, str) else 0
+        with self._lock:
+            if (self._read_pos == self._write_pos
+                    and len(self._events) < self.max_events
+                    and self._bytes + size <= self.memory_limit):
+                self._events.append((tag, text))
+                self._bytes += size
+                return
+            # Memória cheia, ou já há eventos no disco (que são mais novos
+            # que os da memória e mais velhos que este): vai para o disco.
+            if self._spill is None:
+                self._spill = tempfile.TemporaryFile(prefix="termia-saida-")
+            self._spill.seek(self._write_pos)
+            pickle.dump((tag, text), self._spill, pickle.HIGHEST_PROTOCOL)
+            self._write_pos = self._spill.tell()
+            self.spilled_events += 1
+            self.spilled_bytes += size
+
+    def drain(self, max_events, max_bytes=None):
+        """
+        Retira até max_events eventos (e ~max_bytes de texto), na ordem em
+        que foram escritos. Não espera: devolve [] se não houver nada.
+        """
+        out = []
+        taken = 0
+        with self._lock:
+            while self._events and len(out) < max_events:
+                tag, text = self._events.popleft()
+                size = len(text) if isinstance(text, str) else 0
+                self._bytes -= size
+                taken += size
+                out.append((tag, text))
+                if max_bytes is not None and taken >= max_bytes:
+                    return out
+
+            if self._events or self._read_pos == self._write_pos:
+                return out
+            self._spill.seek(self._read_pos)
+            while self._read_pos < self._write_pos and len(out) < max_events:
+                tag, text = pickle.load(self._spill)
+                self._read_pos = self._spill.tell()
+                out.append((tag, text))
+                taken += len(text) if isinstance(text, str) else 0
+                if max_bytes is not None and taken >= max_bytes:
+                    break
+            if self._read_pos == self._write_pos:
+                # Tudo lido: o arquivo volta ao tamanho zero
+                self._spill.seek(0)
+                self._spill.truncate()
+                self._read_pos = self._write_pos = 0
+        return out
+
+    def pending(self):
+        """Eventos na memória e bytes ainda no disco."""
+        with self._lock:
+            return len(self._events), self._write_pos - self._read_pos
+
+    def close(self):
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+            self._read_pos = self._write_pos = 0
@@ -0,0 +1,128 @@
+"""
+Paginador do 'show --pager' (janela própria, estilo 'less').
+
+O tk.Text do paginador só contém as linhas que cabem na janela: a cada
+rolagem o conteúdo é trocado pelas linhas da nova posição, lidas do
+LineIndex. Um arquivo de vários GB abre na hora e ocupa na tela apenas
+algumas dezenas de linhas.
+
+A barra de rolagem trabalha com a posição em bytes (e não em linhas),
+porque o total de linhas só é conhecido depois de ler o arquivo inteiro.
+"""
+import tkinter as tk
+
+
+class Pager:
+    def __init__(self, root, index, font):
+        self.index = index
+        self.top = 0   # primeira linha visível (contando de 0)
+        self.rows = 1  # quantas linhas cabem na janela
+
+        self.window = tk.Toplevel(root)
+        self.window.title(f"show - {index.path}")
+        self.window.geometry("800x600")
+        self.window.configure(bg="black")
+
+        self.status = tk.Label(self.window, bg="#1e1e1e", fg="white", font=font, anchor="w")
+        self.status.pack(side="bottom", fill="x")
+
+        self.scrollbar = tk.Scrollbar(self.window, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.text = tk.Text(
+            self.window,
+            bg="black",
+            fg="white",
+            font=font,
+            state="disabled",
+            wrap="none" # Uma linha do arquivo = uma linha da tela
+        )
+        self.text.pack(expand=True, fill="both", padx=5, pady=5)
+        self.line_height = max(1, font.metrics("linespace"))
+
+        # --- Teclas (estilo less) ---
+        for seq, delta in (("<Down>", 1), ("<Up>", -1), ("j", 1), ("k", -1),
+                           ("<Next>", "page"), ("<space>", "page"), ("<Prior>", "-page")):
+            self.window.bind(seq, lambda e, d=delta: self.scroll(d))
+        self.window.bind("<Home>", lambda e: self.goto(0))
+        self.window.bind("g", lambda e: self.goto(0))
+        self.window.bind("<End>", lambda e: self.goto_end())
+        self.window.bind("G", lambda e: self.goto_end())
+        self.window.bind("q", lambda e: self.close())
+        self.window.bind("<Escape>", lambda e: self.close())
+        # Roda do mouse (Windows/macOS usam MouseWheel; X11 usa os botões 4 e 5)
+        self.window.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.window.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.window.bind("<Button-5>", lambda e: self.scroll(3))
+
+        self.text.bind("<Configure>", self.on_resize)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.window.focus_set()
+        self.render()
+
+    # ------------------------------------------------------------------
+    # Navegação
+    # ------------------------------------------------------------------
+    def scroll(self, delta):
+        if delta == "page":
+            delta = self.rows
+        elif delta == "-page":
+            delta = -self.rows
+        self.goto(self.top + delta)
+        return "break"
+
+    def goto(self, line):
+        # Não deixa passar da última linha (o índice só avança até ela)
+        last = self.index.known_lines() - 1
+        if line > last:
+            self.index.offset(line)  # lê mais do arquivo, se houver
+            last = self.index.known_lines() - 1
+        self.top = max(0, min(line, last))
+        self.render()
+
+    def goto_end(self):
+        # Aqui sim o arquivo precisa ser percorrido até o fim
+        self.goto(self.index.line_count() - self.rows)
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            offset = int(float(value) * self.index.size)
+            self.goto(self.index.line_at(min(max(offset, 0), max(self.index.size - 1, 0))))
+        elif action == "scroll":
+            step = self.rows if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def on_resize(self, event):
+        rows = max(1, event.height // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+    # ------------------------------------------------------------------
+    # Desenho
+    # ------------------------------------------------------------------
+    def render(self):
+        """Troca o conteúdo do Text pelas linhas visíveis agora."""
+        bottom = self.top + self.rows
+        content = self.index.lines(self.top, bottom)
+
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", content)
+        self.text.configure(state="disabled")
+
+        size = self.index.size or 1
+        start = self.index.offset(self.top)
+        end = self.index.offset(bottom)
+        self.scrollbar.set(start / size, end / size)
+
+        last = min(bottom, self.index.known_lines())
+        total = str(self.index.known_lines()) if self.index.complete else "?"
+        percent = int(100 * end / size)
+        self.status.configure(
+            text=f" linhas {self.top + 1}-{last} de {total}  ({percent}%)   q: fechar"
+        )
+
+    def close(self):
+        self.window.destroy()
+        self.index.close()
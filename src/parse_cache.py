@@ -0,0 +1,90 @@
+"""
+Cache de análise (lexer + parser) para linhas de comando repetidas.
+
+O mesmo 'ls -la' ou 'git status', digitado de novo ou repetido pelas setas
+do histórico, não precisa passar outra vez pelo PLY: a AST fica guardada
+em um LRU, indexada pelo texto normalizado da linha.
+
+As ASTs guardadas são congeladas (dicts viram MappingProxyType e listas
+viram tuplas), porque a mesma instância é devolvida a cada acerto e nenhum
+handler do Executor pode alterá-la.
+"""
+from types import MappingProxyType
+
+from lru import LRUCache
+
+DEFAULT_MAXSIZE = 1024
+
+_MISS = object()
+
+
+def normalize_line(text):
+    """
+    Remove espaços nas pontas e junta espaços repetidos fora de aspas,
+    já que o lexer os ignora: 'ls   -la' e 'ls -la' geram a mesma AST.
+    """
+    out = []
+    in_string = False
+    previous_space = False
+    for ch in text.strip():
+        if ch == '"':
+            in_string = not in_string
+        if not in_string and ch in ' \t':
+            if not previous_space:
+                out.append(' ')
+            previous_space = True
+            continue
+        previous_space = False
+        out.append(ch)
+    return "".join(out)
+
+
+def freeze(node):
+    """Cópia imutável (recursiva) de uma AST."""
+    if isinstance(node, dict):
+        return MappingProxyType({k: freeze(v) for k, v in node.items()})
+    if isinstance(node, list):
+        return tuple(freeze(v) for v in node)
+    return node
+
+
+class ParseCache:
+    def __init__(self, parser, lexer, maxsize=DEFAULT_MAXSIZE):
+        self.parser = parser
+        self.lexer = lexer
+        self.cache = LRUCache(maxsize)
+
+    def parse(self, text):
+        """
+        Devolve a AST (congelada) da linha, ou None para linha vazia / com erro.
+        Linhas com erro léxico ou sintático não são guardadas, para que a
+        mensagem de erro apareça de novo a cada tentativa.
+        """
+        key = normalize_line(text)
+        if not key:
+            return None
+
+        ast_node = self.cache.get(key, _MISS)
+        if ast_node is not _MISS:
+            return ast_node
+
+        self.lexer.lineno = 1
+        self.lexer.houve_erro = False
+        ast_node = self.parser.parse(key + "\n", lexer=self.lexer)
+        if ast_node is None or self.lexer.houve_erro:
+            return ast_node
+
+        ast_node = freeze(ast_node)
+        self.cache.put(key, ast_node)
+        return ast_node
+
+    @property
+    def hits(self):
+        return self.cache.hits
+
+    @property
+    def misses(self):
+        return self.cache.misses
+
+    def hit_rate(self):
+        return self.cache.hit_rate()
@@ -0,0 +1,122 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'inputAMP AND_IF APPEND CD CLEAR CP DU ECHO EXIT FG FIND FLAG GLOB GREP GT HELP HISTORY IA IA_CACHE ID JOBS KILL LS LT MKDIR MV NEWLINE OR_IF PIPE PWD RM RMDIR SEMI SHOW STATS STRING TIME TOUCH WAIT WATCHinput : lines\n             | lines cmdlist\n             | cmdlistlines : line\n             | lines lineline : cmdlist NEWLINE\n            | NEWLINEcmdlist : andor\n               | seq\n               | seq andorseq : stmt\n           | seq stmtstmt : andor SEMIstmt : andor AMPandor : job\n             | andor AND_IF job\n             | andor OR_IF jobjob : TIME pipeline\n           | TIME FLAG pipelinejob : WATCH pipeline\n           | WATCH FLAG ID pipelinejob : pipelinepipeline : stagesstages : stage\n              | stages PIPE stagestage : command\n             | command redirsredirs : redir\n              | redirs redirredir : GT arg\n             | APPEND arg\n             | LT argcommand : builtin\n               | ia_modecommand : ID\n               | ID wordseqbuiltin : HELPbuiltin : EXITbuiltin : ECHO argseqbuiltin : HISTORY\n               | HISTORY wordseqbuiltin : JOBSbuiltin : FG\n               | FG IDbuiltin : KILL wordseqbuiltin : WAIT\n               | WAIT wordseqbuiltin : STATS\n               | STATS commandbuiltin : PWDbuiltin : LS\n               | LS wordseqbuiltin : DU\n               | DU wordseqbuiltin : SHOW\n               | SHOW wordseqbuiltin : GREP\n               | GREP wordseqbuiltin : FIND\n               | FIND wordseqbuiltin : CD\n               | CD pathbuiltin : MKDIR\n               | MKDIR wordseqbuiltin : RMDIR\n               | RMDIR pathbuiltin : RM\n               | RM wordseqbuiltin : CP\n               | CP wordseq\n               | MV\n               | MV wordseqbuiltin : TOUCH\n               | TOUCH pathbuiltin : IA_CACHE\n               | IA_CACHE ID\n               | IA_CACHE STATSbuiltin : CLEARia_mode : IAargseq : arg\n              | argseq argwordseq : word\n               | wordseq wordword : FLAG\n            | STRING\n            | ID\n            | GLOBarg : STRING\n           | ID\n           | GLOBpath : ID\n            | GLOB'
+    
+_lr_action_items = {'NEWLINE':([0,2,3,4,5,6,7,8,9,11,13,14,15,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,49,50,51,52,53,55,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,100,101,102,103,104,105,106,],[7,7,46,-4,-8,-9,-7,-15,-11,-22,-35,-23,-24,-26,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,46,-5,-6,-13,-14,-10,-12,-18,-20,-86,-36,-82,-84,-85,-87,-27,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-16,-17,-19,-83,-25,-29,-30,-31,-32,-81,-21,]),'TIME':([0,2,4,6,7,9,45,46,47,48,49,50,52,],[10,10,-4,10,-7,-11,-5,-6,10,10,-13,-14,-12,]),'WATCH':([0,2,4,6,7,9,45,46,47,48,49,50,52,],[12,12,-4,12,-7,-11,-5,-6,12,12,-13,-14,-12,]),'ID':([0,2,4,6,7,9,10,12,13,21,22,24,25,26,27,29,30,31,32,33,34,35,36,37,38,39,40,41,45,46,47,48,49,50,52,54,56,57,58,59,60,61,62,63,66,67,68,69,70,71,72,73,74,76,77,79,80,81,82,83,87,89,90,91,98,99,105,],[13,13,-4,13,-7,-11,13,13,57,72,57,75,57,57,13,57,57,57,57,57,85,57,85,57,57,57,85,93,-5,-6,13,13,-13,-14,-12,13,98,-86,57,-82,-84,-85,-87,13,72,72,72,72,-80,-88,-89,-90,57,57,57,57,57,57,57,57,57,57,57,57,13,-83,-81,]),'HELP':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[19,19,-4,19,-7,-11,19,19,19,-5,-6,19,19,-13,-14,-12,19,19,19,]),'EXIT':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[20,20,-4,20,-7,-11,20,20,20,-5,-6,20,20,-13,-14,-12,20,20,20,]),'ECHO':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[21,21,-4,21,-7,-11,21,21,21,-5,-6,21,21,-13,-14,-12,21,21,21,]),'HISTORY':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[22,22,-4,22,-7,-11,22,22,22,-5,-6,22,22,-13,-14,-12,22,22,22,]),'JOBS':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[23,23,-4,23,-7,-11,23,23,23,-5,-6,23,23,-13,-14,-12,23,23,23,]),'FG':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[24,24,-4,24,-7,-11,24,24,24,-5,-6,24,24,-13,-14,-12,24,24,24,]),'KILL':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[25,25,-4,25,-7,-11,25,25,25,-5,-6,25,25,-13,-14,-12,25,25,25,]),'WAIT':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[26,26,-4,26,-7,-11,26,26,26,-5,-6,26,26,-13,-14,-12,26,26,26,]),'STATS':([0,2,4,6,7,9,10,12,27,41,45,46,47,48,49,50,52,54,63,98,],[27,27,-4,27,-7,-11,27,27,27,94,-5,-6,27,27,-13,-14,-12,27,27,27,]),'PWD':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[28,28,-4,28,-7,-11,28,28,28,-5,-6,28,28,-13,-14,-12,28,28,28,]),'LS':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[29,29,-4,29,-7,-11,29,29,29,-5,-6,29,29,-13,-14,-12,29,29,29,]),'DU':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[30,30,-4,30,-7,-11,30,30,30,-5,-6,30,30,-13,-14,-12,30,30,30,]),'SHOW':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[31,31,-4,31,-7,-11,31,31,31,-5,-6,31,31,-13,-14,-12,31,31,31,]),'GREP':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[32,32,-4,32,-7,-11,32,32,32,-5,-6,32,32,-13,-14,-12,32,32,32,]),'FIND':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[33,33,-4,33,-7,-11,33,33,33,-5,-6,33,33,-13,-14,-12,33,33,33,]),'CD':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[34,34,-4,34,-7,-11,34,34,34,-5,-6,34,34,-13,-14,-12,34,34,34,]),'MKDIR':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[35,35,-4,35,-7,-11,35,35,35,-5,-6,35,35,-13,-14,-12,35,35,35,]),'RMDIR':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[36,36,-4,36,-7,-11,36,36,36,-5,-6,36,36,-13,-14,-12,36,36,36,]),'RM':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[37,37,-4,37,-7,-11,37,37,37,-5,-6,37,37,-13,-14,-12,37,37,37,]),'CP':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[38,38,-4,38,-7,-11,38,38,38,-5,-6,38,38,-13,-14,-12,38,38,38,]),'MV':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[39,39,-4,39,-7,-11,39,39,39,-5,-6,39,39,-13,-14,-12,39,39,39,]),'TOUCH':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[40,40,-4,40,-7,-11,40,40,40,-5,-6,40,40,-13,-14,-12,40,40,40,]),'IA_CACHE':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[41,41,-4,41,-7,-11,41,41,41,-5,-6,41,41,-13,-14,-12,41,41,41,]),'CLEAR':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[42,42,-4,42,-7,-11,42,42,42,-5,-6,42,42,-13,-14,-12,42,42,42,]),'IA':([0,2,4,6,7,9,10,12,27,45,46,47,48,49,50,52,54,63,98,],[43,43,-4,43,-7,-11,43,43,43,-5,-6,43,43,-13,-14,-12,43,43,43,]),'$end':([1,2,3,4,5,6,7,8,9,11,13,14,15,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,49,50,51,52,53,55,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,100,101,102,103,104,105,106,],[0,-1,-3,-4,-8,-9,-7,-15,-11,-22,-35,-23,-24,-26,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,-2,-5,-6,-13,-14,-10,-12,-18,-20,-86,-36,-82,-84,-85,-87,-27,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-16,-17,-19,-83,-25,-29,-30,-31,-32,-81,-21,]),'AND_IF':([5,8,11,13,14,15,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,51,53,55,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,100,101,102,103,104,105,106,],[47,-15,-22,-35,-23,-24,-26,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,47,-18,-20,-86,-36,-82,-84,-85,-87,-27,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-16,-17,-19,-83,-25,-29,-30,-31,-32,-81,-21,]),'OR_IF':([5,8,11,13,14,15,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,51,53,55,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,100,101,102,103,104,105,106,],[48,-15,-22,-35,-23,-24,-26,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,48,-18,-20,-86,-36,-82,-84,-85,-87,-27,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-16,-17,-19,-83,-25,-29,-30,-31,-32,-81,-21,]),'SEMI':([5,8,11,13,14,15,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,51,53,55,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,100,101,102,103,104,105,106,],[49,-15,-22,-35,-23,-24,-26,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,49,-18,-20,-86,-36,-82,-84,-85,-87,-27,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-16,-17,-19,-83,-25,-29,-30,-31,-32,-81,-21,]),'AMP':([5,8,11,13,14,15,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,51,53,55,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,100,101,102,103,104,105,106,],[50,-15,-22,-35,-23,-24,-26,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,50,-18,-20,-86,-36,-82,-84,-85,-87,-27,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-16,-17,-19,-83,-25,-29,-30,-31,-32,-81,-21,]),'FLAG':([10,12,13,22,25,26,29,30,31,32,33,35,37,38,39,57,58,59,60,61,62,74,76,77,79,80,81,82,83,87,89,90,91,99,],[54,56,60,60,60,60,60,60,60,60,60,60,60,60,60,-86,60,-82,-84,-85,-87,60,60,60,60,60,60,60,60,60,60,60,60,-83,]),'GT':([13,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,99,101,102,103,104,105,],[-35,66,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,-86,-36,-82,-84,-85,-87,66,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-83,-29,-30,-31,-32,-81,]),'APPEND':([13,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,99,101,102,103,104,105,],[-35,67,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,-86,-36,-82,-84,-85,-87,67,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-83,-29,-30,-31,-32,-81,]),'LT':([13,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,99,101,102,103,104,105,],[-35,68,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,-86,-36,-82,-84,-85,-87,68,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-83,-29,-30,-31,-32,-81,]),'PIPE':([13,14,15,16,17,18,19,20,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,57,58,59,60,61,62,64,65,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,99,100,101,102,103,104,105,],[-35,63,-24,-26,-33,-34,-37,-38,-40,-42,-43,-46,-48,-50,-51,-53,-55,-57,-59,-61,-63,-65,-67,-69,-71,-73,-75,-78,-79,-86,-36,-82,-84,-85,-87,-27,-28,-39,-80,-88,-89,-90,-41,-44,-45,-47,-49,-52,-54,-56,-58,-60,-62,-91,-92,-64,-66,-68,-70,-72,-74,-76,-77,-83,-25,-29,-30,-31,-32,-81,]),'STRING':([13,21,22,25,26,29,30,31,32,33,35,37,38,39,57,58,59,60,61,62,66,67,68,69,70,71,72,73,74,76,77,79,80,81,82,83,87,89,90,91,99,105,],[61,71,61,61,61,61,61,61,61,61,61,61,61,61,-86,61,-82,-84,-85,-87,71,71,71,71,-80,-88,-89,-90,61,61,61,61,61,61,61,61,61,61,61,61,-83,-81,]),'GLOB':([13,21,22,25,26,29,30,31,32,33,34,35,36,37,38,39,40,57,58,59,60,61,62,66,67,68,69,70,71,72,73,74,76,77,79,80,81,82,83,87,89,90,91,99,105,],[62,73,62,62,62,62,62,62,62,62,86,62,86,62,62,62,86,-86,62,-82,-84,-85,-87,73,73,73,73,-80,-88,-89,-90,62,62,62,62,62,62,62,62,62,62,62,62,-83,-81,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'input':([0,],[1,]),'lines':([0,],[2,]),'cmdlist':([0,2,],[3,44,]),'line':([0,2,],[4,45,]),'andor':([0,2,6,],[5,5,51,]),'seq':([0,2,],[6,6,]),'job':([0,2,6,47,48,],[8,8,8,95,96,]),'stmt':([0,2,6,],[9,9,52,]),'pipeline':([0,2,6,10,12,47,48,54,98,],[11,11,11,53,55,11,11,97,106,]),'stages':([0,2,6,10,12,47,48,54,98,],[14,14,14,14,14,14,14,14,14,]),'stage':([0,2,6,10,12,47,48,54,63,98,],[15,15,15,15,15,15,15,15,100,15,]),'command':([0,2,6,10,12,27,47,48,54,63,98,],[16,16,16,16,16,78,16,16,16,16,16,]),'builtin':([0,2,6,10,12,27,47,48,54,63,98,],[17,17,17,17,17,17,17,17,17,17,17,]),'ia_mode':([0,2,6,10,12,27,47,48,54,63,98,],[18,18,18,18,18,18,18,18,18,18,18,]),'wordseq':([13,22,25,26,29,30,31,32,33,35,37,38,39,],[58,74,76,77,79,80,81,82,83,87,89,90,91,]),'word':([13,22,25,26,29,30,31,32,33,35,37,38,39,58,74,76,77,79,80,81,82,83,87,89,90,91,],[59,59,59,59,59,59,59,59,59,59,59,59,59,99,99,99,99,99,99,99,99,99,99,99,99,99,]),'redirs':([16,],[64,]),'redir':([16,64,],[65,101,]),'argseq':([21,],[69,]),'arg':([21,66,67,68,69,],[70,102,103,104,105,]),'path':([34,36,40,],[84,88,92,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> input","S'",1,None,None,None),
+  ('input -> lines','input',1,'p_input','grammar.py',17),
+  ('input -> lines cmdlist','input',2,'p_input','grammar.py',18),
+  ('input -> cmdlist','input',1,'p_input','grammar.py',19),
+  ('lines -> line','lines',1,'p_lines','grammar.py',36),
+  ('lines -> lines line','lines',2,'p_lines','grammar.py',37),
+  ('line -> cmdlist NEWLINE','line',2,'p_line','grammar.py',44),
+  ('line -> NEWLINE','line',1,'p_line','grammar.py',45),
+  ('cmdlist -> andor','cmdlist',1,'p_cmdlist','grammar.py',61),
+  ('cmdlist -> seq','cmdlist',1,'p_cmdlist','grammar.py',62),
+  ('cmdlist -> seq andor','cmdlist',2,'p_cmdlist','grammar.py',63),
+  ('seq -> stmt','seq',1,'p_seq','grammar.py',77),
+  ('seq -> seq stmt','seq',2,'p_seq','grammar.py',78),
+  ('stmt -> andor SEMI','stmt',2,'p_stmt','grammar.py',82),
+  ('stmt -> andor AMP','stmt',2,'p_stmt_background','grammar.py',86),
+  ('andor -> job','andor',1,'p_andor','grammar.py',111),
+  ('andor -> andor AND_IF job','andor',3,'p_andor','grammar.py',112),
+  ('andor -> andor OR_IF job','andor',3,'p_andor','grammar.py',113),
+  ('job -> TIME pipeline','job',2,'p_job_time','grammar.py',121),
+  ('job -> TIME FLAG pipeline','job',3,'p_job_time','grammar.py',122),
+  ('job -> WATCH pipeline','job',2,'p_job_watch','grammar.py',132),
+  ('job -> WATCH FLAG ID pipeline','job',4,'p_job_watch','grammar.py',133),
+  ('job -> pipeline','job',1,'p_job','grammar.py',156),
+  ('pipeline -> stages','pipeline',1,'p_pipeline','grammar.py',161),
+  ('stages -> stage','stages',1,'p_stages','grammar.py',171),
+  ('stages -> stages PIPE stage','stages',3,'p_stages','grammar.py',172),
+  ('stage -> command','stage',1,'p_stage','grammar.py',179),
+  ('stage -> command redirs','stage',2,'p_stage','grammar.py',180),
+  ('redirs -> redir','redirs',1,'p_redirs','grammar.py',185),
+  ('redirs -> redirs redir','redirs',2,'p_redirs','grammar.py',186),
+  ('redir -> GT arg','redir',2,'p_redir','grammar.py',193),
+  ('redir -> APPEND arg','redir',2,'p_redir','grammar.py',194),
+  ('redir -> LT arg','redir',2,'p_redir','grammar.py',195),
+  ('command -> builtin','command',1,'p_command','grammar.py',199),
+  ('command -> ia_mode','command',1,'p_command','grammar.py',200),
+  ('command -> ID','command',1,'p_command_generic','grammar.py',205),
+  ('command -> ID wordseq','command',2,'p_command_generic','grammar.py',206),
+  ('builtin -> HELP','builtin',1,'p_builtin_help','grammar.py',220),
+  ('builtin -> EXIT','builtin',1,'p_builtin_exit','grammar.py',224),
+  ('builtin -> ECHO argseq','builtin',2,'p_builtin_echo','grammar.py',228),
+  ('builtin -> HISTORY','builtin',1,'p_builtin_history','grammar.py',232),
+  ('builtin -> HISTORY wordseq','builtin',2,'p_builtin_history','grammar.py',233),
+  ('builtin -> JOBS','builtin',1,'p_builtin_jobs','grammar.py',238),
+  ('builtin -> FG','builtin',1,'p_builtin_fg','grammar.py',242),
+  ('builtin -> FG ID','builtin',2,'p_builtin_fg','grammar.py',243),
+  ('builtin -> KILL wordseq','builtin',2,'p_builtin_kill','grammar.py',248),
+  ('builtin -> WAIT','builtin',1,'p_builtin_wait','grammar.py',254),
+  ('builtin -> WAIT wordseq','builtin',2,'p_builtin_wait','grammar.py',255),
+  ('builtin -> STATS','builtin',1,'p_builtin_stats','grammar.py',260),
+  ('builtin -> STATS command','builtin',2,'p_builtin_stats','grammar.py',261),
+  ('builtin -> PWD','builtin',1,'p_builtin_pwd','grammar.py',267),
+  ('builtin -> LS','builtin',1,'p_builtin_ls_variants','grammar.py',295),
+  ('builtin -> LS wordseq','builtin',2,'p_builtin_ls_variants','grammar.py',296),
+  ('builtin -> DU','builtin',1,'p_builtin_du','grammar.py',306),
+  ('builtin -> DU wordseq','builtin',2,'p_builtin_du','grammar.py',307),
+  ('builtin -> SHOW','builtin',1,'p_builtin_show','grammar.py',317),
+  ('builtin -> SHOW wordseq','builtin',2,'p_builtin_show','grammar.py',318),
+  ('builtin -> GREP','builtin',1,'p_builtin_grep','grammar.py',329),
+  ('builtin -> GREP wordseq','builtin',2,'p_builtin_grep','grammar.py',330),
+  ('builtin -> FIND','builtin',1,'p_builtin_find','grammar.py',338),
+  ('builtin -> FIND wordseq','builtin',2,'p_builtin_find','grammar.py',339),
+  ('builtin -> CD','builtin',1,'p_builtin_cd','grammar.py',346),
+  ('builtin -> CD path','builtin',2,'p_builtin_cd','grammar.py',347),
+  ('builtin -> MKDIR','builtin',1,'p_builtin_mkdir','grammar.py',354),
+  ('builtin -> MKDIR wordseq','builtin',2,'p_builtin_mkdir','grammar.py',355),
+  ('builtin -> RMDIR','builtin',1,'p_builtin_rmdir','grammar.py',362),
+  ('builtin -> RMDIR path','builtin',2,'p_builtin_rmdir','grammar.py',363),
+  ('builtin -> RM','builtin',1,'p_bultin_rm','grammar.py',370),
+  ('builtin -> RM wordseq','builtin',2,'p_bultin_rm','grammar.py',371),
+  ('builtin -> CP','builtin',1,'p_builtin_cp_mv','grammar.py',378),
+  ('builtin -> CP wordseq','builtin',2,'p_builtin_cp_mv','grammar.py',379),
+  ('builtin -> MV','builtin',1,'p_builtin_cp_mv','grammar.py',380),
+  ('builtin -> MV wordseq','builtin',2,'p_builtin_cp_mv','grammar.py',381),
+  ('builtin -> TOUCH','builtin',1,'p_builtin_touch','grammar.py',388),
+  ('builtin -> TOUCH path','builtin',2,'p_builtin_touch','grammar.py',389),
+  ('builtin -> IA_CACHE','builtin',1,'p_builtin_ia_cache','grammar.py',396),
+  ('builtin -> IA_CACHE ID','builtin',2,'p_builtin_ia_cache','grammar.py',397),
+  ('builtin -> IA_CACHE STATS','builtin',2,'p_builtin_ia_cache','grammar.py',398),
+  ('builtin -> CLEAR','builtin',1,'p_builtin_clear','grammar.py',404),
+  ('ia_mode -> IA','ia_mode',1,'p_ia_mode','grammar.py',410),
+  ('argseq -> arg','argseq',1,'p_argseq','grammar.py',416),
+  ('argseq -> argseq arg','argseq',2,'p_argseq','grammar.py',417),
+  ('wordseq -> word','wordseq',1,'p_wordseq','grammar.py',424),
+  ('wordseq -> wordseq word','wordseq',2,'p_wordseq','grammar.py',425),
+  ('word -> FLAG','word',1,'p_word','grammar.py',432),
+  ('word -> STRING','word',1,'p_word','grammar.py',433),
+  ('word -> ID','word',1,'p_word','grammar.py',434),
+  ('word -> GLOB','word',1,'p_word','grammar.py',435),
+  ('arg -> STRING','arg',1,'p_arg','grammar.py',439),
+  ('arg -> ID','arg',1,'p_arg','grammar.py',440),
+  ('arg -> GLOB','arg',1,'p_arg','grammar.py',441),
+  ('path -> ID','path',1,'p_path','grammar.py',445),
+  ('path -> GLOB','path',1,'p_path','grammar.py',446),
+]
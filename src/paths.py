@@ -0,0 +1,18 @@
+"""
+Local dos arquivos persistentes do TermIA (caches, histórico, sessões).
+
+Por padrão é ~/.termia; a variável de ambiente TERMIA_HOME troca o local.
+"""
+import os
+
+
+def data_dir():
+    """Retorna (criando se preciso) a pasta de dados do TermIA."""
+    path = os.getenv("TERMIA_HOME") or os.path.join(os.path.expanduser("~"), ".termia")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_file(name):
+    """Caminho de um arquivo dentro da pasta de dados."""
+    return os.path.join(data_dir(), name)
@@ -0,0 +1,270 @@
+"""
+Execução de pipelines (a | b | c) e redirecionamentos (<, >, >>).
+
+Cada estágio é de um de três tipos:
+  - externo: um processo. Entre dois estágios externos o stdout de um vira
+    o stdin do outro direto no sistema operacional (pipe do SO), sem passar
+    pelo Python.
+  - builtin gerador (ls, show, echo...): um gerador que produz a saída aos
+    poucos e recebe a saída do estágio anterior em 'entrada'.
+  - builtin comum (cd, mkdir...): roda na hora e não lê nem produz dados.
+
+Nada é acumulado inteiro na memória: quando um gerador alimenta um processo
+há uma thread escrevendo no stdin dele, e quando um processo alimenta um
+gerador o pipe é lido linha a linha. Produtor e consumidor rodam ao mesmo
+tempo, então 'show big.log | grep ERROR > out.txt' usa memória constante.
+"""
+import inspect
+import io
+import subprocess
+import threading
+
+from metrics import merge_usage
+from process_runner import ENCODING, ExternalProcess
+
+
+def redirects(redirs):
+    """(caminho do '<', caminho do '>'/'>>', se é '>>') a partir da lista da AST."""
+    stdin_path = stdout_path = None
+    append = False
+    for op, path in redirs:
+        if op == '<':
+            stdin_path = path
+        else:
+            stdout_path = path
+            append = op == '>>'
+    return stdin_path, stdout_path, append
+
+
+def _text_lines(binary):
+    """Itera as linhas de um pipe/arquivo binário já decodificadas."""
+    if not isinstance(binary, io.BufferedIOBase):
+        binary = io.BufferedReader(binary)
+    return io.TextIOWrapper(binary, encoding=ENCODING, errors='replace', newline='')
+
+
+def _write_all(stream, data):
+    """write() de um pipe sem buffer pode escrever só parte dos bytes."""
+    view = memoryview(data)
+    while view:
+        written = stream.write(view)
+        view = view[written:]
+
+
+class Pipeline:
+    """
+    Um pipeline em execução. Tem a mesma interface do ExternalProcess
+    (start/wait/cancel/on_exit), para a GUI tratar os dois do mesmo jeito.
+    """
+
+    def __init__(self, executor, stages, on_output=None):
+        self.executor = executor
+        self.stages = stages
+        # Para onde vai a saída do último estágio (a tela, ou o buffer de um job)
+        self.on_output = on_output or executor.emit
+        self.on_exit = None
+        self.returncode = None
+        self._procs = []
+        self._threads = []
+        self._files = []
+        self._last_proc = None
+        self._last_code = 0
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Montagem
+    # ------------------------------------------------------------------
+    def start(self):
+        """
+        Liga os estágios e dispara as threads. Erros ao abrir arquivos de
+        redirecionamento sobem para quem chamou (depois de desfazer o que já
+        tinha sido iniciado).
+        """
+        upstream = None  # None | gerador de texto | arquivo binário (pipe ou '<')
+        last = len(self.stages) - 1
+        try:
+            for i, stage in enumerate(self.stages):
+                stdin_path, stdout_path, append = redirects(stage['redirs'])
+                if stdin_path is not None:
+                    self._discard(upstream)
+                    upstream = self._open(stdin_path, 'rb')
+
+                node = stage['command']
+                handler = self.executor.builtin_handler(node)
+
+                if handler is None:
+                    upstream = self._start_external(node, upstream, stdout_path, append, i == last)
+                elif inspect.isgeneratorfunction(handler):
+                    entrada = _text_lines(upstream) if hasattr(upstream, 'fileno') else upstream
+                    upstream = handler(node, entrada=entrada)
+                    if stdout_path is not None:
+                        self._spawn(self._drain, upstream, self._open_output(stdout_path, append))
+                        upstream = None
+                else:
+                    self._discard(upstream)
+                    handler(node)
+                    if stdout_path is not None:
+                        self._open_output(stdout_path, append)
+                    upstream = None
+
+            if upstream is not None:
+                # Último estágio é um builtin gerador: sua saída vai para a tela.
+                self._spawn(self._drain, upstream, None)
+        except BaseException:
+            self._discard(upstream)
+            self.cancel()
+            self._close_files()
+            raise
+
+        threading.Thread(target=self._wait, daemon=True).start()
+        return self
+
+    def _open(self, path, mode):
+        f = open(path, mode)
+        self._files.append(f)
+        return f
+
+    def _open_output(self, path, append):
+        return self._open(path, ('a' if append else 'w') + 'b')
+
+    def _discard(self, upstream):
+        """Descarta a saída de um estágio que ninguém vai ler."""
+        if upstream is not None:
+            upstream.close()  # pipe/arquivo ou gerador
+
+    def _start_external(self, node, upstream, stdout_path, append, is_last):
+        if upstream is None:
+            stdin = None
+        elif hasattr(upstream, 'fileno'):
+            stdin = upstream
+        else:
+            stdin = subprocess.PIPE
+
+        if stdout_path is not None:
+            stdout = self._open_output(stdout_path, append)
+        elif is_last:
+            stdout = None  # lido pelo ExternalProcess e mandado para a tela
+        else:
+            stdout = subprocess.PIPE
+
+        proc = ExternalProcess(self.executor.argv(node), on_output=self.on_output,
+                               stdin=stdin, stdout=stdout)
+        try:
+            proc.start()
+        except FileNotFoundError:
+            self.on_output(f"TermIA: comando não encontrado: {node['type']}\n", 'stderr')
+            self._discard(upstream)
+            self._last_code = 127
+            return None
+        self._procs.append(proc)
+        if is_last:
+            self._last_proc = proc
+
+        if stdin is subprocess.PIPE:
+            self._spawn(self._feed, upstream, proc.proc.stdin)
+        elif stdin is not None:
+            # O filho já tem sua cópia do pipe; fechar a nossa garante que ele
+            # receba EOF (e que o anterior receba SIGPIPE se este sair antes).
+            upstream.close()
+
+        return proc.proc.stdout if stdout is subprocess.PIPE else None
+
+    # ------------------------------------------------------------------
+    # Threads de transporte
+    # ------------------------------------------------------------------
+    def _spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _feed(self, generator, pipe):
+        """Gerador -> stdin de um processo."""
+        try:
+            for chunk in generator:
+                if self._cancel.is_set():
+                    break
+                _write_all(pipe, chunk.encode(ENCODING, errors='replace'))
+        except (BrokenPipeError, OSError):
+            pass  # o processo saiu antes de ler tudo (ex: head)
+        finally:
+            generator.close()
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def _drain(self, generator, output):
+        """Gerador -> arquivo de redirecionamento (output) ou tela (None)."""
+        errors_before = self.executor.stderr_writes
+        try:
+            while not self._cancel.is_set():
+                try:
+                    chunk = next(generator)
+                except StopIteration as stop:
+                    # Um builtin pode devolver o próprio status (return 1);
+                    # sem isso, como no Executor.execute: 1 se ele reclamou
+                    # no stderr
+                    if isinstance(stop.value, int):
+                        self._last_code = stop.value
+                    elif self.executor.stderr_writes != errors_before:
+                        self._last_code = 1
+                    break
+                if output is None:
+                    self.on_output(chunk, 'stdout')
+                else:
+                    output.write(chunk.encode(ENCODING, errors='replace'))
+        except Exception as e:
+            self.on_output(f"TermIA: erro no pipeline: {e}\n", 'stderr')
+            self._last_code = 1
+        finally:
+            generator.close()
+
+    # ------------------------------------------------------------------
+    # Término
+    # ------------------------------------------------------------------
+    def _wait(self):
+        for proc in self._procs:
+            proc.wait()
+        for thread in self._threads:
+            thread.join()
+        self._close_files()
+
+        # Como no bash: o status do pipeline é o do último estágio.
+        self.returncode = self._last_proc.returncode if self._last_proc else self._last_code
+        self._done.set()
+        if self.on_exit:
+            self.on_exit(self.returncode)
+
+    def _close_files(self):
+        for f in self._files:
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def pids(self):
+        return [proc.proc.pid for proc in self._procs]
+
+    @property
+    def rusage(self):
+        """Uso de recursos somado de todos os processos do pipeline."""
+        return merge_usage(proc.rusage for proc in self._procs)
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.returncode
+
+    def running(self):
+        return not self._done.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        for proc in self._procs:
+            proc.cancel()
+
+    def kill(self, sig=None):
+        """Envia um sinal (padrão: SIGTERM) a todos os processos do pipeline."""
+        self._cancel.set()
+        for proc in self._procs:
+            proc.kill(sig)
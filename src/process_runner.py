@@ -0,0 +1,165 @@
+"""
+Execução de programas externos fora da thread da interface.
+
+O processo filho é criado com stdout/stderr ligados a pipes e cada pipe é
+lido por uma thread própria, em blocos, à medida que os dados chegam.
+Cada bloco já decodificado é entregue ao callback 'on_output(texto, tag)',
+que decide para onde o texto vai (fila da GUI ou o terminal real).
+"""
+import codecs
+import locale
+import os
+import signal
+import subprocess
+import threading
+
+from metrics import child_usage, exit_code
+
+# Tamanho máximo de cada leitura do pipe. Com bufsize=0 o read() devolve
+# o que já estiver disponível (até este limite), sem esperar encher o bloco.
+CHUNK_SIZE = 64 * 1024
+
+ENCODING = locale.getpreferredencoding(False) or 'utf-8'
+
+
+class ExternalProcess:
+    """
+    Um processo externo com a saída lida de forma incremental.
+
+    - on_output(texto, tag): chamado pelas threads leitoras, com tag
+      'stdout' ou 'stderr'.
+    - on_exit(codigo): chamado uma única vez, depois que o processo terminou
+      E toda a saída já foi entregue.
+    - stdin / stdout: opcionais, repassados ao Popen (pipe de outro processo,
+      arquivo aberto, subprocess.PIPE). Se stdout for dado, ele não é lido
+      aqui: quem criou o processo cuida dele (ex: o próximo estágio de um
+      pipeline). O stderr é sempre lido e entregue com a tag 'stderr'.
+    """
+
+    def __init__(self, cmd_list, on_output, on_exit=None, stdin=None, stdout=None):
+        self.cmd_list = cmd_list
+        self.on_output = on_output
+        self.on_exit = on_exit
+        self.stdin = subprocess.DEVNULL if stdin is None else stdin
+        self.stdout = stdout
+        self.proc = None
+        self.returncode = None
+        self.rusage = None  # uso de recursos do filho (ver metrics.child_usage)
+        self._readers = []
+        self._done = threading.Event()
+
+    def start(self):
+        """
+        Cria o processo filho e dispara as threads leitoras.
+        Erros de criação (FileNotFoundError, PermissionError) sobem para
+        quem chamou, exatamente como acontecia com subprocess.run.
+        """
+        kwargs = {}
+        if os.name == 'nt':
+            # Grupo próprio para podermos mandar CTRL_BREAK só para o filho.
+            kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # Sessão própria: o Ctrl-C chega ao grupo inteiro (ex: make -> gcc).
+            kwargs['start_new_session'] = True
+
+        self.proc = subprocess.Popen(
+            self.cmd_list,
+            stdin=self.stdin,
+            stdout=subprocess.PIPE if self.stdout is None else self.stdout,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            **kwargs
+        )
+
+        streams = [(self.proc.stderr, 'stderr')]
+        if self.stdout is None:
+            streams.append((self.proc.stdout, 'stdout'))
+        for stream, tag in streams:
+            reader = threading.Thread(target=self._pump, args=(stream, tag), daemon=True)
+            reader.start()
+            self._readers.append(reader)
+
+        threading.Thread(target=self._wait, daemon=True).start()
+        return self
+
+    def _pump(self, stream, tag):
+        """Lê um pipe até o EOF, repassando cada bloco decodificado."""
+        # O decoder incremental evita quebrar um caractere UTF-8 dividido
+        # entre dois blocos.
+        decoder = codecs.getincrementaldecoder(ENCODING)(errors='replace')
+        try:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                if text:
+                    self.on_output(text, tag)
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                self.on_output(tail, tag)
+        finally:
+            stream.close()
+
+    def _wait(self):
+        code = self._reap()
+        # Só avisamos o fim depois de entregar toda a saída pendente.
+        for reader in self._readers:
+            reader.join()
+        self.returncode = code
+        self._done.set()
+        if self.on_exit:
+            self.on_exit(code)
+
+    def _reap(self):
+        """
+        Espera o filho. No Unix usa wait4, que devolve junto o rusage dele
+        (CPU, pico de memória, blocos de E/S) para o 'time' e o 'stats'.
+        """
+        if not hasattr(os, 'wait4'):
+            return self.proc.wait()
+        try:
+            _, status, usage = os.wait4(self.proc.pid, 0)
+        except ChildProcessError:
+            # Já foi recolhido por um poll() do Popen (ex: no cancel)
+            return self.proc.wait()
+        self.rusage = child_usage(usage)
+        # O Popen precisa saber que o filho já foi recolhido
+        self.proc.returncode = exit_code(status)
+        return self.proc.returncode
+
+    def wait(self, timeout=None):
+        """Bloqueia até o processo terminar. Retorna o código de saída."""
+        self._done.wait(timeout)
+        return self.returncode
+
+    def pids(self):
+        return [self.proc.pid] if self.proc is not None else []
+
+    def running(self):
+        return self.proc is not None and not self._done.is_set()
+
+    def cancel(self):
+        """Envia o equivalente a um Ctrl-C para o processo (e seus filhos)."""
+        if self.proc is None or self.proc.poll() is not None:
+            return
+        try:
+            if os.name == 'nt':
+                self.proc.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(self.proc.pid, signal.SIGINT)
+        except OSError:
+            # O processo terminou entre o poll() e o envio do sinal.
+            pass
+
+    def kill(self, sig=None):
+        """Envia um sinal (padrão: SIGTERM) para o processo e seus filhos."""
+        if self.proc is None or self.proc.poll() is not None:
+            return
+        try:
+            if os.name == 'nt':
+                self.proc.terminate() # No Windows não há sinais: encerra direto
+            else:
+                os.killpg(self.proc.pid, signal.SIGTERM if sig is None else sig)
+        except OSError:
+            pass
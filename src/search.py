@@ -0,0 +1,361 @@
+"""
+Busca em árvores de arquivos para os builtins 'find' e 'grep'.
+
+O percurso usa os.scandir (listing.walk_parallel). No grep, cada arquivo é
+lido por mmap, decodificado como UTF-8 e varrido por uma expressão regular
+já compilada. A regex é de texto (str), não de bytes: assim -i, '.' e '\w'
+valem para 'ç' e 'ã' como em 'show arq | grep', e o resultado não depende
+de onde a entrada veio. Casar regex é trabalho de CPU, então a varredura
+vai para um pool de processos (o GIL não deixaria threads rodarem em
+paralelo):
+  - arquivos pequenos são agrupados em lotes (menos viagens entre processos);
+  - arquivos grandes são divididos em pedaços, cortados em fim de linha,
+    que rodam em processos diferentes ao mesmo tempo.
+
+Os resultados são consumidos na ordem em que as tarefas foram criadas, então
+a saída sai na ordem do percurso, igual em toda execução, e vai aparecendo
+enquanto a busca continua. Um limite de tarefas em voo impede o percurso de
+correr muito à frente de quem mostra os resultados.
+"""
+import fnmatch
+import functools
+import itertools
+import mmap
+import multiprocessing
+import os
+import re
+import stat
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from listing import walk_parallel
+
+# Processos do pool de busca
+WORKERS = os.cpu_count() or 1
+
+# Tarefas enviadas e ainda não mostradas (por processo)
+INFLIGHT_PER_WORKER = 4
+
+# Arquivos pequenos vão juntos numa tarefa até somar isto
+BATCH_BYTES = 4 * 1024 * 1024
+BATCH_FILES = 256
+
+# Arquivos maiores que isto são divididos em pedaços deste tamanho
+SPLIT_BYTES = 64 * 1024 * 1024
+
+# Abaixo disto (total de bytes e de arquivos da busca, com ou sem -r) não
+# compensa usar o pool: iniciar os processos custa mais que a busca
+INLINE_BYTES = 8 * 1024 * 1024
+INLINE_FILES = 2048
+
+# Quantos bytes do começo do arquivo são olhados para decidir se é binário
+BINARY_SAMPLE = 8192
+
+_pool = None
+
+
+def _get_pool():
+    """
+    O pool é criado no primeiro grep que precisa dele e reaproveitado
+    depois (criar processos custa bem mais que uma busca pequena).
+    forkserver/spawn em vez de fork: a GUI tem várias threads, e um fork
+    copiaria locks no meio do uso.
+    """
+    global _pool
+    if _pool is None:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=context)
+    return _pool
+
+
+@functools.lru_cache(maxsize=32)
+def compile_pattern(pattern, ignore_case):
+    """Regex de texto (compilada uma vez por processo para cada padrão)."""
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(pattern, flags)
+
+
+# ----------------------------------------------------------------------
+# Trabalho dos processos
+# ----------------------------------------------------------------------
+def scan_segment(text, regex, limit, numbers):
+    """
+    Linhas de 'text' (um trecho já decodificado) que casam com regex (no
+    máximo 'limit'). Devolve ([(número da linha dentro do trecho, linha)],
+    quebras de linha no trecho). As quebras só são contadas com numbers
+    (opção -n).
+    """
+    matches = []
+    pos = counted = 0
+    end = len(text)
+    newlines = 0
+    while len(matches) < limit:
+        m = regex.search(text, pos)
+        if m is None:
+            break
+        line_start = text.rfind('\n', 0, m.start()) + 1
+        line_end = text.find('\n', m.end())
+        if line_end < 0:
+            line_end = end
+        if numbers:
+            newlines += text.count('\n', counted, line_start)
+            counted = line_start
+        matches.append((newlines + 1, text[line_start:line_end].rstrip('\r')))
+        pos = line_end + 1
+        if pos > end:
+            break
+    if numbers:
+        newlines += text.count('\n', counted, end)
+    return matches, newlines
+
+
+def search_task(segments, pattern, ignore_case, limit, numbers):
+    """
+    Uma tarefa do pool: uma lista de (caminho, início, fim). fim=None é o
+    arquivo inteiro. Devolve, para cada trecho, (caminho, início, linhas
+    encontradas, quebras de linha, binário, erro).
+    """
+    regex = compile_pattern(pattern, ignore_case)
+    results = []
+    for path, start, end in segments:
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    results.append((path, start, [], 0, False, None))
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end_ = size if end is None else min(end, size)
+                    # Decide pelo começo do arquivo (vale para todos os pedaços)
+                    binary = b'\0' in mm[:BINARY_SAMPLE]
+                    # Os pedaços são cortados depois de um '\n', nunca no
+                    # meio de um caractere de vários bytes
+                    text = mm[start:end_].decode('utf-8', errors='replace')
+                    matches, newlines = scan_segment(text, regex, 1 if binary else limit, numbers)
+                    results.append((path, start, matches, newlines, binary, None))
+        except (OSError, ValueError) as e:
+            results.append((path, start, [], 0, False, e.strerror if isinstance(e, OSError) else str(e)))
+    return results
+
+
+def split_file(path, size):
+    """Pedaços (início, fim) de um arquivo grande, cortados logo depois de um '\\n'."""
+    if size <= SPLIT_BYTES:
+        return [(0, None)]
+    pieces = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            cut = start + SPLIT_BYTES
+            if cut >= size:
+                pieces.append((start, size))
+                break
+            newline = mm.find(b'\n', cut)
+            end = size if newline < 0 else newline + 1
+            pieces.append((start, end))
+            start = end
+    return pieces
+
+
+# ----------------------------------------------------------------------
+# Lado do TermIA: percurso, envio das tarefas e montagem da saída
+# ----------------------------------------------------------------------
+def iter_files(paths, recursive, on_error):
+    """(caminho, tamanho) dos arquivos a buscar, na ordem do percurso."""
+    for path in paths:
+        if os.path.isdir(path):
+            if not recursive:
+                on_error(path, "é um diretório (use grep -r)")
+                continue
+            # Como o ripgrep, arquivos e pastas ocultos (.git...) ficam de fora
+            for _, entries in walk_parallel(path, show_all=False, need_stat=True,
+                                            on_error=lambda p, e: on_error(p, e.strerror)):
+                for entry in entries:
+                    # Só arquivos comuns: abrir um FIFO travaria a busca
+                    if not entry.is_link and stat.S_ISREG(entry.stat.st_mode):
+                        yield entry.path, entry.stat.st_size
+        else:
+            try:
+                yield path, os.path.getsize(path)
+            except OSError as e:
+                on_error(path, e.strerror)
+
+
+def plan_tasks(files):
+    """Agrupa arquivos pequenos em lotes e divide os grandes em pedaços."""
+    batch, batch_bytes = [], 0
+    for path, size in files:
+        if size > SPLIT_BYTES:
+            if batch:
+                yield batch
+                batch, batch_bytes = [], 0
+            try:
+                pieces = split_file(path, size)
+            except (OSError, ValueError):
+                pieces = [(0, None)]  # o erro aparece na hora de buscar
+            for start, end in pieces:
+                yield [(path, start, end)]
+            continue
+        batch.append((path, 0, None))
+        batch_bytes += size
+        if batch_bytes >= BATCH_BYTES or len(batch) >= BATCH_FILES:
+            yield batch
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch
+
+
+def split_lines(chunks):
+    """
+    Linhas a partir dos pedaços que chegam de outro estágio. Um pipe já vem
+    linha a linha, mas um builtin gerador (show, ls) manda blocos de texto.
+    """
+    rest = ''
+    for chunk in chunks:
+        if rest:
+            chunk = rest + chunk
+        lines = chunk.splitlines(keepends=True)
+        rest = lines.pop() if lines and not lines[-1].endswith('\n') else ''
+        yield from lines
+    if rest:
+        yield rest
+
+
+class Grep:
+    """
+    Uma busca do 'grep'. run() é um gerador das linhas de saída no formato
+    do grep ('arquivo:linha' ou 'arquivo:número:linha' com -n).
+    """
+
+    def __init__(self, pattern, ignore_case=False, numbers=False, limit=None, on_error=None):
+        self.pattern = pattern
+        self.ignore_case = ignore_case
+        self.numbers = numbers
+        self.limit = limit if limit is not None else float('inf')
+        self.on_error = on_error or (lambda path, reason: None)
+        self.found = 0
+        # Linhas já contadas em cada arquivo dividido em pedaços (para o -n)
+        self._line_base = {}
+        self._binary_reported = set()
+
+    def lines(self, entrada):
+        """grep sobre a saída de outro comando (em um pipeline)."""
+        flags = re.IGNORECASE if self.ignore_case else 0
+        regex = re.compile(self.pattern, flags)
+        for number, line in enumerate(split_lines(entrada), 1):
+            if self.found >= self.limit:
+                return
+            if regex.search(line):
+                self.found += 1
+                text = line if line.endswith('\n') else line + '\n'
+                yield f"{number}:{text}" if self.numbers else text
+
+    def run(self, paths, recursive=False):
+        show_names = recursive or len(paths) > 1
+        files = iter_files(paths, recursive, self.on_error)
+
+        # Busca pequena (poucos arquivos e poucos bytes, com ou sem -r):
+        # direto neste processo. O percurso só é lido até passar do limite.
+        head, total = [], 0
+        for item in files:
+            head.append(item)
+            total += item[1]
+            if total > INLINE_BYTES or len(head) > INLINE_FILES:
+                break
+        else:
+            for segments in plan_tasks(head):
+                results = search_task(segments, self.pattern, self.ignore_case,
+                                      self.limit, self.numbers)
+                yield from self._format(results, show_names)
+                if self.found >= self.limit:
+                    return
+            return
+
+        tasks = plan_tasks(itertools.chain(head, files))
+
+        pool = _get_pool()
+        inflight = deque()
+        max_inflight = WORKERS * INFLIGHT_PER_WORKER
+        try:
+            for segments in tasks:
+                inflight.append(pool.submit(search_task, segments, self.pattern,
+                                            self.ignore_case, self.limit, self.numbers))
+                while len(inflight) >= max_inflight or (inflight and inflight[0].done()):
+                    yield from self._format(inflight.popleft().result(), show_names)
+                    if self.found >= self.limit:
+                        return
+            while inflight:
+                yield from self._format(inflight.popleft().result(), show_names)
+                if self.found >= self.limit:
+                    return
+        finally:
+            # -m atingido ou Ctrl-C: o que ainda não começou é descartado
+            for future in inflight:
+                future.cancel()
+
+    def _format(self, results, show_names):
+        out = []
+        for path, start, matches, newlines, binary, error in results:
+            if error is not None:
+                self.on_error(path, error)
+                continue
+            base = self._line_base.get(path, 0) if start else 0
+            if binary:
+                if matches and path not in self._binary_reported:
+                    self._binary_reported.add(path)
+                    out.append(f"Arquivo binário {path} contém o padrão\n")
+                    self.found += 1
+            else:
+                prefix = f"{path}:" if show_names else ""
+                for number, line in matches:
+                    if self.found >= self.limit:
+                        break
+                    self.found += 1
+                    if self.numbers:
+                        out.append(f"{prefix}{base + number}:{line}\n")
+                    else:
+                        out.append(f"{prefix}{line}\n")
+            if self.numbers:
+                self._line_base[path] = base + newlines
+            if self.found >= self.limit:
+                break
+        if out:
+            yield "".join(out)
+
+
+# ----------------------------------------------------------------------
+# find
+# ----------------------------------------------------------------------
+def find(paths, name=None, ignore_case=False, kind=None, on_error=None):
+    """
+    Gerador dos caminhos cujo nome casa com o glob 'name' (todos, sem ele).
+    kind: 'f' (só arquivos), 'd' (só pastas) ou None.
+    """
+    match = None
+    if name is not None:
+        glob = fnmatch.translate(name)
+        match = re.compile(glob, re.IGNORECASE if ignore_case else 0).match
+
+    def wanted(entry_name, is_dir):
+        if kind == 'f' and is_dir or kind == 'd' and not is_dir:
+            return False
+        return match is None or match(entry_name) is not None
+
+    for top in paths:
+        if not os.path.isdir(top):
+            if os.path.lexists(top):
+                if wanted(os.path.basename(top), False):
+                    yield top + "\n"
+            elif on_error:
+                on_error(top, "arquivo ou diretório não encontrado")
+            continue
+        if wanted(os.path.basename(os.path.normpath(top)), True):
+            yield top + "\n"
+        # Como o find, entra também nas pastas ocultas
+        for _, entries in walk_parallel(top, show_all=True,
+                                        on_error=lambda p, e: on_error and on_error(p, e.strerror)):
+            found = [e.path + "\n" for e in entries
+                     if wanted(e.name, e.is_dir and not e.is_link)]
+            if found:
+                yield "".join(found)
@@ -0,0 +1,183 @@
+"""
+Leitura de arquivos de texto grandes para o builtin 'show'.
+
+Nada aqui lê o arquivo inteiro de uma vez:
+  - iter_text() entrega o conteúdo em blocos, já decodificados.
+  - LineIndex mapeia o arquivo com mmap e descobre onde começa cada linha
+    só até onde alguém pediu (--head 10 num log de 5 GB olha só o começo).
+  - LineIndex.tail_offset() acha as últimas N linhas procurando a partir do fim.
+"""
+import bisect
+import codecs
+import mmap
+import re
+from array import array
+
+ENCODING = 'utf-8'
+
+# Tamanho de cada leitura/decodificação
+CHUNK_SIZE = 64 * 1024
+
+# Quantos bytes o índice avança por vez quando precisa de mais linhas
+INDEX_STEP = 1024 * 1024
+
+# Quantos bytes do começo são olhados para decidir se o arquivo é binário
+BINARY_SAMPLE = 8192
+
+_NEWLINE = re.compile(b'\n')
+
+
+def is_binary(path):
+    """
+    Olha só o começo do arquivo: um byte nulo ou UTF-8 inválido indica que
+    não é texto (imagem, executável, zip...).
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(BINARY_SAMPLE)
+    if b'\0' in sample:
+        return True
+    try:
+        # final=False: um caractere cortado no fim da amostra não é erro
+        codecs.getincrementaldecoder(ENCODING)().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
+def iter_text(path):
+    """Gera o conteúdo do arquivo em blocos de texto."""
+    decoder = codecs.getincrementaldecoder(ENCODING)(errors='replace')
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+class LineIndex:
+    """
+    Índice preguiçoso de linhas sobre um arquivo mapeado em memória.
+
+    offsets[i] é o byte onde começa a linha i (contando de 0). O índice só
+    cresce quando alguém pede uma linha que ainda não foi alcançada, e as
+    posições ficam num array de inteiros (8 bytes por linha), não em strings.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.size = self._file.seek(0, 2)
+            # mmap não aceita arquivo vazio
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._offsets = array('Q', [0])
+        self._scanned = 0  # até que byte já procuramos quebras de linha
+
+    # ------------------------------------------------------------------
+    # Construção do índice
+    # ------------------------------------------------------------------
+    @property
+    def complete(self):
+        return self._scanned >= self.size
+
+    def _scan(self):
+        """Avança o índice um passo (INDEX_STEP bytes)."""
+        start = self._scanned
+        end = min(start + INDEX_STEP, self.size)
+        block = self._data[start:end]
+        self._offsets.extend(start + m.end() for m in _NEWLINE.finditer(block))
+        self._scanned = end
+        if self.complete and self._offsets[-1] == self.size and len(self._offsets) > 1:
+            # Arquivo terminado em '\n': não existe uma linha vazia depois dele
+            self._offsets.pop()
+
+    def _reach_line(self, n):
+        while len(self._offsets) <= n and not self.complete:
+            self._scan()
+
+    def _reach_offset(self, offset):
+        while self._scanned < offset and not self.complete:
+            self._scan()
+
+    def line_count(self):
+        """Número total de linhas (precisa percorrer o arquivo todo)."""
+        while not self.complete:
+            self._scan()
+        return len(self._offsets) if self.size else 0
+
+    def known_lines(self):
+        """Linhas já indexadas até agora (sem ler mais nada)."""
+        return len(self._offsets) if self.size else 0
+
+    def offset(self, n):
+        """Byte onde começa a linha n (ou o tamanho do arquivo, se passar do fim)."""
+        self._reach_line(n)
+        if n < len(self._offsets):
+            return self._offsets[n]
+        return self.size
+
+    def line_at(self, offset):
+        """Número da linha que contém o byte 'offset'."""
+        self._reach_offset(offset + 1)
+        return max(0, bisect.bisect_right(self._offsets, offset) - 1)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def lines(self, start, stop):
+        """Texto das linhas [start, stop), numa única string."""
+        return self.text(self.offset(start), self.offset(stop))
+
+    def text(self, start, end):
+        return self._data[start:end].decode(ENCODING, errors='replace')
+
+    def iter_range(self, start, end):
+        """Gera o texto entre dois bytes, em blocos."""
+        decoder = codecs.getincrementaldecoder(ENCODING)(errors='replace')
+        pos = start
+        while pos < end:
+            stop = min(pos + CHUNK_SIZE, end)
+            text = decoder.decode(self._data[pos:stop])
+            if text:
+                yield text
+            pos = stop
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def tail_offset(self, n):
+        """
+        Byte onde começam as últimas n linhas, procurando '\\n' de trás para
+        frente (não precisa do índice, nem de ler o começo do arquivo).
+        """
+        if n <= 0:
+            return self.size
+        end = self.size
+        if end and self._data[end - 1:end] == b'\n':
+            end -= 1  # a quebra final não abre uma linha nova
+        for _ in range(n):
+            pos = self._data.rfind(b'\n', 0, end)
+            if pos < 0:
+                return 0
+            end = pos
+        return end + 1
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,344 @@
+"""
+'watch': roda um comando de novo e de novo, mostrando a saída sempre no
+mesmo lugar da tela.
+
+Cada execução passa pelo Executor (como um pipeline, com a saída
+capturada) e vira um quadro: uma lista de linhas. Na GUI o quadro vai para
+uma região da tela que é redesenhada no lugar, só nas linhas que mudaram
+(ver ConsoleRenderer.update_region); no terminal, o quadro é impresso de
+novo só quando muda.
+
+Quando o comando olha para pastas (ex: 'watch ls -l build/'), não é
+preciso esperar o próximo intervalo: o inotify do Linux avisa quando algo
+dentro delas é criado, apagado, renomeado ou escrito, e o comando roda na
+hora. Comandos que descem na árvore (find, du, ls -R, grep -r) observam
+também as subpastas, inclusive as criadas depois. O intervalo continua
+valendo como rede de segurança (o que o inotify não vê: pastas demais
+para observar, links, outros sistemas sem inotify).
+"""
+import ctypes
+import ctypes.util
+import datetime
+import os
+import select
+import struct
+import threading
+import time
+from collections.abc import Mapping
+
+from pipeline import Pipeline
+
+DEFAULT_INTERVAL = 2.0
+MIN_INTERVAL = 0.1
+
+# Linhas guardadas por quadro (o resto vira um aviso no fim)
+MAX_LINES = 500
+
+# Comandos que, sem nenhuma pasta nos argumentos, olham a pasta atual
+CWD_COMMANDS = {'ls', 'find', 'du'}
+
+# Comandos que descem nas subpastas (sempre, ou com a flag indicada)
+RECURSIVE_COMMANDS = {'find': None, 'du': None, 'ls': 'R', 'grep': 'r'}
+
+# Teto de pastas observadas (cada uma é um watch do inotify, limitado por
+# /proc/sys/fs/inotify/max_user_watches). Passando dele, o resto da árvore
+# fica só com o intervalo.
+MAX_WATCHES = 8192
+
+# Depois do primeiro evento, espera a rajada acabar (um 'cp -r' gera
+# milhares) antes de rodar o comando: até SETTLE sem eventos, no máximo
+# SETTLE_MAX no total.
+SETTLE = 0.05
+SETTLE_MAX = 0.5
+
+# inotify(7)
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+# struct inotify_event: wd, mask, cookie, len (seguido do nome)
+_EVENT = struct.Struct('iIII')
+
+_libc = None
+
+
+def _inotify_libc():
+    """A libc com inotify_init1/inotify_add_watch, ou None (não é Linux)."""
+    global _libc
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            _libc = libc
+        except (OSError, AttributeError, TypeError):
+            _libc = False
+    return _libc or None
+
+
+class DirWatcher:
+    """
+    Espera mudanças dentro de algumas pastas (inotify). Com recursive, as
+    subpastas também são observadas, e as que forem criadas passam a ser.
+    """
+
+    def __init__(self, paths, recursive=False):
+        libc = _inotify_libc()
+        if libc is None:
+            raise OSError("inotify não disponível neste sistema")
+        self._libc = libc
+        self.recursive = recursive
+        self.complete = True  # False: alguma subpasta ficou sem watch
+        self._paths = {}      # wd -> pasta
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        try:
+            for path in paths:
+                self._add(path, required=True)
+        except OSError:
+            os.close(self.fd)
+            raise
+        # close() acorda quem está esperando por este pipe
+        self._wake_r, self._wake_w = os.pipe()
+
+    def _add(self, top, required=False):
+        """Observa 'top' e, no modo recursivo, as subpastas dele."""
+        pending = [top]
+        while pending:
+            path = pending.pop()
+            if len(self._paths) >= MAX_WATCHES:
+                self.complete = False
+                return
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if required and path is top:
+                    raise OSError(errno, os.strerror(errno), path)
+                self.complete = False # ex: ENOSPC (watches esgotados), pasta que já sumiu
+                continue
+            self._paths[wd] = path
+            if self.recursive:
+                try:
+                    with os.scandir(path) as it:
+                        pending.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+                except OSError:
+                    pass
+
+    def wait(self, timeout=None):
+        """True se algo mudou; False se passou o timeout ou close() foi chamado."""
+        ready, _, _ = select.select([self.fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready or self.fd not in ready:
+            return False
+        deadline = time.monotonic() + SETTLE_MAX
+        self._consume()
+        while time.monotonic() < deadline and select.select([self.fd], [], [], SETTLE)[0]:
+            self._consume()
+        return True
+
+    def _consume(self):
+        """
+        Lê os eventos pendentes. O conteúdo só importa para manter os
+        watches em dia: pastas novas entram (modo recursivo), as que
+        sumiram saem. O que mudou, quem mostra é o comando.
+        """
+        try:
+            while True:
+                data = os.read(self.fd, 64 * 1024)
+                if not data:
+                    return
+                offset = 0
+                while offset < len(data):
+                    wd, mask, _, size = _EVENT.unpack_from(data, offset)
+                    name = data[offset + _EVENT.size:offset + _EVENT.size + size].rstrip(b"\0")
+                    offset += _EVENT.size + size
+                    if mask & IN_IGNORED:
+                        self._paths.pop(wd, None)
+                    elif (self.recursive and mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO)
+                            and wd in self._paths):
+                        self._add(os.path.join(self._paths[wd], os.fsdecode(name)))
+        except BlockingIOError:
+            pass
+
+    def wake(self):
+        os.write(self._wake_w, b"x")
+
+    def close(self):
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+
+def _commands(node):
+    return [s['command'] for s in node['stages']] if node.get('type') == 'pipeline' else [node]
+
+
+def is_recursive(node):
+    """O comando (ou algum estágio do pipeline) desce nas subpastas?"""
+    for command in _commands(node):
+        kind = command.get('type')
+        if kind in RECURSIVE_COMMANDS:
+            flag = RECURSIVE_COMMANDS[kind]
+            flags = "".join(f for f in command.get('flags') or () if not f.startswith('--'))
+            if flag is None or flag in flags:
+                return True
+    return False
+
+
+def directory_targets(node):
+    """Pastas citadas no comando (ou a atual, para 'ls'/'find'/'du' sem pasta)."""
+    found = []
+    commands = _commands(node)
+
+    def collect(value):
+        if isinstance(value, str):
+            if not value.startswith('-') and os.path.isdir(value):
+                found.append(value)
+        elif isinstance(value, Mapping):
+            for key, item in value.items():
+                if key != 'type':
+                    collect(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                collect(item)
+
+    for command in commands:
+        before = len(found)
+        collect(command)
+        if len(found) == before and command.get('type') in CWD_COMMANDS:
+            found.append('.')
+    return list(dict.fromkeys(found))
+
+
+class Watch:
+    """
+    O 'watch' como tarefa em primeiro plano (mesma interface do
+    ExternalProcess: start/wait/cancel/on_exit). Termina com o Ctrl-C.
+    on_frame(linhas) recebe cada quadro, com o cabeçalho na primeira linha.
+    """
+
+    def __init__(self, executor, node, text, interval, on_frame):
+        self.executor = executor
+        self.node = node
+        self.text = text or node.get('type', '')
+        self.interval = interval
+        self.on_frame = on_frame
+        self.on_exit = None
+        self.returncode = None
+        self.runs = 0
+        self.mode = None
+        self._task = None
+        self._watcher = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _watch_targets(self):
+        """
+        Cria o DirWatcher (aqui na thread do watch: numa árvore grande,
+        observar todas as subpastas leva um tempo).
+        """
+        self.mode = f"a cada {self.interval:g} s"
+        targets = directory_targets(self.node)
+        if not targets:
+            return
+        try:
+            watcher = DirWatcher(targets, is_recursive(self.node))
+        except OSError:
+            return # sem inotify: só o intervalo
+        with self._lock:
+            self._watcher = watcher
+        self.mode = f"a cada mudança em {', '.join(targets)} ou {self.interval:g} s"
+
+    def _run(self):
+        try:
+            self._watch_targets()
+            while not self._cancel.is_set():
+                lines, code = self._capture()
+                if self._cancel.is_set():
+                    break
+                self.runs += 1
+                stamp = datetime.datetime.now().strftime("%H:%M:%S")
+                status = f", status {code}" if code else ""
+                header = f"watch ({self.mode}): {self.text}    [{self.runs}ª execução às {stamp}{status}]"
+                self.on_frame([header, ""] + lines)
+                if self._watcher is not None:
+                    # O que vier primeiro: uma mudança, o intervalo ou o
+                    # cancel() (que acorda o pipe)
+                    self._watcher.wait(self.interval)
+                else:
+                    self._cancel.wait(self.interval)
+        finally:
+            with self._lock:
+                watcher, self._watcher = self._watcher, None
+            if watcher is not None:
+                watcher.close()
+            self.returncode = 130
+            self._done.set()
+            if self.on_exit:
+                self.on_exit(self.returncode)
+
+    def _capture(self):
+        """Roda o comando uma vez e devolve (linhas da saída, status)."""
+        parts = []
+
+        def collect(text, tag='stdout'):
+            parts.append(text)
+
+        executor = self.executor
+        try:
+            # Os curingas valem para os arquivos de agora, a cada execução
+            node = executor.expander.expand(self.node, executor.last_status)
+            if node.get('type') == 'pipeline':
+                stages = node['stages']
+            else:
+                stages = [{'type': 'stage', 'command': node, 'redirs': ()}]
+            task = Pipeline(executor, stages, on_output=collect)
+            with self._lock:
+                if self._cancel.is_set():
+                    return [], 130
+                self._task = task
+                task.start() # sob o lock: o cancel() só vê tarefas já iniciadas
+            code = task.wait()
+        except Exception as e:
+            # Ex: GlobError, arquivo de um '<' que não existe mais
+            parts.append(f"TermIA: watch: {e}\n")
+            code = 1
+        finally:
+            with self._lock:
+                self._task = None
+
+        lines = "".join(parts).splitlines()
+        if len(lines) > MAX_LINES:
+            extra = len(lines) - MAX_LINES
+            lines = lines[:MAX_LINES] + [f"... (mais {extra} linhas)"]
+        return lines, code
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.returncode
+
+    def running(self):
+        return not self._done.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        with self._lock:
+            task = self._task
+            if self._watcher is not None:
+                self._watcher.wake() # sob o lock: _run não fecha o pipe no meio
+        if task is not None:
+            task.cancel()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "benchmarks"))
+
+
+@pytest.fixture
+def gemini(tmp_path, monkeypatch):
+    """
+    Sobe o servidor falso do Gemini (benchmarks/mock_gemini.py) numa porta
+    livre, com as opções do teste, e aponta o cliente do ia_mode para ele.
+    """
+    from mock_gemini import start_server
+
+    monkeypatch.setenv("TERMIA_HOME", str(tmp_path))
+    monkeypatch.setenv("GEMINI_API_KEY", "chave-de-teste")
+    servers = []
+
+    def start(**options):
+        server, base_url = start_server(**options)
+        servers.append(server)
+        monkeypatch.setenv("GEMINI_API_BASE", base_url)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
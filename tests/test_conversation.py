@@ -0,0 +1,66 @@
+"""
+Memória de conversa do ia_mode usada por várias threads ao mesmo tempo.
+
+Na GUI a resposta em streaming (e as da fila) chamam Conversation.add numa
+thread de trabalho enquanto a thread do Tk monta pedidos (pack) e roda os
+comandos /reset, /save e /load.
+"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from conversation import Conversation  # noqa: E402
+
+ANSWER = "uma resposta comprida o bastante para forçar a compactação " * 4
+
+
+def run_threads(*targets):
+    errors = []
+
+    def guarded(target):
+        try:
+            target()
+        except Exception as e:  # a falha precisa aparecer no teste, não só na thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=(t,)) for t in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_add_concorrente_nao_perde_trocas():
+    conversa = Conversation(budget=256)
+
+    def answers(n):
+        return lambda: [conversa.add(f"pergunta {n}-{i}", ANSWER) for i in range(500)]
+
+    run_threads(*(answers(n) for n in range(4)), lambda: [conversa.pack("pergunta nova") for _ in range(1000)])
+    kept = len(conversa.exchanges) + len(conversa.summary) + conversa.dropped
+    assert kept == 4 * 500
+
+
+def test_memory_durante_resposta(tmp_path, monkeypatch):
+    monkeypatch.setenv("TERMIA_HOME", str(tmp_path))
+    conversa = Conversation(budget=256)
+    conversa.add("primeira", ANSWER)
+    conversa.save("base")
+
+    def stream():
+        for i in range(1000):
+            conversa.add(f"pergunta {i}", ANSWER)
+
+    def gui():
+        for i in range(100):
+            conversa.pack("outra pergunta")
+            conversa.save("atual")
+            conversa.load("base" if i % 2 else "atual")
+            conversa.reset()
+
+    run_threads(stream, gui)
+    conversa.load("atual")
+    assert conversa.memory_tokens() <= conversa.budget * 3
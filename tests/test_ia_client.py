@@ -0,0 +1,38 @@
+"""
+Cliente do ia_mode contra o servidor falso do Gemini (benchmarks/mock_gemini.py),
+numa porta livre qualquer: sem rede e sem chave de verdade.
+"""
+import time
+
+PROMPT = "um dois três quatro cinco"
+
+
+def test_pedacos_chegam_em_ordem(gemini):
+    from ia_client import GeminiClient
+
+    gemini(delay=0.05)
+    client = GeminiClient()
+    chunks, arrivals = [], []
+    for chunk in client.stream(PROMPT):
+        chunks.append(chunk)
+        arrivals.append(time.monotonic())
+    client.close()
+
+    assert chunks == ["um ", "dois ", "três ", "quatro ", "cinco"]
+    # Um pedaço por vez, não a resposta inteira no fim
+    assert arrivals[-1] - arrivals[0] >= 0.1
+
+
+def test_erro_no_meio_nao_entra_na_memoria(gemini, capsys):
+    from executor import Executor
+
+    gemini(fail_after=2)
+    executor = Executor()
+    executor.perguntar_ia(PROMPT)
+
+    out, err = capsys.readouterr()
+    assert out.startswith("um dois ")
+    assert "erro no meio do stream" in err
+    assert executor.ia_conversa.exchanges == []
+    # Nem no cache: a mesma pergunta vai de novo ao servidor
+    assert executor.ia_cache.get(executor.ia_client.model, PROMPT, "") is None
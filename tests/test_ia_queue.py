@@ -0,0 +1,87 @@
+"""
+Fila do ia_mode ('pergunta &') contra o servidor falso do Gemini: limite de
+taxa (429 com Retry-After), teto de repetições e /cancel.
+
+A saída passa por uma QueueSink, como na GUI; os testes leem os eventos
+dela até a pergunta terminar.
+"""
+import time
+
+import pytest
+
+PROMPT = "um dois três quatro cinco"
+
+
+@pytest.fixture
+def shell(gemini, monkeypatch):
+    monkeypatch.setenv("TERMIA_IA_RATE", "100")  # o balde não atrasa os testes
+    from executor import Executor
+    from output import QueueSink
+
+    executor = Executor()
+    executor.output = QueueSink()
+    events = []
+
+    def wait_for(predicate, timeout=15):
+        """Junta os eventos (tag, texto) até predicate(eventos) ser verdade."""
+        deadline = time.monotonic() + timeout
+        while not predicate(events):
+            assert time.monotonic() < deadline, f"eventos até aqui: {events}"
+            events.extend(executor.output.drain(1000))
+            time.sleep(0.01)
+        return events
+
+    yield executor, wait_for
+    if executor.ia_fila is not None:
+        executor.ia_fila.shutdown()
+
+
+def tagged(events, tag):
+    return [text for t, text in events if t == tag]
+
+
+def test_429_com_retry_after_e_repetido(gemini, shell):
+    server = gemini(fail_first=2, retry_after=0.2)
+    executor, wait_for = shell
+    started = time.monotonic()
+    executor.enfileirar_ia(PROMPT)
+    events = wait_for(lambda ev: tagged(ev, 'ia') or tagged(ev, 'stderr'))
+
+    assert tagged(events, 'stderr') == []
+    assert tagged(events, 'ia') == [f"\n🤖 [#1] {PROMPT}\n{PROMPT}\n"]
+    retries = tagged(events, 'job')
+    assert len(retries) == 2 and all("limite da API (429)" in line for line in retries)
+    assert server.requests == 3
+    assert time.monotonic() - started >= 0.4  # o Retry-After foi respeitado
+    assert len(executor.ia_conversa.exchanges) == 1
+
+
+def test_repeticoes_param_no_limite(gemini, shell, monkeypatch):
+    import ia_queue
+
+    monkeypatch.setattr(ia_queue, "backoff_delay", lambda attempt, retry_after=None, base=0: 0.01)
+    server = gemini(error_rate=1.0, error_status=429, retry_after=0.01)
+    executor, wait_for = shell
+    executor.enfileirar_ia(PROMPT)
+    events = wait_for(lambda ev: tagged(ev, 'stderr'))
+
+    error, = tagged(events, 'stderr')
+    assert error.startswith(f"[#1] {PROMPT}\n") and "429" in error
+    assert server.requests == ia_queue.DEFAULT_RETRIES + 1
+    assert tagged(events, 'ia') == []
+    assert executor.ia_conversa.exchanges == []
+
+
+def test_cancel_de_pergunta_esperando_na_fila(gemini, shell, monkeypatch):
+    monkeypatch.setenv("TERMIA_IA_CONCURRENCY", "1")
+    server = gemini(delay=0.1)
+    executor, wait_for = shell
+    executor.enfileirar_ia(PROMPT)
+    executor.enfileirar_ia("outra pergunta")
+    executor.comando_ia("/cancel 2")
+    events = wait_for(lambda ev: tagged(ev, 'ia'))
+
+    assert "[#2] cancelada.\n" in tagged(events, 'job')
+    assert tagged(events, 'ia') == [f"\n🤖 [#1] {PROMPT}\n{PROMPT}\n"]
+    assert server.requests == 1
+    assert executor.ia_fila.pending() == 0
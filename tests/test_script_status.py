@@ -0,0 +1,44 @@
+"""
+Status de saída ($?, &&, ||) no modo --script.
+
+Cada teste roda um script pelo src/main.py, como na automação, e confere a
+saída: o status de um builtin gerador é o que ele devolve no 'return'.
+"""
+import os
+import subprocess
+import sys
+
+MAIN = os.path.join(os.path.dirname(__file__), os.pardir, "src", "main.py")
+
+
+def run_script(text, cwd):
+    env = dict(os.environ, TERMIA_HOME=str(cwd / ".termia"))
+    return subprocess.run([sys.executable, MAIN, "--script", "-"], input=text, cwd=cwd,
+                          env=env, capture_output=True, text=True, timeout=60)
+
+
+def test_grep_sem_resultado_falha(tmp_path):
+    (tmp_path / "f.txt").write_text("alguma coisa\n")
+    result = run_script("grep nomatch f.txt && echo x\ngrep nomatch f.txt; echo $?\n", tmp_path)
+    assert result.stdout.splitlines() == ["1"]
+
+
+def test_grep_com_resultado_passa(tmp_path):
+    (tmp_path / "f.txt").write_text("alguma coisa\n")
+    result = run_script("grep coisa f.txt && echo x\n", tmp_path)
+    assert result.stdout.splitlines() == ["alguma coisa", "x"]
+
+
+def test_status_devolvido_pelo_builtin(tmp_path):
+    result = run_script("du --bogus . ; echo $?\n", tmp_path)
+    assert result.stdout.splitlines() == ["2"]
+
+
+def test_rm_recusa_pasta_atual_e_raiz(tmp_path):
+    (tmp_path / "d").mkdir()
+    (tmp_path / "d" / "b.txt").write_text("b\n")
+    (tmp_path / "a.txt").write_text("a\n")
+    result = run_script("rm -r . ; echo $?\nrm -rf d/.. ; echo $?\nrm -r / ; echo $?\n", tmp_path)
+    assert result.stdout.splitlines() == ["1", "1", "1"]
+    assert result.stderr.count("TermIA: rm:") == 3
+    assert (tmp_path / "a.txt").exists() and (tmp_path / "d" / "b.txt").exists()
@@ -0,0 +1,77 @@
+"""
+Status de saída ($?, &&) na GUI, sem o Tk.
+
+Na GUI os builtins de THREADED_BUILTINS rodam num Pipeline em outra thread
+(run_foreground -> _run_in_thread) e o status só chega no evento 'done' da
+QueueSink. Aqui a fila é esvaziada como no TermIAGUI.flush_output, e o '$?'
+tem que ser o mesmo do modo --script.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+
+@pytest.fixture
+def shell(tmp_path, monkeypatch):
+    monkeypatch.setenv("TERMIA_HOME", str(tmp_path / ".termia"))
+    monkeypatch.chdir(tmp_path)
+    from executor import Executor
+    from grammar import parser
+    from lexer import lexer
+    from output import QueueSink
+    from parse_cache import ParseCache
+
+    executor = Executor()
+    executor.output = QueueSink()
+    cache = ParseCache(parser, lexer)
+
+    def run(line, timeout=30):
+        """Roda a linha como a GUI e devolve o que foi para o stdout."""
+        executor.execute(cache.parse(line))
+        out = []
+        deadline = time.monotonic() + timeout
+        while True:
+            events = executor.output.drain(1000)
+            for tag, text in events:
+                if tag == 'done':
+                    # O resto da lista (&& echo) roda aqui, como na GUI
+                    executor.finish_foreground(text)
+                elif tag == 'stdout':
+                    out.append(text)
+            if not events and executor.foreground is None:
+                break
+            assert time.monotonic() < deadline, f"'{line}' não terminou"
+            time.sleep(0.01)
+        return "".join(out)
+
+    return executor, run
+
+
+@pytest.mark.parametrize("command", ["find nada", "du nada", "rm nada.txt"])
+def test_erro_de_builtin_em_thread(shell, command):
+    executor, run = shell
+    assert run(f"{command} && echo sim") == ""
+    assert executor.last_status == 1
+    assert run("echo $?") == "1\n"
+
+
+def test_sucesso_de_builtin_em_thread(shell, tmp_path):
+    executor, run = shell
+    (tmp_path / "f.txt").write_text("alguma coisa\n")
+    assert run("find . -name f.txt && echo sim").splitlines() == ["./f.txt", "sim"]
+    assert run("du . && echo sim").splitlines()[-1] == "sim"
+    assert executor.last_status == 0
+
+
+def test_status_devolvido_pelo_builtin_em_thread(shell, tmp_path):
+    # Os mesmos casos do test_script_status, pelo Pipeline
+    executor, run = shell
+    (tmp_path / "f.txt").write_text("alguma coisa\n")
+    assert run("grep nomatch f.txt && echo x") == ""
+    assert run("grep nomatch f.txt ; echo $?") == "1\n"
+    assert run("grep coisa f.txt && echo x").splitlines() == ["alguma coisa", "x"]
+    assert run("du --bogus . ; echo $?") == "2\n"